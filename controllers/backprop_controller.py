@@ -3,9 +3,12 @@ import numpy as np
 import threading
 import tkinter as tk
 from tkinter import filedialog
-from sklearn.metrics import confusion_matrix
 
 from models.backpropagation import RedBP
+from models.data_processor import parse_pattern_file, parse_hidden_layers
+from models.motor import dimensiones_capas
+from models.evaluacion import evaluar
+from models.telemetria import Telemetria
 from views.main_view import MainView
 
 class BackpropController:
@@ -20,6 +23,12 @@ class BackpropController:
         self.datos_salida = None
         self.pesos_archivo = None
         self.entrenamiento_en_progreso = False
+        self.carga_en_progreso = False
+        
+        # Registros por época que escribe el hilo de entrenamiento y lee la interfaz
+        self.telemetria = Telemetria()
+        self.entrenamiento_completado = False
+        self.error_entrenamiento = None
         
         # Conectar eventos de la vista
         self.conectar_eventos()
@@ -54,7 +63,12 @@ class BackpropController:
             self.view.beta_oculta_input.config(state='disabled')
     
     def cargar_datos_entrenamiento(self):
-        """Carga los datos de entrenamiento desde un archivo"""
+        """Carga los datos de entrenamiento desde un archivo en un hilo separado"""
+        # Evitar múltiples cargas simultáneas
+        if self.carga_en_progreso:
+            self.view.log("Ya hay una carga de datos en curso. Espere a que termine.")
+            return
+        
         archivo = filedialog.askopenfilename(
             title="Seleccionar archivo de datos",
             filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
@@ -62,29 +76,62 @@ class BackpropController:
         
         if not archivo:
             return
-            
+        
+        self.view.log(f"Cargando datos desde: {archivo}")
+        
+        # Marcar inicio de la carga
+        self.carga_en_progreso = True
+        self.progreso_carga = 0
+        self.resultado_carga = None
+        self.view.btn_cargar_entrada.config(state='disabled')
+        self.view.progress_bar['value'] = 0
+        self.view.progress_label.config(text="0%")
+        
+        # Leer el archivo en un hilo separado para no bloquear la interfaz
+        self.thread_carga = threading.Thread(target=self.ejecutar_carga_datos, args=(archivo,))
+        self.thread_carga.daemon = True
+        self.thread_carga.start()
+        
+        # Iniciar actualización periódica de la interfaz
+        self.view.root.after(100, self.actualizar_progreso_carga)
+    
+    def actualizar_progreso_carga_callback(self, leidos, total):
+        """Callback para actualizar el progreso de la lectura del archivo"""
+        self.progreso_carga = min(100, int(leidos * 100 / total)) if total > 0 else 100
+    
+    def ejecutar_carga_datos(self, archivo):
+        """Lee el archivo de patrones en un hilo separado"""
         try:
-            self.view.log(f"Cargando datos desde: {archivo}")
-            
-            # Leer el archivo
-            datos_entrada = []
-            datos_salida = []
-            
-            with open(archivo, 'r') as f:
-                for linea in f:
-                    # Formato esperado: x1 x2 ... xn | y1 y2 ... ym
-                    partes = linea.strip().split('|')
-                    if len(partes) != 2:
-                        continue
-                        
-                    # Procesar entrada
-                    entrada = list(map(float, partes[0].strip().split()))
-                    
-                    # Procesar salida
-                    salida = list(map(float, partes[1].strip().split()))
-                    
-                    datos_entrada.append(entrada)
-                    datos_salida.append(salida)
+            # Leer el archivo (formato esperado: x1 x2 ... xn | y1 y2 ... ym)
+            self.resultado_carga = parse_pattern_file(archivo, progress=self.actualizar_progreso_carga_callback)
+        except Exception as e:
+            self.resultado_carga = e
+        finally:
+            self.carga_en_progreso = False
+    
+    def actualizar_progreso_carga(self):
+        """Actualiza la interfaz con el progreso de la carga de datos"""
+        self.view.progress_bar['value'] = self.progreso_carga
+        self.view.progress_label.config(text=f"{self.progreso_carga}%")
+        
+        # Programar próxima actualización mientras la carga siga en curso
+        if self.carga_en_progreso:
+            self.view.root.after(100, self.actualizar_progreso_carga)
+            return
+        
+        self.view.btn_cargar_entrada.config(state='normal')
+        
+        try:
+            if isinstance(self.resultado_carga, Exception):
+                raise self.resultado_carga
+            datos_entrada, datos_salida, lineas_invalidas = self.resultado_carga
+            
+            # Informar las líneas mal formadas que se ignoraron
+            if lineas_invalidas:
+                lineas = ', '.join(str(n) for n in lineas_invalidas[:20])
+                if len(lineas_invalidas) > 20:
+                    lineas += f" y {len(lineas_invalidas) - 20} más"
+                self.view.log(f"Advertencia: se ignoraron {len(lineas_invalidas)} líneas con formato inválido: {lineas}")
             
             # Verificar que se cargaron datos
             if len(datos_entrada) == 0:
@@ -135,7 +182,7 @@ class BackpropController:
         try:
             # Obtener valores de arquitectura
             capa_entrada = int(self.view.entrada_input.get())
-            capa_oculta = int(self.view.oculta_input.get())
+            capa_oculta = parse_hidden_layers(self.view.oculta_input.get())
             capa_salida = int(self.view.salida_input.get())
             
             # Obtener valores de parámetros de entrenamiento
@@ -153,11 +200,14 @@ class BackpropController:
             # Obtener beta para Leaky ReLU si es necesario
             beta_leaky_relu = float(self.view.beta_oculta_input.get())
             
-            # Obtener valor de momentum si está habilitado
+            # Obtener el optimizador y el valor de momentum si está habilitado
+            optimizador = self.view.optimizador_combo.get().lower()
             momentum = self.view.momentum_var.get()
             beta = 0.0
-            if momentum:
+            if momentum or optimizador in ('momentum', 'nesterov'):
                 beta = float(self.view.beta_input.get())
+            if momentum and optimizador == 'sgd':
+                optimizador = 'momentum'
         
             # Crear diccionario de configuración
             config = {
@@ -171,7 +221,9 @@ class BackpropController:
                 'funciones_activacion': [func_oculta, func_salida],
                 'beta_leaky_relu': beta_leaky_relu,
                 'momentum': momentum,
-                'beta': beta
+                'beta': beta,
+                'optimizador': optimizador,
+                'planificador': self.view.planificador_combo.get().lower()
             }
         
             return config
@@ -218,12 +270,23 @@ class BackpropController:
             self.view.log(f"- Funciones de activación: {config['funciones_activacion'][0]} (oculta), {config['funciones_activacion'][1]} (salida)")
             if 'leaky relu' in config['funciones_activacion']:
                 self.view.log(f"- Beta Leaky ReLU: {float(config['beta_leaky_relu'])}")
-            if config['momentum']:
+            self.view.log(f"- Optimizador: {config['optimizador']}")
+            self.view.log(f"- Tasa de aprendizaje: {config['planificador']}")
+            if config['optimizador'] in ('momentum', 'nesterov'):
                 self.view.log(f"- Momentum habilitado con Beta: {float(config['beta'])}")
 
             # Crear red neuronal
             self.red = RedBP(config)
             
+            # Reiniciar la telemetría y el resultado antes de iniciar el hilo
+            patrones = len(self.datos_entrenamiento)
+            self.telemetria.iniciar(self.red.max_epocas, patrones - self.red.patrones_validacion(patrones))
+            self.view.reiniciar_grafica_error()
+            self.error_entrenamiento = None
+            self.entrenamiento_completado = False
+            self.exactitud = 0.0
+            self.view.log("Iniciando entrenamiento con backpropagation...")
+            
             # Iniciar entrenamiento en un hilo separado para no bloquear la interfaz
             self.thread_entrenamiento = threading.Thread(target=self.ejecutar_entrenamiento)
             self.thread_entrenamiento.daemon = True
@@ -239,31 +302,19 @@ class BackpropController:
             import traceback
             self.view.log(traceback.format_exc())
     
-    def actualizar_progreso_callback(self, epoca, max_epocas, error):
-        """Callback para actualizar el progreso del entrenamiento"""
-        self.epoca_actual = epoca
-        self.error_actual = error
-        
-        # Calcular porcentaje de progreso
-        if max_epocas > 0:
-            self.progreso = min(100, int((epoca / max_epocas) * 100))
-    
     def ejecutar_entrenamiento(self):
-        """Ejecuta el entrenamiento en un hilo separado"""
+        """
+        Ejecuta el entrenamiento en un hilo separado. El hilo no toca los widgets:
+        cada época se registra en self.telemetria y el resultado (o el error)
+        queda en atributos que lee actualizar_progreso_entrenamiento.
+        """
         try:
-            # Entrenar y obtener errores
-            self.view.log("Iniciando entrenamiento con backpropagation...")
-            
-            # Inicializar variables de seguimiento
-            self.epoca_actual = 0
-            self.error_actual = float('inf')
-            self.progreso = 0
-            
-            # Entrenar la red con callback para actualizar progreso
-            self.errores_entrenamiento, self.exactitud = self.red.entrenar(
+            # Entrenar la red registrando cada época en la telemetría (la exactitud
+            # se obtiene al evaluar la red para la matriz de confusión)
+            self.errores_entrenamiento = self.red.entrenar(
                 np.array(self.datos_entrenamiento),
                 np.array(self.datos_salida),
-                callback=self.actualizar_progreso_callback
+                callback=self.telemetria.registrar_epoca
             )
             
             # Guardar pesos automáticamente
@@ -275,19 +326,12 @@ class BackpropController:
             self.pesos_archivo = os.path.join(carpeta, "pesos_lab3.json")
             self.red.guardar_pesos(self.pesos_archivo)
             
-            # Generar matriz de confusión
-            self.generar_matriz_confusion()
-            
-            # Actualizar información del modelo en el panel de prueba
-            self.actualizar_info_modelo()
-            
             # Marcar finalización del entrenamiento
             self.entrenamiento_completado = True
             
         except Exception as e:
-            self.view.log(f"Error durante el entrenamiento: {str(e)}")
             import traceback
-            self.view.log(traceback.format_exc())
+            self.error_entrenamiento = f"Error durante el entrenamiento: {str(e)}\n{traceback.format_exc()}"
         finally:
             # Asegurar que la interfaz se actualice al finalizar
             self.entrenamiento_en_progreso = False
@@ -299,35 +343,13 @@ class BackpropController:
             X = np.array(self.datos_entrenamiento)
             Y = np.array(self.datos_salida)
             
-            # Obtener predicciones
-            y_true = []
-            y_pred = []
-            
-            for i in range(len(X)):
-                x = X[i]
-                y = Y[i]
-                pred = self.red.predecir([x])[0]
-                
-                # Para clasificación binaria
-                if len(y) == 1:
-                    y_true.append(1 if y[0] > 0.5 else 0)
-                    y_pred.append(1 if pred[0] > 0.5 else 0)
-                # Para clasificación multiclase
-                else:
-                    y_true.append(np.argmax(y))
-                    y_pred.append(np.argmax(pred))
-            
-            # Calcular matriz de confusión
-            # Determinar el número de clases
-            if len(self.datos_salida[0]) == 1:
-                # Clasificación binaria
-                cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
-                etiquetas = ['Clase 0', 'Clase 1']
-            else:
-                # Clasificación multiclase
-                num_clases = len(self.datos_salida[0])
-                cm = confusion_matrix(y_true, y_pred, labels=range(num_clases))
-                etiquetas = [f'Clase {i}' for i in range(num_clases)]
+            # Calcular matriz de confusión y métricas con una propagación por bloque
+            # (con una sola salida, clasificación binaria con umbral 0.5)
+            evaluacion = evaluar(self.red, X, Y)
+            self.exactitud = evaluacion.exactitud
+            cm = evaluacion.matriz
+            etiquetas = [f'Clase {i}' for i in range(evaluacion.num_clases)]
+            self.view.log(evaluacion.resumen(etiquetas))
             
             # Mostrar matriz de confusión en la vista
             self.view.mostrar_matriz_confusion(cm, etiquetas)
@@ -341,10 +363,27 @@ class BackpropController:
             self.view.log(traceback.format_exc())
     
     def actualizar_progreso_entrenamiento(self):
-        """Actualiza la interfaz durante el entrenamiento"""
-        if not self.entrenamiento_en_progreso:
+        """Actualiza la interfaz durante el entrenamiento con los registros nuevos de la telemetría"""
+        # Leer la bandera antes de drenar, para no perder los últimos registros
+        en_progreso = self.entrenamiento_en_progreso
+        registros = self.telemetria.drenar()
+        if len(registros):
+            self.view.actualizar_grafica_error(registros)
+            self.log_registros(registros)
+        
+        if not en_progreso:
             # El entrenamiento ha finalizado
-            if hasattr(self, 'entrenamiento_completado') and self.entrenamiento_completado:
+            if self.error_entrenamiento:
+                self.view.log(self.error_entrenamiento)
+                self.error_entrenamiento = None
+            
+            if self.entrenamiento_completado:
+                # Generar matriz de confusión
+                self.generar_matriz_confusion()
+                
+                # Actualizar información del modelo en el panel de prueba
+                self.actualizar_info_modelo()
+                
                 # Actualizar estado del entrenamiento
                 self.view.status_label.config(text="Estado: Entrenado Exitosamente", foreground="green")
                 self.view.status_indicator.delete("all")
@@ -372,19 +411,28 @@ class BackpropController:
             return
             
         # Actualizar barra de progreso
-        self.view.progress_bar['value'] = self.progreso
-        self.view.progress_label.config(text=f"{self.progreso}%")
-        
-        # Actualizar log cada 100 épocas
-        if hasattr(self, 'epoca_actual') and self.epoca_actual % 100 == 0 and self.epoca_actual > 0:
-            self.view.log(f"Entrenando... Época {self.epoca_actual}/{self.red.max_epocas} ({self.progreso}%)")
+        progreso = self.telemetria.progreso
+        self.view.progress_bar['value'] = progreso
+        self.view.progress_label.config(text=f"{progreso}%")
         
         # Programar próxima actualización
         self.view.root.after(100, self.actualizar_progreso_entrenamiento)
     
+    def log_registros(self, registros):
+        """Muestra en el log las épocas múltiplos de 100 de un bloque de registros de la telemetría"""
+        max_epocas = self.telemetria.max_epocas
+        for registro in registros[registros['epoca'] % 100 == 0]:
+            epoca = int(registro['epoca'])
+            progreso = min(100, int(epoca * 100 / max_epocas)) if max_epocas > 0 else 0
+            validacion = "" if np.isnan(registro['error_validacion']) else f", error de validación: {float(registro['error_validacion']):.6f}"
+            self.view.log(f"Entrenando... Época {epoca}/{max_epocas} ({progreso}%), error: {float(registro['error']):.6f}"
+                          f"{validacion}, {float(registro['muestras_por_segundo']):.0f} patrones/s")
+    
     def cargar_pesos(self):
-        """Carga los pesos desde un archivo JSON"""
-        archivo = filedialog.askopenfilename(filetypes=[("Archivos JSON", "*.json")])
+        """Carga los pesos desde un archivo JSON o binario (.npz)"""
+        archivo = filedialog.askopenfilename(filetypes=[("Archivos de pesos", "*.json *.npz"),
+                                                        ("Archivos JSON", "*.json"),
+                                                        ("Archivos NPZ", "*.npz")])
         if archivo:
             try:
                 # Crear una instancia de red si no existe
@@ -474,7 +522,7 @@ class BackpropController:
                 self.view.weights_file.config(text="Generado en memoria")
             
             # Actualizar información de arquitectura
-            arquitectura = f"{self.red.config['capa_entrada']}-{self.red.config['capa_oculta']}-{self.red.config['capa_salida']}"
+            arquitectura = '-'.join(str(neuronas) for neuronas in dimensiones_capas(self.red.config))
             activaciones = f"{self.red.config['funciones_activacion'][0]}/{self.red.config['funciones_activacion'][1]}"
             self.view.architecture_info.config(text=f"{arquitectura} ({activaciones})")
         else:
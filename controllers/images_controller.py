@@ -9,10 +9,12 @@ import threading
 import tkinter as tk  # Añadir esta importación
 from tkinter import filedialog
 from PIL import Image
-from sklearn.metrics import confusion_matrix
 
 from models.Red_BP import RedBP
-from models.data_processor import normalize_image, save_normalized_data, load_training_data, determine_dominant_color, process_test_image
+from models.data_processor import normalize_image, pixels_to_training_data, determine_dominant_color, process_test_image, parse_hidden_layers
+from models.cache_imagenes import CacheImagenes
+from models.evaluacion import evaluar
+from models.telemetria import Telemetria
 from views.main_view_Images import MainView
 
 class AppController:
@@ -28,6 +30,14 @@ class AppController:
         self.pesos_archivo = None
         self.entrenamiento_en_progreso = False
         
+        # Caché incremental de las carpetas de imágenes cargadas
+        self.cache_imagenes = CacheImagenes()
+        
+        # Registros por época que escribe el hilo de entrenamiento y lee la interfaz
+        self.telemetria = Telemetria()
+        self.entrenamiento_completado = False
+        self.error_entrenamiento = None
+        
         # Conectar eventos de la vista
         self.conectar_eventos()
     
@@ -82,7 +92,7 @@ class AppController:
         try:
             # Obtener valores de la arquitectura
             capa_entrada = int(self.view.entrada_input.get())
-            capa_oculta = int(self.view.oculta_input.get())
+            capa_oculta = parse_hidden_layers(self.view.oculta_input.get())
             capa_salida = int(self.view.salida_input.get())
             
             # Obtener valores de los parámetros de entrenamiento
@@ -100,11 +110,20 @@ class AppController:
             # Obtener beta para Leaky ReLU si es necesario
             beta_leaky_relu = float(self.view.beta_oculta_input.get())
             
-            # Obtener valor de momentum si está habilitado
+            # Obtener el optimizador y el valor de momentum si está habilitado
+            optimizador = self.view.optimizador_combo.get().lower()
             momentum = self.view.momentum_var.get()
             beta = 0.0
-            if momentum:
+            if momentum or optimizador in ('momentum', 'nesterov'):
                 beta = float(self.view.beta_input.get())
+            if momentum and optimizador == 'sgd':
+                optimizador = 'momentum'
+            
+            # Obtener validación (%) y paciencia de la parada temprana
+            validacion = float(self.view.validacion_input.get()) / 100
+            paciencia = int(self.view.paciencia_input.get())
+            if not 0 <= validacion < 1:
+                raise ValueError("La validación debe estar entre 0 y 100%")
         
             # Crear diccionario de configuración
             config = {
@@ -118,7 +137,12 @@ class AppController:
                 'funciones_activacion': [func_oculta, func_salida],
                 'beta_leaky_relu': beta_leaky_relu,
                 'momentum': momentum,
-                'beta': beta
+                'beta': beta,
+                'optimizador': optimizador,
+                'planificador': self.view.planificador_combo.get().lower(),
+                'validacion': validacion,
+                'paciencia': paciencia,
+                'dtype': 'float32'
             }
         
             return config
@@ -138,12 +162,12 @@ class AppController:
             try:
                 self.view.log(f"Cargando imágenes de la carpeta: {carpeta}")
                 
-                # Crear archivo temporal para datos normalizados
-                archivo_temp = "temp_normalized_data.txt"
-                save_normalized_data(carpeta, archivo_temp)
+                # Decodificar y normalizar en paralelo solo las imágenes nuevas o modificadas
+                pixeles, etiquetas, estadisticas = self.cache_imagenes.cargar(carpeta)
+                self.view.log(estadisticas.resumen())
                 
-                # Cargar datos normalizados
-                self.datos_entrenamiento, self.datos_salida = load_training_data(archivo_temp)
+                # Convertir a entradas normalizadas y salidas one-hot
+                self.datos_entrenamiento, self.datos_salida = pixels_to_training_data(pixeles, etiquetas)
                 
                 if len(self.datos_entrenamiento) > 0:
                     self.view.log(f"Cargadas {len(self.datos_entrenamiento)} imágenes válidas")
@@ -190,12 +214,24 @@ class AppController:
             self.view.log(f"- Funciones de activación: {config['funciones_activacion'][0]} (oculta), {config['funciones_activacion'][1]} (salida)")
             if 'leaky relu' in config['funciones_activacion']:
                 self.view.log(f"- Beta Leaky ReLU: {float(config['beta_leaky_relu'])}")
-            if config['momentum']:
+            self.view.log(f"- Optimizador: {config['optimizador']}")
+            self.view.log(f"- Tasa de aprendizaje: {config['planificador']}")
+            if config['optimizador'] in ('momentum', 'nesterov'):
                 self.view.log(f"- Momentum habilitado con Beta: {float(config['beta'])}")
+            if config['validacion'] > 0:
+                self.view.log(f"- Validación: {config['validacion'] * 100:.0f}% de los patrones, paciencia: {config['paciencia']} épocas")
 
             # Crear red neuronal
             self.red = RedBP(config)
             
+            # Reiniciar la telemetría y el resultado antes de iniciar el hilo
+            patrones = len(self.datos_entrenamiento)
+            self.telemetria.iniciar(self.red.max_epocas, patrones - self.red.patrones_validacion(patrones))
+            self.view.reiniciar_grafica_error()
+            self.error_entrenamiento = None
+            self.entrenamiento_completado = False
+            self.view.log("Iniciando entrenamiento con backpropagation...")
+            
             # Iniciar entrenamiento en un hilo separado para no bloquear la interfaz
             self.thread_entrenamiento = threading.Thread(target=self.ejecutar_entrenamiento)
             self.thread_entrenamiento.daemon = True
@@ -211,53 +247,33 @@ class AppController:
             import traceback
             self.view.log(traceback.format_exc())
     
-    def actualizar_progreso_callback(self, epoca, max_epocas, error):
-        """Callback para actualizar el progreso del entrenamiento"""
-        self.epoca_actual = epoca
-        self.error_actual = error
-        
-        # Calcular porcentaje de progreso
-        if max_epocas > 0:
-            self.progreso = min(100, int((epoca / max_epocas) * 100))
-    
     def ejecutar_entrenamiento(self):
-        """Ejecuta el entrenamiento en un hilo separado"""
+        """
+        Ejecuta el entrenamiento en un hilo separado. El hilo no toca los widgets:
+        cada época se registra en self.telemetria y el resultado (o el error)
+        queda en atributos que lee actualizar_progreso_entrenamiento.
+        """
         try:
-            # Entrenar y obtener errores
-            self.view.log("Iniciando entrenamiento con backpropagation...")
-            
-            # Inicializar variables para seguimiento
-            self.epoca_actual = 0
-            self.error_actual = float('inf')
-            self.progreso = 0
-            
-            # Entrenar la red con callback para actualizar progreso
+            # Entrenar la red registrando cada época en la telemetría
             self.errores_entrenamiento, self.exactitud = self.red.entrenar(
                 np.array(self.datos_entrenamiento),
                 np.array(self.datos_salida),
-                callback=self.actualizar_progreso_callback
+                callback=self.telemetria.registrar_epoca
             )
             
             # Guardar pesos automáticamente
             carpeta = "Pesos_entrenados"
             if not os.path.exists(carpeta):
                 os.makedirs(carpeta)
-            self.pesos_archivo = os.path.join(carpeta, "pesos_actuales_Images.json")
+            self.pesos_archivo = os.path.join(carpeta, "pesos_actuales_Images.npz")
             self.red.guardar_pesos(self.pesos_archivo)
             
-            # Generar matriz de confusión
-            self.view.root.after(0, self.generar_matriz_confusion())
-            
-            # Actualizar información del modelo en el panel de pruebas
-            self.actualizar_info_modelo()
-            
             # Marcar finalización del entrenamiento
             self.entrenamiento_completado = True
             
         except Exception as e:
-            self.view.log(f"Error durante el entrenamiento: {str(e)}")
             import traceback
-            self.view.log(traceback.format_exc())
+            self.error_entrenamiento = f"Error durante el entrenamiento: {str(e)}\n{traceback.format_exc()}"
         finally:
             # Asegurarse de que la interfaz se actualice al finalizar
             self.entrenamiento_en_progreso = False
@@ -266,25 +282,16 @@ class AppController:
         """Genera la matriz de confusión para el entrenamiento"""
         try:
             # Preparar datos para la matriz de confusión
-            X = np.array(self.datos_entrenamiento).T
-            Y = np.array(self.datos_salida).T
-            
-            # Obtener predicciones
-            y_true = []
-            y_pred = []
-            
-            for i in range(X.shape[1]):
-                x = X[:, [i]]
-                y = Y[:, [i]]
-                pred = self.red.predecir([X[:, i]])[0]
-                y_true.append(np.argmax(y))
-                y_pred.append(np.argmax(pred))
+            X = np.asarray(self.datos_entrenamiento)
+            Y = np.asarray(self.datos_salida)
             
-            # Calcular matriz de confusión
-            cm = confusion_matrix(y_true, y_pred, labels=[0,1,2,3,4])
+            # Calcular matriz de confusión y métricas con una propagación por bloque
+            evaluacion = evaluar(self.red, X, Y, top_k=(2,))
+            cm = evaluacion.matriz
+            self.view.log(evaluacion.resumen(['A', 'E', 'I', 'O', 'U']))
             
             # Mostrar matriz de confusión en la vista
-            self.view.root.after(0, lambda: self.view.mostrar_matriz_confusion(cm, ['A', 'E', 'I', 'O', 'U']))
+            self.view.mostrar_matriz_confusion(cm, ['A', 'E', 'I', 'O', 'U'])
             
             # Cambiar a la pestaña de gráficas para mostrar los resultados
             self.view.notebook.select(1)  # Índice 1 corresponde a la pestaña "Gráficas"
@@ -295,10 +302,27 @@ class AppController:
             self.view.log(traceback.format_exc())
     
     def actualizar_progreso_entrenamiento(self):
-        """Actualiza la interfaz durante el entrenamiento"""
-        if not self.entrenamiento_en_progreso:
+        """Actualiza la interfaz durante el entrenamiento con los registros nuevos de la telemetría"""
+        # Leer la bandera antes de drenar, para no perder los últimos registros
+        en_progreso = self.entrenamiento_en_progreso
+        registros = self.telemetria.drenar()
+        if len(registros):
+            self.view.actualizar_grafica_error(registros)
+            self.log_registros(registros)
+        
+        if not en_progreso:
             # El entrenamiento ha terminado
-            if hasattr(self, 'entrenamiento_completado') and self.entrenamiento_completado:
+            if self.error_entrenamiento:
+                self.view.log(self.error_entrenamiento)
+                self.error_entrenamiento = None
+            
+            if self.entrenamiento_completado:
+                # Generar matriz de confusión
+                self.generar_matriz_confusion()
+                
+                # Actualizar información del modelo en el panel de pruebas
+                self.actualizar_info_modelo()
+                
                 # Actualizar estado de entrenamiento
                 self.view.status_label.config(text="Estado: Entrenado Exitosamente", foreground="green")
                 self.view.status_indicator.delete("all")
@@ -310,8 +334,10 @@ class AppController:
                 self.view.accuracy_value.config(text=f"{self.exactitud:.2f}%")
                 
                 # Mostrar gráfica
-                self.view.mostrar_grafica_error(self.errores_entrenamiento)
+                self.view.mostrar_grafica_error(self.errores_entrenamiento, self.red.errores_validacion)
                 self.view.log(f"Entrenamiento completado exitosamente en {len(self.errores_entrenamiento)} épocas")
+                if self.red.errores_validacion:
+                    self.view.log(f"Pesos de la época {self.red.mejor_epoca} (menor error de validación: {float(self.red.error_validacion):.6f})")
                 self.view.log(f"Pesos guardados automáticamente en: {self.pesos_archivo}")
                 
                 # Actualizar barra de progreso al 100%
@@ -326,19 +352,28 @@ class AppController:
             return
             
         # Actualizar barra de progreso
-        self.view.progress_bar['value'] = self.progreso
-        self.view.progress_label.config(text=f"{self.progreso}%")
-        
-        # Actualizar log cada 100 épocas
-        if hasattr(self, 'epoca_actual') and self.epoca_actual % 100 == 0 and self.epoca_actual > 0:
-            self.view.log(f"Entrenando... Época {self.epoca_actual}/{self.red.max_epocas} ({self.progreso}%)")
+        progreso = self.telemetria.progreso
+        self.view.progress_bar['value'] = progreso
+        self.view.progress_label.config(text=f"{progreso}%")
         
         # Programar la próxima actualización
         self.view.root.after(100, self.actualizar_progreso_entrenamiento)
     
+    def log_registros(self, registros):
+        """Muestra en el log las épocas múltiplos de 100 de un bloque de registros de la telemetría"""
+        max_epocas = self.telemetria.max_epocas
+        for registro in registros[registros['epoca'] % 100 == 0]:
+            epoca = int(registro['epoca'])
+            progreso = min(100, int(epoca * 100 / max_epocas)) if max_epocas > 0 else 0
+            validacion = "" if np.isnan(registro['error_validacion']) else f", error de validación: {float(registro['error_validacion']):.6f}"
+            self.view.log(f"Entrenando... Época {epoca}/{max_epocas} ({progreso}%), error: {float(registro['error']):.6f}"
+                          f"{validacion}, {float(registro['muestras_por_segundo']):.0f} patrones/s")
+    
     def cargar_pesos(self):
-        """Carga los pesos desde un archivo JSON"""
-        archivo = filedialog.askopenfilename(filetypes=[("Archivos JSON", "*.json")])
+        """Carga los pesos desde un archivo JSON o binario (.npz)"""
+        archivo = filedialog.askopenfilename(filetypes=[("Archivos de pesos", "*.json *.npz"),
+                                                        ("Archivos JSON", "*.json"),
+                                                        ("Archivos NPZ", "*.npz")])
         if archivo:
             try:
                 # Crear una instancia de la red si no existe
@@ -448,7 +483,7 @@ class AppController:
                 self.view.weights_file.config(text="Generado en memoria")
             
             # Actualizar información de arquitectura
-            arquitectura = f"{self.red.capa_entrada}-{self.red.capa_oculta}-{self.red.capa_salida}"
+            arquitectura = '-'.join(str(neuronas) for neuronas in self.red.dimensiones)
             activaciones = f"{self.red.funciones_activacion[0]}/{self.red.funciones_activacion[1]}"
             self.view.architecture_info.config(text=f"{arquitectura} ({activaciones})")
         else:
@@ -1,17 +1,22 @@
+import time
+_START = time.perf_counter()
+
+import argparse
 import tkinter as tk
 from tkinter import ttk
 import os
 import sys
 
-# Import the views and controllers
-from controllers.home_controller import HomeController
-from views.main_view import MainView
-from controllers.images_controller import AppController
+# The views and controllers (matplotlib, PIL, numpy, the models) are imported
+# when their tab is first opened, so the window appears without loading them
+from utils.arranque import PerfilArranque, precargar_en_segundo_plano
 from utils.ui_components import COLOR_BG, COLOR_LIGHT_BG, COLOR_PRIMARY, COLOR_PRIMARY_LIGHT, COLOR_SECONDARY, ModernButton
 
 class MainApplication:
-    def __init__(self, root):
+    def __init__(self, root, profile=None, show_profile=False):
         self.root = root
+        self.profile = profile or PerfilArranque()
+        self.show_profile = show_profile
         self.root.title("Red Backpropagation - Universidad de Cundinamarca")
         self.root.geometry("1200x720")
         self.root.configure(bg=COLOR_BG)
@@ -31,6 +36,25 @@ class MainApplication:
         # Show the default view (Info view with backpropagation description)
         self.show_info()
         
+        # Preload the heavy modules once the window is on screen
+        self.root.bind('<Map>', self.on_first_map, add='+')
+        
+    def on_first_map(self, event):
+        """Records the first visible window and starts preloading modules in the background"""
+        if event.widget is not self.root or self.profile.modulos_primera_ventana is not None:
+            return
+        self.profile.primera_ventana()
+        self.preload_thread = precargar_en_segundo_plano(perfil=self.profile)
+        if self.show_profile:
+            self.root.after(50, self.report_startup_profile)
+        
+    def report_startup_profile(self):
+        """Prints the startup profile once the background preload has finished"""
+        if self.preload_thread.is_alive():
+            self.root.after(50, self.report_startup_profile)
+            return
+        print(self.profile.informe())
+        
     def create_main_layout(self):
         """Creates the main layout with sidebar and content area"""
         # Main panel
@@ -129,7 +153,9 @@ class MainApplication:
             view_frame.pack(fill='both', expand=True)
             
             # Initialize the controller with this frame
-            self.home_controller = HomeController(view_frame)
+            with self.profile.medir("Vista de inicio"):
+                from controllers.home_controller import HomeController
+                self.home_controller = HomeController(view_frame)
             
             # Store reference to the view's main frame
             self.home_view_frame = view_frame
@@ -156,7 +182,10 @@ class MainApplication:
             view_frame.pack(fill='both', expand=True)
             
             # Initialize the controller with this frame
-            self.backprop_controller = MainView(view_frame)
+            with self.profile.medir("Laboratorio #3"):
+                from views.main_view import MainView
+                self.backprop_controller = MainView(view_frame)
+            self.report_tab_profile("Laboratorio #3")
             
             # Store reference to the view's main frame
             self.backprop_view_frame = view_frame
@@ -183,7 +212,10 @@ class MainApplication:
             view_frame.pack(fill='both', expand=True)
             
             # Initialize the controller with this frame
-            self.images_controller = AppController(view_frame)
+            with self.profile.medir("Laboratorio #3a"):
+                from controllers.images_controller import AppController
+                self.images_controller = AppController(view_frame)
+            self.report_tab_profile("Laboratorio #3a")
             
             # Store reference to the view's main frame
             self.images_view_frame = view_frame
@@ -193,12 +225,27 @@ class MainApplication:
         
         self.active_view = "lab3a"
 
+    def report_tab_profile(self, name):
+        """Prints how long the tab that was just opened took to load"""
+        if self.show_profile:
+            etapa, segundos, _ = next(marca for marca in reversed(self.profile.marcas) if marca[0].startswith(name + " ("))
+            print(f"Perfil: {etapa} abierto a los {segundos * 1000:.1f} ms")
+
     def clear_content(self):
         """Hides all views from the content area"""
         for widget in self.content_frame.winfo_children():
             widget.pack_forget()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Red Backpropagation - Universidad de Cundinamarca")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Prints the time of each startup stage and the modules loaded when the window appears')
+    args = parser.parse_args()
+    
+    profile = PerfilArranque(_START)
+    profile.marcar("Importaciones")
     root = tk.Tk()
-    app = MainApplication(root)
+    profile.marcar("Ventana raíz creada")
+    app = MainApplication(root, profile, args.profile_startup)
+    profile.marcar("Interfaz principal construida")
     root.mainloop()
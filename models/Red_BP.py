@@ -1,246 +1,158 @@
 import numpy as np
-import json
-import time
 
-class RedBP:
+from models.activaciones import obtener_activacion
+from models.evaluacion import evaluar
+from models.motor import MotorEntrenamiento, dimensiones_capas, propagar
+from models.nucleo import RedCapas
+
+class RedBP(RedCapas):
+    """
+    Red del laboratorio de imágenes sobre el núcleo común (models.nucleo).
+    
+    Entrena con todos los patrones a la vez por defecto (config['modo'] = 'batch'),
+    con inicialización de Xavier, delta de entropía cruzada para softmax, y
+    guarda los pesos como w_oculta, b_oculta, w_salida y b_salida.
+    """
+    modo_por_defecto = 'batch'
+    entropia_cruzada_softmax = True
+    intervalo_progreso = 1000
+    # Archivos de pesos: w_oculta, w_salida, b_oculta y b_salida con una capa oculta; w_k y b_k con varias
+    nombres_una_oculta = (('w_oculta', 'w_salida'), ('b_oculta', 'b_salida'))
+    prefijos_matrices = ('w', 'b')
+    
     def __init__(self, config):
         """Inicializa la red neuronal con la configuración proporcionada"""
         self.capa_entrada = config['capa_entrada']
-        self.capa_oculta = config['capa_oculta']
+        self.capa_oculta = config['capa_oculta']  # Entero o lista con las neuronas de cada capa oculta
         self.capa_salida = config['capa_salida']
-        self.alfa = config['alfa']
-        self.max_epocas = config['max_epocas']
-        self.precision = config['precision']
-        self.bias = config['bias']
-        self.funciones_activacion = config['funciones_activacion']
-        self.beta_leaky_relu = config.get('beta_leaky_relu', 0.01)
+        self.alfa = float(config['alfa'])
         self.momentum = config.get('momentum', False)
-        self.beta = config.get('beta', 0.0)
-        
-        # Variables para seguimiento del entrenamiento
-        self.epoca_actual = 0
-        self.error_actual = float('inf')
-        
-        # Inicializar pesos aleatoriamente
-        self.inicializar_pesos()
-        
-        # Inicializar variables para momentum si está habilitado
-        if self.momentum:
-            self.delta_w_oculta_prev = np.zeros((self.capa_oculta, self.capa_entrada))
-            self.delta_w_salida_prev = np.zeros((self.capa_salida, self.capa_oculta))
-            self.delta_b_oculta_prev = np.zeros((self.capa_oculta, 1))
-            self.delta_b_salida_prev = np.zeros((self.capa_salida, 1))
+        self.beta = float(config.get('beta', 0.0))
+        super().__init__(config)
     
     def inicializar_pesos(self):
-        """Inicializa los pesos y bias de la red con valores aleatorios pequeños"""
-        # Inicialización de Xavier/Glorot para mejorar la convergencia
-        limite_oculta = np.sqrt(6 / (self.capa_entrada + self.capa_oculta))
-        limite_salida = np.sqrt(6 / (self.capa_oculta + self.capa_salida))
+        """
+        Inicializa los pesos y bias de la red con valores aleatorios pequeños.
+        self.pesos y self.umbrales tienen una matriz por capa con pesos (ocultas y salida).
+        """
+        dimensiones = dimensiones_capas({
+            'capa_entrada': self.capa_entrada,
+            'capa_oculta': self.capa_oculta,
+            'capa_salida': self.capa_salida
+        })
         
-        self.w_oculta = np.random.uniform(-limite_oculta, limite_oculta, (self.capa_oculta, self.capa_entrada))
-        self.w_salida = np.random.uniform(-limite_salida, limite_salida, (self.capa_salida, self.capa_oculta))
+        # Inicialización de Xavier/Glorot para mejorar la convergencia
+        self.pesos = []
+        for entradas, salidas in zip(dimensiones[:-1], dimensiones[1:]):
+            limite = np.sqrt(6 / (entradas + salidas))
+            self.pesos.append(np.random.uniform(-limite, limite, (salidas, entradas)).astype(self.dtype, copy=False))
         
-        # Inicializar bias con ceros
-        self.b_oculta = np.zeros((self.capa_oculta, 1))
-        self.b_salida = np.zeros((self.capa_salida, 1))
+        # Inicializar bias con ceros (esta red siempre tiene bias)
+        self.umbrales = [np.zeros((salidas, 1), dtype=self.dtype) for salidas in dimensiones[1:]]
+    
+    # Pesos y bias de la primera capa oculta y de la capa de salida
+    @property
+    def w_oculta(self):
+        return self.pesos[0]
+    
+    @w_oculta.setter
+    def w_oculta(self, w):
+        self.pesos[0] = w
+    
+    @property
+    def b_oculta(self):
+        return self.umbrales[0]
+    
+    @b_oculta.setter
+    def b_oculta(self, b):
+        self.umbrales[0] = b
+    
+    @property
+    def w_salida(self):
+        return self.pesos[-1]
+    
+    @w_salida.setter
+    def w_salida(self, w):
+        self.pesos[-1] = w
+    
+    @property
+    def b_salida(self):
+        return self.umbrales[-1]
+    
+    @b_salida.setter
+    def b_salida(self, b):
+        self.umbrales[-1] = b
+    
+    def resolver_activaciones(self):
+        """Obtiene del registro las activaciones de cada capa, la de la capa oculta y la de salida"""
+        super().resolver_activaciones()
+        self.act_oculta = self.activaciones[0]
+        self.act_salida = self.activaciones[-1]
     
     def activacion(self, x, funcion, derivada=False):
-        """Aplica la función de activación especificada"""
-        if funcion == 'sigmoide':
-            if derivada:
-                return x * (1 - x)
-            return 1 / (1 + np.exp(-x))
-        
-        elif funcion == 'tanh':
-            if derivada:
-                return 1 - np.power(np.tanh(x), 2)
-            return np.tanh(x)
-        
-        elif funcion == 'relu':
-            if derivada:
-                return np.where(x > 0, 1, 0)
-            return np.maximum(0, x)
-        
-        elif funcion == 'leaky relu':
-            if derivada:
-                return np.where(x > 0, 1, self.beta_leaky_relu)
-            return np.where(x > 0, x, x * self.beta_leaky_relu)
-        
-        elif funcion == 'lineal':
-            if derivada:
-                return np.ones_like(x)
-            return x
-        
-        elif funcion == 'softmax':
-            if derivada:
-                # La derivada de softmax se maneja de manera especial en el algoritmo
-                return x
-            exp_x = np.exp(x - np.max(x, axis=0, keepdims=True))
-            return exp_x / np.sum(exp_x, axis=0, keepdims=True)
-        
-        else:
-            raise ValueError(f"Función de activación no reconocida: {funcion}")
+        """Aplica la función de activación especificada (la derivada se calcula a partir de la salida x)"""
+        kernel = obtener_activacion(funcion)
+        if derivada:
+            return kernel.derivar(None, x, beta_leaky_relu=self.beta_leaky_relu)
+        return kernel(x, beta_leaky_relu=self.beta_leaky_relu)
     
     def forward(self, X):
-        """Propagación hacia adelante"""
-        # Capa oculta
-        self.z_oculta = np.dot(self.w_oculta, X) + self.b_oculta
-        self.a_oculta = self.activacion(self.z_oculta, self.funciones_activacion[0])
-        
-        # Capa de salida
-        self.z_salida = np.dot(self.w_salida, self.a_oculta) + self.b_salida
-        self.a_salida = self.activacion(self.z_salida, self.funciones_activacion[1])
-        
-        return self.a_salida
+        """Propagación hacia adelante de los ejemplos en columnas"""
+        return propagar(self.pesos, self.umbrales, self.activaciones, X, self.parametros)
     
-    def backward(self, X, Y, salida):
-        """Propagación hacia atrás y actualización de pesos"""
+    def backward(self, X, Y, salida=None, destino=None):
+        """
+        Propagación hacia atrás y actualización de pesos con todos los ejemplos
+        (en columnas), en un paso del motor de entrenamiento. El motor vuelve a
+        propagar X, por lo que salida solo se acepta por compatibilidad.
+        Si se da destino (tupla de matrices como la de obtener_pesos), los pesos
+        actualizados se escriben en ella y pasan a ser los pesos de la red, sin
+        modificar las matrices anteriores.
+        """
         m = X.shape[1]  # Número de ejemplos
-        
-        # Cálculo del error en la capa de salida
-        if self.funciones_activacion[1] == 'softmax':
-            # Para softmax, el error es simplemente la diferencia
-            delta_salida = salida - Y
-        else:
-            # Para otras funciones, multiplicamos por la derivada
-            delta_salida = (salida - Y) * self.activacion(self.a_salida, self.funciones_activacion[1], derivada=True)
-        
-        # Cálculo del error en la capa oculta
-        delta_oculta = np.dot(self.w_salida.T, delta_salida) * self.activacion(self.a_oculta, self.funciones_activacion[0], derivada=True)
-        
-        # Cálculo de gradientes
-        dw_salida = np.dot(delta_salida, self.a_oculta.T) / m
-        db_salida = np.sum(delta_salida, axis=1, keepdims=True) / m
-        dw_oculta = np.dot(delta_oculta, X.T) / m
-        db_oculta = np.sum(delta_oculta, axis=1, keepdims=True) / m
-        
-        # Actualización de pesos con momentum si está habilitado
-        if self.momentum:
-            # Calcular deltas con momentum
-            delta_w_salida = -self.alfa * dw_salida + self.beta * self.delta_w_salida_prev
-            delta_b_salida = -self.alfa * db_salida + self.beta * self.delta_b_salida_prev
-            delta_w_oculta = -self.alfa * dw_oculta + self.beta * self.delta_w_oculta_prev
-            delta_b_oculta = -self.alfa * db_oculta + self.beta * self.delta_b_oculta_prev
-            
-            # Guardar deltas para la siguiente iteración
-            self.delta_w_salida_prev = delta_w_salida
-            self.delta_b_salida_prev = delta_b_salida
-            self.delta_w_oculta_prev = delta_w_oculta
-            self.delta_b_oculta_prev = delta_b_oculta
-        else:
-            # Actualización estándar sin momentum
-            delta_w_salida = -self.alfa * dw_salida
-            delta_b_salida = -self.alfa * db_salida
-            delta_w_oculta = -self.alfa * dw_oculta
-            delta_b_oculta = -self.alfa * db_oculta
-        
-        # Aplicar actualizaciones
-        self.w_salida += delta_w_salida
-        self.b_salida += delta_b_salida
-        self.w_oculta += delta_w_oculta
-        self.b_oculta += delta_b_oculta
+        self.asegurar_pesos_escribibles()
+        motor = MotorEntrenamiento(self, m, m, self.activaciones, self.parametros)
+        motor.paso(X, Y, motor.buffers(m), self.alfa_actual, destino)
     
     def calcular_error(self, Y, salida):
         """Calcula el error cuadrático medio"""
         return np.mean(np.sum((Y - salida) ** 2, axis=0)) / 2
     
     def entrenar(self, X, Y, callback=None):
-        """Entrena la red neuronal con los datos proporcionados"""
-        # Convertir a matrices numpy si no lo son ya
-        X = np.array(X).T  # Transponer para tener ejemplos en columnas
-        Y = np.array(Y).T  # Transponer para tener ejemplos en columnas
+        """
+        Entrena la red neuronal con los datos proporcionados (ver RedCapas.entrenar_epocas).
         
-        # Lista para almacenar errores durante el entrenamiento
-        errores = []
+        Si config['validacion'] > 0, esa fracción de los patrones se reserva para
+        validación, con parada temprana tras config['paciencia'] épocas sin mejora.
         
-        # Iniciar entrenamiento
-        inicio = time.time()
-        for epoca in range(self.max_epocas):
-            self.epoca_actual = epoca + 1
-            
-            # Forward pass
-            salida = self.forward(X)
-            
-            # Calcular error
-            error = self.calcular_error(Y, salida)
-            self.error_actual = error
-            errores.append(error)
-            
-            # Llamar al callback si existe
-            if callback:
-                callback(epoca + 1, self.max_epocas, error)
-            
-            # Verificar condición de parada
-            if error <= self.precision:
-                break
-            
-            # Backward pass y actualización de pesos
-            self.backward(X, Y, salida)
-            
-            # Mostrar progreso cada 1000 épocas o en la última
-            if (epoca + 1) % 1000 == 0 or epoca == self.max_epocas - 1:
-                tiempo_transcurrido = time.time() - inicio
-                print(f"Época {epoca + 1}/{self.max_epocas}, Error: {error:.6f}, Tiempo: {tiempo_transcurrido:.2f}s")
+        callback(epoca, max_epocas, error, error_validacion), con error_validacion None sin validación.
         
-        # Calcular exactitud final
-        salida_final = self.forward(X)
-        predicciones = np.argmax(salida_final, axis=0)
-        etiquetas = np.argmax(Y, axis=0)
-        exactitud = np.mean(predicciones == etiquetas) * 100
+        Returns:
+            tuple: (errores por época, exactitud en % sobre los patrones de entrenamiento)
+        """
+        X, Y = self.preparar_datos(X, Y)
+        X, Y, X_validacion, Y_validacion = self.separar_validacion(X, Y)
+        errores = self.entrenar_epocas(X, Y, X_validacion, Y_validacion, callback)
         
-        print(f"Entrenamiento completado en {self.epoca_actual} épocas")
-        print(f"Error final: {self.error_actual:.6f}")
+        # Calcular exactitud final
+        exactitud = evaluar(self, X, Y).exactitud
         print(f"Exactitud: {exactitud:.2f}%")
         
         return errores, exactitud
     
-    def predecir(self, X):
-        """Realiza predicciones para los datos de entrada"""
-        # Convertir a matriz numpy si no lo es ya
-        X = np.array(X)
-        
-        # Si X es un solo ejemplo (vector), convertirlo a matriz columna
-        if X.ndim == 1:
-            X = X.reshape(-1, 1)
-        elif X.ndim == 2 and X.shape[0] != self.capa_entrada:
-            # Si X tiene múltiples ejemplos en filas, transponerlo
-            X = X.T
-        
-        # Forward pass
-        return self.forward(X).T  # Transponer de vuelta para tener ejemplos en filas
-    
-    def guardar_pesos(self, archivo):
-        """Guarda los pesos y bias de la red en un archivo JSON"""
-        datos = {
-            'w_oculta': self.w_oculta.tolist(),
-            'b_oculta': self.b_oculta.tolist(),
-            'w_salida': self.w_salida.tolist(),
-            'b_salida': self.b_salida.tolist(),
-            'config': {
-                'capa_entrada': self.capa_entrada,
-                'capa_oculta': self.capa_oculta,
-                'capa_salida': self.capa_salida,
-                'funciones_activacion': self.funciones_activacion,
-                'beta_leaky_relu': self.beta_leaky_relu
-            }
+    def config_guardada(self):
+        """Configuración que se guarda junto a los pesos"""
+        return {
+            'capa_entrada': self.capa_entrada,
+            'capa_oculta': self.capa_oculta,
+            'capa_salida': self.capa_salida,
+            'funciones_activacion': self.funciones_activacion,
+            'beta_leaky_relu': self.beta_leaky_relu,
+            'dtype': self.dtype.name
         }
-        
-        with open(archivo, 'w') as f:
-            json.dump(datos, f)
     
-    def cargar_pesos(self, archivo):
-        """Carga los pesos y bias de la red desde un archivo JSON"""
-        with open(archivo, 'r') as f:
-            datos = json.load(f)
-        
-        # Cargar pesos y bias
-        self.w_oculta = np.array(datos['w_oculta'])
-        self.b_oculta = np.array(datos['b_oculta'])
-        self.w_salida = np.array(datos['w_salida'])
-        self.b_salida = np.array(datos['b_salida'])
-        
-        # Verificar y actualizar configuración si es necesario
-        config = datos.get('config', {})
+    def aplicar_config_cargada(self, config):
+        """Verifica las dimensiones guardadas y actualiza la configuración de la red"""
         if config:
             # Verificar dimensiones
             if config.get('capa_entrada') != self.capa_entrada:
@@ -253,11 +165,6 @@ class RedBP:
             if config.get('capa_salida') != self.capa_salida:
                 print(f"Advertencia: La capa de salida en el archivo ({config.get('capa_salida')}) no coincide con la configuración actual ({self.capa_salida})")
                 self.capa_salida = config.get('capa_salida')
-            
-            # Actualizar funciones de activación si están presentes
-            if 'funciones_activacion' in config:
-                self.funciones_activacion = config['funciones_activacion']
-            
-            # Actualizar beta para Leaky ReLU si está presente
-            if 'beta_leaky_relu' in config:
-                self.beta_leaky_relu = config['beta_leaky_relu']
+        
+        # Actualizar funciones de activación y beta para Leaky ReLU si están presentes
+        super().aplicar_config_cargada(config)
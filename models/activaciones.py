@@ -0,0 +1,161 @@
+import numpy as np
+
+
+class Activacion:
+    """
+    Par de kernels (función, derivada) de una función de activación.
+
+    Los kernels trabajan sobre buffers: escriben el resultado en out sin
+    reservar memoria nueva y conservan el dtype de la entrada (float32 o
+    float64). La derivada recibe la entrada x y la salida y ya calculada,
+    de modo que las funciones del registro la obtienen a partir de y sin
+    volver a evaluar la activación.
+    """
+    def __init__(self, nombre, funcion, derivada):
+        """
+        Args:
+            nombre: Nombre con el que se registra la activación
+            funcion: Kernel funcion(x, out, **parametros)
+            derivada: Kernel derivada(x, y, out, **parametros)
+        """
+        self.nombre = nombre
+        self.funcion = funcion
+        self.derivada = derivada
+
+    def __call__(self, x, out=None, derivada=None, **parametros):
+        """
+        Calcula la activación de x y, opcionalmente, su derivada en el mismo paso.
+
+        Args:
+            x: Entradas netas de la capa
+            out: Buffer donde escribir la salida (no debe compartir memoria con x)
+            derivada: Buffer donde escribir la derivada a partir de la salida
+            parametros: Parámetros de la activación (p. ej. beta_leaky_relu)
+
+        Returns:
+            Salida de la activación (out si se proporcionó)
+        """
+        if out is None:
+            out = np.empty_like(x, dtype=np.result_type(x, np.float32))
+        self.funcion(x, out, **parametros)
+        if derivada is not None:
+            self.derivada(x, out, derivada, **parametros)
+        return out
+
+    def derivar(self, x, y, out=None, **parametros):
+        """Calcula la derivada a partir de la entrada x y la salida y ya calculada"""
+        if out is None:
+            out = np.empty_like(y)
+        self.derivada(x, y, out, **parametros)
+        return out
+
+
+# ===== KERNELS DE LAS ACTIVACIONES INCLUIDAS =====
+
+def _sigmoide(x, out, **_):
+    np.negative(x, out=out)
+    np.exp(out, out=out)
+    out += 1
+    np.reciprocal(out, out=out)
+
+
+def _sigmoide_derivada(x, y, out, **_):
+    np.subtract(1, y, out=out)
+    out *= y
+
+
+def _tanh(x, out, **_):
+    np.tanh(x, out=out)
+
+
+def _tanh_derivada(x, y, out, **_):
+    np.multiply(y, y, out=out)
+    np.subtract(1, out, out=out)
+
+
+def _relu(x, out, **_):
+    np.maximum(x, 0, out=out)
+
+
+def _relu_derivada(x, y, out, **_):
+    np.greater(y, 0, out=out)
+
+
+def _leaky_relu(x, out, beta_leaky_relu=0.01, **_):
+    # x + (beta - 1) * min(x, 0)
+    np.minimum(x, 0, out=out)
+    out *= beta_leaky_relu - 1
+    out += x
+
+
+def _leaky_relu_derivada(x, y, out, beta_leaky_relu=0.01, **_):
+    np.greater(y, 0, out=out)
+    out *= 1 - beta_leaky_relu
+    out += beta_leaky_relu
+
+
+def _lineal(x, out, **_):
+    np.copyto(out, x)
+
+
+def _lineal_derivada(x, y, out, **_):
+    out.fill(1)
+
+
+def _softmax(x, out, **_):
+    # Las neuronas están en filas y los patrones en columnas
+    np.subtract(x, np.max(x, axis=0, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= np.sum(out, axis=0, keepdims=True)
+
+
+def _softmax_derivada(x, y, out, **_):
+    # Simplificada para backpropagation (diagonal del jacobiano)
+    _sigmoide_derivada(x, y, out)
+
+
+# ===== REGISTRO =====
+
+_REGISTRO = {}
+
+
+def registrar_activacion(nombre, funcion, derivada, reemplazar=False):
+    """
+    Registra una función de activación para que puedan usarla las redes.
+
+    Args:
+        nombre: Nombre de la activación (el usado en 'funciones_activacion')
+        funcion: Kernel funcion(x, out, **parametros) que escribe la salida en out
+        derivada: Kernel derivada(x, y, out, **parametros) que escribe la derivada en out
+        reemplazar: Permite sobrescribir una activación ya registrada
+
+    Returns:
+        La Activacion registrada
+    """
+    nombre = nombre.lower()
+    if nombre in _REGISTRO and not reemplazar:
+        raise ValueError(f"La función de activación '{nombre}' ya está registrada")
+    activacion = Activacion(nombre, funcion, derivada)
+    _REGISTRO[nombre] = activacion
+    return activacion
+
+
+def obtener_activacion(nombre):
+    """Devuelve la Activacion registrada con el nombre indicado"""
+    try:
+        return _REGISTRO[nombre.lower()]
+    except KeyError:
+        raise ValueError(f"Función de activación no reconocida: {nombre}") from None
+
+
+def activaciones_disponibles():
+    """Devuelve los nombres de las activaciones registradas"""
+    return list(_REGISTRO)
+
+
+registrar_activacion('sigmoide', _sigmoide, _sigmoide_derivada)
+registrar_activacion('tanh', _tanh, _tanh_derivada)
+registrar_activacion('relu', _relu, _relu_derivada)
+registrar_activacion('leaky relu', _leaky_relu, _leaky_relu_derivada)
+registrar_activacion('lineal', _lineal, _lineal_derivada)
+registrar_activacion('softmax', _softmax, _softmax_derivada)
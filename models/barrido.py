@@ -0,0 +1,254 @@
+"""
+Barrido de hiperparámetros de RedBP en paralelo
+Universidad de Cundinamarca
+
+Entrena una red por cada configuración de un espacio de búsqueda (grid o
+aleatorio) sobre el diccionario config, repartiendo las configuraciones
+entre procesos con un solo hilo BLAS cada uno. La matriz de entrenamiento
+se publica una vez en memoria compartida (models.conjunto_datos) y cada
+proceso la adjunta sin copiarla.
+
+Uso:
+    python -m models.barrido datos.txt --espacio '{"alfa": [0.1, 0.5], "capa_oculta": [8, 16]}'
+    python -m models.barrido carpeta_imagenes --espacio espacio.json --aleatorio 32 --procesos 64
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_context
+
+import numpy as np
+
+from models.configuracion import CONFIG_BASE, cargar_datos, leer_json
+from models.conjunto_datos import ConjuntoDatos
+
+# Variables de entorno que limitan los hilos de las bibliotecas BLAS
+VARIABLES_HILOS_BLAS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+)
+
+# Datos compartidos del proceso trabajador (se adjuntan una vez en el inicializador)
+_datos_trabajador = {}
+
+
+def generar_grid(espacio):
+    """
+    Genera todas las combinaciones de un espacio de búsqueda.
+
+    Args:
+        espacio: Diccionario clave de config -> lista de valores posibles
+
+    Yields:
+        Diccionarios con una combinación de valores
+    """
+    claves = list(espacio)
+    for valores in itertools.product(*(espacio[clave] for clave in claves)):
+        yield dict(zip(claves, valores))
+
+
+def generar_aleatorio(espacio, n, semilla=None):
+    """
+    Genera configuraciones aleatorias de un espacio de búsqueda.
+
+    Cada valor del espacio puede ser una lista (se elige un elemento al azar)
+    o un rango {'min': a, 'max': b, 'log': bool, 'entero': bool}.
+
+    Args:
+        espacio: Diccionario clave de config -> lista o rango
+        n: Número de configuraciones a generar
+        semilla: Semilla del generador aleatorio
+
+    Yields:
+        Diccionarios con una combinación de valores
+    """
+    rng = np.random.default_rng(semilla)
+    for _ in range(n):
+        config = {}
+        for clave, valores in espacio.items():
+            if isinstance(valores, dict):
+                bajo, alto = float(valores['min']), float(valores['max'])
+                if valores.get('log', False):
+                    valor = float(np.exp(rng.uniform(np.log(bajo), np.log(alto))))
+                else:
+                    valor = float(rng.uniform(bajo, alto))
+                config[clave] = int(round(valor)) if valores.get('entero', False) else valor
+            else:
+                config[clave] = valores[int(rng.integers(len(valores)))]
+        yield config
+
+
+@contextmanager
+def un_hilo_blas():
+    """Fija un hilo BLAS en el entorno que heredan los procesos creados dentro del bloque"""
+    anteriores = {nombre: os.environ.get(nombre) for nombre in VARIABLES_HILOS_BLAS}
+    os.environ.update({nombre: '1' for nombre in VARIABLES_HILOS_BLAS})
+    try:
+        yield
+    finally:
+        for nombre, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(nombre, None)
+            else:
+                os.environ[nombre] = valor
+
+
+def _inicializar_trabajador(descriptor, silencioso):
+    """Adjunta los datos compartidos y limita BLAS a un hilo en el proceso trabajador"""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+    if silencioso:
+        sys.stdout = open(os.devnull, 'w')
+
+    _datos_trabajador['datos'] = ConjuntoDatos.adjuntar(descriptor)
+
+
+def _entrenar_configuracion(indice, config, modelo):
+    """Entrena una red con la configuración dada en el proceso trabajador"""
+    X = _datos_trabajador['datos'].entradas
+    Y = _datos_trabajador['datos'].salidas
+
+    if 'semilla' in config:
+        np.random.seed(int(config['semilla']))
+
+    inicio = time.perf_counter()
+    if modelo == 'backpropagation':
+        from models.backpropagation import RedBP
+        from models.evaluacion import evaluar
+        red = RedBP(dict(config))
+        errores = red.entrenar(X, Y)
+        # evaluar aplica el umbral de 0.5 cuando la red tiene una sola salida
+        exactitud = evaluar(red, X, Y).exactitud
+    else:
+        from models.Red_BP import RedBP
+        red = RedBP(dict(config))
+        errores, exactitud = red.entrenar(X, Y)
+    tiempo = time.perf_counter() - inicio
+
+    return {
+        'indice': indice,
+        'config': config,
+        'errores': [float(e) for e in errores],
+        'epocas': len(errores),
+        'error_final': float(errores[-1]) if len(errores) else float('inf'),
+        'exactitud': float(exactitud),
+        'tiempo': tiempo,
+    }
+
+
+def ejecutar_barrido(X, Y, configuraciones, config_base=None, modelo='Red_BP', procesos=None, silencioso=True):
+    """
+    Entrena una red por configuración en un pool de procesos.
+
+    Las matrices X e Y se publican en memoria compartida una sola vez como
+    ConjuntoDatos y cada proceso trabajador las adjunta en solo lectura. Los
+    resultados se producen a medida que terminan los entrenamientos.
+
+    Args:
+        X: Matriz de patrones de entrada, cada fila es un patrón
+        Y: Matriz de salidas deseadas, cada fila es un patrón
+        configuraciones: Iterable de diccionarios con los valores a probar
+        config_base: Valores comunes de config (se completan capa_entrada y capa_salida)
+        modelo: 'Red_BP' (models.Red_BP) o 'backpropagation' (models.backpropagation)
+        procesos: Número de procesos trabajadores (por defecto, uno por núcleo)
+        silencioso: Descarta la salida estándar de los trabajadores
+
+    Yields:
+        Diccionarios con 'indice', 'config', 'errores', 'epocas', 'error_final',
+        'exactitud' (%) y 'tiempo' (s) de cada configuración
+    """
+    if modelo not in ('Red_BP', 'backpropagation'):
+        raise ValueError(f"Modelo no reconocido: {modelo}")
+
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    base = dict(CONFIG_BASE)
+    base.update({
+        'capa_entrada': X.shape[1],
+        'capa_oculta': int(np.sqrt(X.shape[1] * Y.shape[1])),
+        'capa_salida': Y.shape[1],
+    })
+    base.update(config_base or {})
+
+    with ConjuntoDatos(X, Y) as datos:
+        descriptor = datos.publicar()
+        with un_hilo_blas():
+            pool = ProcessPoolExecutor(
+                max_workers=procesos or os.cpu_count(),
+                mp_context=get_context('spawn'),
+                initializer=_inicializar_trabajador,
+                initargs=(descriptor, silencioso)
+            )
+            futuros = [
+                pool.submit(_entrenar_configuracion, indice, dict(base, **config), modelo)
+                for indice, config in enumerate(configuraciones)
+            ]
+        with pool:
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m models.barrido',
+        description='Barrido de hiperparámetros de RedBP en paralelo'
+    )
+    parser.add_argument('datos', help='Archivo de patrones (x | y), archivo normalizado de imágenes (texto o .npz) o carpeta de imágenes')
+    parser.add_argument('--espacio', required=True, help='Espacio de búsqueda: JSON en línea o ruta a un archivo JSON')
+    parser.add_argument('--base', default=None, help='Valores comunes de config: JSON en línea o ruta a un archivo JSON')
+    parser.add_argument('--modelo', choices=['Red_BP', 'backpropagation'], default='Red_BP')
+    parser.add_argument('--aleatorio', type=int, default=0, help='Número de configuraciones aleatorias (0 = grid completo)')
+    parser.add_argument('--semilla', type=int, default=None, help='Semilla de la búsqueda aleatoria')
+    parser.add_argument('--procesos', type=int, default=None, help='Número de procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--salida', default=None, help='Archivo JSONL donde guardar los resultados con sus curvas de error')
+    args = parser.parse_args(argv)
+
+    X, Y = cargar_datos(args.datos)
+    espacio = leer_json(args.espacio)
+    config_base = leer_json(args.base) if args.base else None
+
+    if args.aleatorio > 0:
+        configuraciones = list(generar_aleatorio(espacio, args.aleatorio, args.semilla))
+    else:
+        configuraciones = list(generar_grid(espacio))
+
+    print(f"Barrido de {len(configuraciones)} configuraciones sobre {X.shape[0]} patrones ({args.modelo})")
+
+    resultados = []
+    salida = open(args.salida, 'w') if args.salida else None
+    try:
+        for resultado in ejecutar_barrido(X, Y, configuraciones, config_base, args.modelo, args.procesos):
+            resultados.append(resultado)
+            valores = {clave: resultado['config'][clave] for clave in espacio}
+            print(f"[{len(resultados)}/{len(configuraciones)}] Exactitud: {resultado['exactitud']:.2f}%, "
+                  f"Error: {resultado['error_final']:.6f}, Épocas: {resultado['epocas']}, "
+                  f"Tiempo: {resultado['tiempo']:.2f}s, {valores}")
+            if salida:
+                salida.write(json.dumps(resultado) + '\n')
+                salida.flush()
+    finally:
+        if salida:
+            salida.close()
+
+    if resultados:
+        mejor = max(resultados, key=lambda r: (r['exactitud'], -r['error_final']))
+        print(f"Mejor configuración: {json.dumps(mejor['config'])}")
+        print(f"Exactitud: {mejor['exactitud']:.2f}%, Error final: {mejor['error_final']:.6f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Caché incremental de carpetas de imágenes
+Universidad de Cundinamarca
+
+Guarda, por carpeta y tamaño de normalización, los píxeles uint8 de cada
+imagen junto con su nombre, fecha de modificación y tamaño (y, si se pide,
+un hash de su contenido). Al volver a cargar la carpeta solo se procesan
+con models.ingesta las imágenes nuevas o modificadas; las entradas de
+imágenes eliminadas o cambiadas se descartan al reescribir la caché, y las
+cachés de carpetas que ya no existen o que exceden el máximo se eliminan.
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from models.data_processor import list_vowel_images
+from models.ingesta import ingerir_rutas
+
+# Carpeta por defecto de las cachés
+DIRECTORIO_CACHE = "Cache_datos"
+
+
+def hash_archivo(ruta, tam_bloque=1 << 20):
+    """Hash SHA-1 del contenido de un archivo"""
+    h = hashlib.sha1()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+class CacheImagenes:
+    """
+    Caché persistente de carpetas de imágenes normalizadas.
+
+    Uso:
+        cache = CacheImagenes()
+        pixeles, etiquetas, estadisticas = cache.cargar(carpeta)
+    """
+    def __init__(self, directorio=DIRECTORIO_CACHE, size=(48, 48), verificar_contenido=False, max_carpetas=10):
+        """
+        Args:
+            directorio: Carpeta donde se guardan las cachés (.npz)
+            size: Tamaño (ancho, alto) al que se normaliza cada imagen
+            verificar_contenido: Si es True, las imágenes se identifican por el hash
+                                 de su contenido en lugar de por fecha y tamaño
+            max_carpetas: Número máximo de carpetas en caché (se eliminan las más antiguas)
+        """
+        self.directorio = directorio
+        self.size = tuple(size)
+        self.verificar_contenido = verificar_contenido
+        self.max_carpetas = max_carpetas
+
+    def archivo_cache(self, carpeta):
+        """Ruta de la caché de una carpeta para el tamaño de normalización actual"""
+        clave = hashlib.sha1(os.path.abspath(carpeta).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directorio, f"{clave}_{self.size[0]}x{self.size[1]}.npz")
+
+    def cargar(self, carpeta, trabajadores=None, modo='hilos', progreso=None):
+        """
+        Carga las imágenes de vocales de una carpeta reutilizando la caché.
+
+        Args:
+            carpeta: Carpeta con imágenes cuyo nombre empieza por la vocal
+            trabajadores, modo, progreso: Ver models.ingesta.ingerir_carpeta
+
+        Returns:
+            tuple: (píxeles uint8 N x 3*H*W, índices de vocal N, EstadisticasIngesta)
+        """
+        inicio = time.perf_counter()
+        imagenes = list_vowel_images(carpeta)
+        rutas = [ruta for ruta, _ in imagenes]
+        etiquetas = np.array([etiqueta for _, etiqueta in imagenes], dtype=np.uint8)
+        nombres = [os.path.basename(ruta) for ruta in rutas]
+        estados = [os.stat(ruta) for ruta in rutas]
+        mtimes = np.array([estado.st_mtime_ns for estado in estados], dtype=np.int64)
+        tamanos = np.array([estado.st_size for estado in estados], dtype=np.int64)
+        hashes = [hash_archivo(ruta) for ruta in rutas] if self.verificar_contenido else []
+        claves = hashes if self.verificar_contenido else list(zip(nombres, mtimes.tolist(), tamanos.tolist()))
+
+        archivo = self.archivo_cache(carpeta)
+        previa = self._leer(archivo)
+        filas_previas = {}
+        if previa is not None:
+            if self.verificar_contenido:
+                claves_previas = previa['hashes'] if len(previa['hashes']) == len(previa['nombres']) else []
+            else:
+                claves_previas = zip(previa['nombres'], previa['mtimes'].tolist(), previa['tamanos'].tolist())
+            filas_previas = {clave: fila for fila, clave in enumerate(claves_previas)}
+
+        # Reutilizar las imágenes sin cambios y procesar solo las pendientes
+        pixeles = np.empty((len(rutas), 3 * self.size[0] * self.size[1]), dtype=np.uint8)
+        pendientes = []
+        for i, clave in enumerate(claves):
+            fila = filas_previas.get(clave)
+            if fila is None:
+                pendientes.append(i)
+            else:
+                pixeles[i] = previa['pixeles'][fila]
+
+        nuevos, estadisticas = ingerir_rutas([rutas[i] for i in pendientes], self.size, trabajadores, modo, progreso)
+        pixeles[pendientes] = nuevos
+        estadisticas.reutilizadas = len(rutas) - len(pendientes)
+        estadisticas.imagenes = len(rutas)
+
+        # Reescribir la caché si hubo imágenes nuevas, modificadas o eliminadas
+        if previa is None or pendientes or nombres != previa['nombres']:
+            self._guardar(archivo, carpeta, nombres, mtimes, tamanos, hashes, pixeles, etiquetas)
+            self.purgar()
+        else:
+            # Marcar la caché como usada recientemente para purgar()
+            os.utime(archivo)
+
+        estadisticas.tiempo_total = time.perf_counter() - inicio
+        return pixeles, etiquetas, estadisticas
+
+    def _leer(self, archivo):
+        """Lee una caché existente, o devuelve None si no existe o no es válida"""
+        if not os.path.exists(archivo):
+            return None
+        try:
+            with np.load(archivo, allow_pickle=False) as npz:
+                return {
+                    'nombres': [str(nombre) for nombre in npz['nombres']],
+                    'mtimes': npz['mtimes'],
+                    'tamanos': npz['tamanos'],
+                    'hashes': [str(h) for h in npz['hashes']],
+                    'pixeles': npz['pixeles'],
+                }
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Advertencia: caché inválida en {archivo}, se reconstruye ({str(e)})")
+            return None
+
+    def _guardar(self, archivo, carpeta, nombres, mtimes, tamanos, hashes, pixeles, etiquetas):
+        """Escribe la caché de una carpeta de forma atómica"""
+        os.makedirs(self.directorio, exist_ok=True)
+        temporal = archivo + '.tmp'
+        with open(temporal, 'wb') as f:
+            np.savez(
+                f,
+                carpeta=np.array(os.path.abspath(carpeta)),
+                nombres=np.array(nombres, dtype=str),
+                mtimes=mtimes,
+                tamanos=tamanos,
+                hashes=np.array(hashes, dtype=str),
+                pixeles=pixeles,
+                etiquetas=etiquetas
+            )
+        os.replace(temporal, archivo)
+
+    def purgar(self):
+        """Elimina las cachés de carpetas que ya no existen y las más antiguas sobre max_carpetas"""
+        if not os.path.isdir(self.directorio):
+            return
+        vigentes = []
+        for nombre in os.listdir(self.directorio):
+            archivo = os.path.join(self.directorio, nombre)
+            if not nombre.endswith('.npz'):
+                continue
+            try:
+                with np.load(archivo, allow_pickle=False) as npz:
+                    carpeta = str(npz['carpeta'])
+            except (OSError, ValueError, KeyError):
+                carpeta = None
+            if carpeta is None or not os.path.isdir(carpeta):
+                os.remove(archivo)
+            else:
+                vigentes.append((os.path.getmtime(archivo), archivo))
+
+        vigentes.sort(reverse=True)
+        for _, archivo in vigentes[self.max_carpetas:]:
+            os.remove(archivo)
@@ -0,0 +1,45 @@
+"""
+Configuración y datos de las herramientas de línea de comandos
+Universidad de Cundinamarca
+
+Valores por defecto de config, lectura de argumentos JSON y carga de los
+datos de entrenamiento, compartidos por models.entrenar y models.barrido. El
+módulo solo importa numpy al cargar datos, y los modelos, PIL y la caché de
+imágenes solo cuando se usan.
+"""
+
+import json
+import os
+
+# Configuración por defecto de los parámetros que no se indican
+CONFIG_BASE = {
+    'alfa': 0.1,
+    'max_epocas': 1000,
+    'precision': 0.01,
+    'bias': True,
+    'funciones_activacion': ['sigmoide', 'sigmoide'],
+    'beta_leaky_relu': 0.01,
+    'momentum': False,
+    'beta': 0.0,
+}
+
+
+def leer_json(valor):
+    """Interpreta un argumento como JSON en línea o como ruta a un archivo JSON"""
+    if os.path.isfile(valor):
+        with open(valor, 'r') as f:
+            return json.load(f)
+    return json.loads(valor)
+
+
+def cargar_datos(ruta):
+    """Carga X e Y de un archivo de patrones, un archivo normalizado de imágenes (texto o .npz) o una carpeta de imágenes"""
+    if os.path.isdir(ruta):
+        from models.cache_imagenes import CacheImagenes
+        from models.data_processor import pixels_to_training_data
+        pixeles, etiquetas, estadisticas = CacheImagenes().cargar(ruta)
+        print(estadisticas.resumen())
+        return pixels_to_training_data(pixeles, etiquetas)
+
+    from models.data_processor import load_data_file
+    return load_data_file(ruta)
@@ -0,0 +1,222 @@
+"""
+Conjunto de datos compartible entre procesos
+Universidad de Cundinamarca
+
+Envuelve las matrices de entradas y salidas que producen las funciones de
+models.data_processor y permite publicarlas en memoria compartida
+(multiprocessing.shared_memory) o en archivos .npy mapeados en memoria.
+Los procesos trabajadores las adjuntan por nombre, en solo lectura y sin
+copias; el proceso propietario es el único que las libera.
+"""
+
+import os
+import sys
+import tempfile
+import weakref
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Descripción picklable de un conjunto publicado: tipo ('memoria' o 'memmap')
+# y, para entradas y salidas, una tupla (ubicación, forma, dtype)
+DescriptorDatos = namedtuple('DescriptorDatos', ['tipo', 'entradas', 'salidas'])
+
+
+def _abrir_bloque(nombre):
+    """
+    Abre un bloque de memoria compartida existente sin registrarlo en el
+    resource_tracker, para que al terminar el proceso trabajador no se
+    elimine un bloque que pertenece al proceso propietario.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    registrar = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=nombre)
+    finally:
+        resource_tracker.register = registrar
+
+
+def _cerrar_bloque(bloque):
+    """Cierra un bloque de memoria compartida; si aún hay vistas vivas, se cierra al destruirlas"""
+    try:
+        bloque.close()
+    except BufferError:
+        pass
+
+
+def _liberar_recursos(bloques, archivos):
+    """Cierra y elimina los bloques de memoria compartida y archivos de un conjunto publicado"""
+    for bloque in bloques:
+        _cerrar_bloque(bloque)
+        try:
+            bloque.unlink()
+        except FileNotFoundError:
+            pass
+    for archivo in archivos:
+        try:
+            os.remove(archivo)
+        except FileNotFoundError:
+            pass
+    bloques.clear()
+    archivos.clear()
+
+
+class ConjuntoDatos:
+    """
+    Par (entradas, salidas) de un conjunto de entrenamiento, un patrón por fila.
+
+    Uso en el proceso propietario:
+        with ConjuntoDatos(X, Y) as datos:
+            descriptor = datos.publicar()
+            ...  # enviar descriptor a los trabajadores
+
+    Uso en un trabajador:
+        datos = ConjuntoDatos.adjuntar(descriptor)
+        ...  # datos.entradas y datos.salidas son de solo lectura
+        datos.cerrar()
+    """
+    def __init__(self, entradas, salidas):
+        """
+        Args:
+            entradas: Matriz de patrones de entrada (N x n)
+            salidas: Matriz de salidas deseadas (N x m)
+        """
+        self.entradas = np.asarray(entradas)
+        self.salidas = np.asarray(salidas)
+        if len(self.entradas) != len(self.salidas):
+            raise ValueError(f"Entradas ({len(self.entradas)}) y salidas ({len(self.salidas)}) con distinto número de patrones")
+
+        self.descriptor = None
+        self.propietario = True
+        self._bloques = []
+        self._archivos = []
+        self._finalizador = None
+
+    @classmethod
+    def desde_archivo(cls, archivo, dtype=None):
+        """Carga un archivo de patrones (x | y) o un archivo normalizado de imágenes (texto o .npz)"""
+        from models.data_processor import load_data_file
+        return cls(*load_data_file(archivo, dtype))
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.propietario:
+            self.liberar()
+        else:
+            self.cerrar()
+
+    def publicar(self, tipo='memoria', directorio=None):
+        """
+        Publica el conjunto para que otros procesos lo adjunten sin copiarlo.
+
+        Tras publicar, entradas y salidas pasan a ser vistas sobre la memoria
+        publicada, de modo que el proceso propietario tampoco duplica los datos.
+
+        Args:
+            tipo: 'memoria' (multiprocessing.shared_memory) o 'memmap' (archivos .npy)
+            directorio: Carpeta de los archivos .npy (por defecto, la temporal del sistema)
+
+        Returns:
+            DescriptorDatos para ConjuntoDatos.adjuntar
+        """
+        if not self.propietario:
+            raise RuntimeError("Solo el proceso propietario puede publicar el conjunto")
+        if self.descriptor is not None:
+            return self.descriptor
+
+        if tipo == 'memoria':
+            self.entradas, ubicacion_entradas = self._publicar_memoria(self.entradas)
+            self.salidas, ubicacion_salidas = self._publicar_memoria(self.salidas)
+        elif tipo == 'memmap':
+            directorio = directorio or tempfile.gettempdir()
+            self.entradas, ubicacion_entradas = self._publicar_memmap(self.entradas, directorio)
+            self.salidas, ubicacion_salidas = self._publicar_memmap(self.salidas, directorio)
+        else:
+            raise ValueError(f"Tipo de publicación no reconocido: {tipo}")
+
+        # Liberación garantizada aunque el propietario olvide llamar a liberar()
+        self._finalizador = weakref.finalize(self, _liberar_recursos, self._bloques, self._archivos)
+        self.descriptor = DescriptorDatos(tipo, ubicacion_entradas, ubicacion_salidas)
+        return self.descriptor
+
+    def _publicar_memoria(self, matriz):
+        matriz = np.ascontiguousarray(matriz)
+        bloque = shared_memory.SharedMemory(create=True, size=max(matriz.nbytes, 1))
+        self._bloques.append(bloque)
+        vista = np.ndarray(matriz.shape, dtype=matriz.dtype, buffer=bloque.buf)
+        vista[...] = matriz
+        return vista, (bloque.name, matriz.shape, matriz.dtype.str)
+
+    def _publicar_memmap(self, matriz, directorio):
+        descriptor, archivo = tempfile.mkstemp(suffix='.npy', prefix='vocales_', dir=directorio)
+        os.close(descriptor)
+        self._archivos.append(archivo)
+        vista = np.lib.format.open_memmap(archivo, mode='w+', dtype=matriz.dtype, shape=matriz.shape)
+        vista[...] = matriz
+        vista.flush()
+        return vista, (archivo, matriz.shape, matriz.dtype.str)
+
+    @classmethod
+    def adjuntar(cls, descriptor):
+        """
+        Adjunta en solo lectura un conjunto publicado por otro proceso.
+
+        Args:
+            descriptor: DescriptorDatos devuelto por publicar()
+
+        Returns:
+            ConjuntoDatos no propietario cuyas matrices son vistas sin copia
+        """
+        conjunto = cls.__new__(cls)
+        conjunto.descriptor = descriptor
+        conjunto.propietario = False
+        conjunto._bloques = []
+        conjunto._archivos = []
+        conjunto._finalizador = None
+
+        matrices = []
+        for ubicacion, forma, dtype in (descriptor.entradas, descriptor.salidas):
+            if descriptor.tipo == 'memoria':
+                bloque = _abrir_bloque(ubicacion)
+                conjunto._bloques.append(bloque)
+                matriz = np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloque.buf)
+            elif descriptor.tipo == 'memmap':
+                matriz = np.load(ubicacion, mmap_mode='r')
+            else:
+                raise ValueError(f"Tipo de publicación no reconocido: {descriptor.tipo}")
+            matriz.flags.writeable = False
+            matrices.append(matriz)
+
+        conjunto.entradas, conjunto.salidas = matrices
+        return conjunto
+
+    def cerrar(self):
+        """Suelta las vistas de un conjunto adjuntado (no elimina los datos publicados)"""
+        self.entradas = self.salidas = None
+        for bloque in self._bloques:
+            _cerrar_bloque(bloque)
+        self._bloques.clear()
+
+    def liberar(self):
+        """
+        Libera la memoria compartida o los archivos publicados por el propietario.
+
+        Las matrices de un conjunto publicado son vistas sobre esa memoria, por
+        lo que el conjunto deja de contener datos tras liberarlo.
+        """
+        if not self.propietario:
+            raise RuntimeError("Solo el proceso propietario puede liberar el conjunto")
+        if self.descriptor is not None:
+            self.entradas = self.salidas = None
+            self.descriptor = None
+        if self._finalizador is not None:
+            self._finalizador()
+            self._finalizador = None
@@ -1,58 +1,395 @@
+import itertools
+import locale
 import os
-import re
 import numpy as np
-from PIL import Image
+
+from models.persistencia import cargar_npz, es_formato_binario
+
+# Clases de salida (una neurona por vocal, en este orden)
+VOCALES = ['A', 'E', 'I', 'O', 'U']
+
+def read_image_pixels(image_path, size=(48, 48)):
+    """Lee los canales R, G y B de una imagen como enteros de 0 a 255 (uint8), un canal por fila"""
+    # PIL se importa al leer la primera imagen, no al cargar el módulo
+    from PIL import Image
+    image = Image.open(image_path).convert('RGB').resize(size)
+    return np.asarray(image, dtype=np.uint8).reshape(-1, 3).T
 
 def normalize_image(image_path, size=(48, 48)):
     """Normaliza una imagen para el procesamiento"""
-    image = Image.open(image_path).convert('RGB').resize(size)
-    r, g, b = image.split()
-    r_data = np.asarray(r, dtype=np.float32) / 255.0
-    g_data = np.asarray(g, dtype=np.float32) / 255.0
-    b_data = np.asarray(b, dtype=np.float32) / 255.0
-    return r_data.flatten(), g_data.flatten(), b_data.flatten()
-
-def save_normalized_data(directory, output_file):
-    """Guarda datos normalizados de imágenes en un archivo de texto"""
-    with open(output_file, 'w') as f:
-        for filename in sorted(os.listdir(directory)):
-            if filename.endswith(('.png', '.jpg', '.jpeg')):
-                vocal = filename[0].upper()
-                if vocal not in ['A', 'E', 'I', 'O', 'U']:
-                    continue
-                label = {
-                    'A': [1, 0, 0, 0, 0],
-                    'E': [0, 1, 0, 0, 0],
-                    'I': [0, 0, 1, 0, 0],
-                    'O': [0, 0, 0, 1, 0],
-                    'U': [0, 0, 0, 0, 1],
-                }[vocal]
-                path = os.path.join(directory, filename)
-                r, g, b = normalize_image(path)
-                r_str = [float(x) for x in r]
-                g_str = [float(x) for x in g]
-                b_str = [float(x) for x in b]
-                f.write(f"R{r_str}+G{g_str}+B{b_str}:{label}\n")
+    r_data, g_data, b_data = read_image_pixels(image_path, size).astype(np.float32) / 255.0
+    return r_data, g_data, b_data
+
+def list_vowel_images(directory):
+    """Lista (ruta, índice de vocal) de las imágenes de la carpeta cuyo nombre empieza por una vocal"""
+    images = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(('.png', '.jpg', '.jpeg')):
+            vocal = filename[0].upper()
+            if vocal not in VOCALES:
+                continue
+            images.append((os.path.join(directory, filename), VOCALES.index(vocal)))
+    return images
+
+def save_normalized_data(directory, output_file, size=(48, 48), workers=None):
+    """
+    Guarda datos normalizados de imágenes.
+    
+    Las imágenes se procesan en paralelo con models.ingesta (workers hilos).
+    Si output_file termina en .npz se guarda la caché binaria (píxeles uint8 e
+    índice de vocal); en otro caso, el formato de texto R[...]+G[...]+B[...]:[etiqueta].
+    """
+    from models.ingesta import ingerir_carpeta
+    pixels, labels, _ = ingerir_carpeta(directory, size=size, trabajadores=workers)
+
+    if output_file.lower().endswith('.npz'):
+        save_training_cache(output_file, pixels, labels)
+    else:
+        write_training_text(output_file, pixels, labels)
     print(f"Imágenes normalizadas y guardadas en {output_file}")
 
-def load_training_data(txt_file):
-    """Carga datos de entrenamiento desde un archivo de texto"""
+def save_training_cache(output_file, pixels, labels):
+    """Guarda la caché binaria de entrenamiento: píxeles (N x 3*H*W, uint8) e índices de vocal (N)"""
+    with open(output_file, 'wb') as f:
+        np.savez(f, pixeles=pixels, etiquetas=labels, clases=np.array(VOCALES))
+
+def load_training_cache(cache_file):
+    """
+    Carga la caché binaria de entrenamiento sin convertirla.
+    
+    Returns:
+        tuple: (píxeles uint8 N x 3*H*W, índices de vocal N, lista de clases)
+    """
+    with np.load(cache_file, allow_pickle=False) as npz:
+        return npz['pixeles'], npz['etiquetas'], [str(c) for c in npz['clases']]
+
+def write_training_text(output_file, pixels, labels):
+    """Escribe píxeles uint8 e índices de vocal en el formato de texto R[...]+G[...]+B[...]:[etiqueta]"""
+    with open(output_file, 'w') as f:
+        for row, label in zip(pixels, labels):
+            r, g, b = row.reshape(3, -1).astype(np.float32) / 255.0
+            r_str = [float(x) for x in r]
+            g_str = [float(x) for x in g]
+            b_str = [float(x) for x in b]
+            one_hot = [int(i == label) for i in range(len(VOCALES))]
+            f.write(f"R{r_str}+G{g_str}+B{b_str}:{one_hot}\n")
+
+def export_training_text(cache_file, output_file):
+    """Exporta una caché binaria (.npz) al formato de texto de save_normalized_data"""
+    pixels, labels, _ = load_training_cache(cache_file)
+    write_training_text(output_file, pixels, labels)
+
+def pixels_to_training_data(pixels, labels, num_classes=len(VOCALES), dtype=np.float32):
+    """Convierte píxeles uint8 e índices de vocal en entradas normalizadas y salidas one-hot"""
+    inputs = pixels.astype(np.float32)
+    inputs /= np.float32(255.0)
+    outputs = np.eye(num_classes, dtype=dtype)[labels]
+    return inputs.astype(dtype, copy=False), outputs
+
+def parse_numeric_lists(lines, dtype=np.float64, width=None):
+    """
+    Convierte en bloque líneas con listas numéricas en una matriz, sin evaluar código.
+    
+    Acepta listas con corchetes o paréntesis y valores separados por comas o
+    espacios ('[1, 0, 1]', '(1, 0, 1)', '1,0,1', '1 0 1'); las listas anidadas
+    se aplanan. Todo el bloque se convierte de una vez con np.loadtxt y solo
+    si falla se revisa línea a línea.
+    
+    Args:
+        lines: Lista de líneas de texto
+        dtype: Tipo de la matriz resultante
+        width: Número de valores por línea (por defecto, el de la primera línea no vacía)
+        
+    Returns:
+        tuple: (matriz con una fila por línea válida, máscara booleana de líneas válidas);
+               las líneas vacías, no numéricas o de otra longitud no son válidas
+    """
+    if not lines:
+        return np.empty((0, width or 0), dtype=dtype), np.zeros(0, dtype=bool)
+
+    # Corchetes, paréntesis y comas se tratan como separadores (str.replace es
+    # bastante más rápido que str.translate para esto)
+    texts = [line.replace('[', ' ').replace(']', ' ').replace('(', ' ').replace(')', ' ').replace(',', ' ')
+             for line in lines]
+    try:
+        data = np.loadtxt(texts, dtype=dtype, comments=None, ndmin=2)
+        # loadtxt omite las líneas vacías, lo que desalinearía las filas
+        if len(data) == len(texts) and (width is None or data.shape[1] == width):
+            return data, np.ones(len(texts), dtype=bool)
+    except ValueError:
+        pass
+
+    # Revisar línea a línea para descartar las líneas inválidas
+    tokens = [text.split() for text in texts]
+    if width is None:
+        width = next((len(values) for values in tokens if values), 0)
+    data = np.empty((len(texts), width), dtype=dtype)
+    valid = np.zeros(len(texts), dtype=bool)
+    for i, values in enumerate(tokens):
+        if values and len(values) == width:
+            try:
+                data[i] = values
+                valid[i] = True
+            except ValueError:
+                pass
+    return data[valid], valid
+
+def invalid_lines(lines, valid, first_line=1):
+    """Números de las líneas no vacías que parse_numeric_lists marcó como inválidas"""
+    return [number for number, (line, ok) in enumerate(zip(lines, valid), first_line)
+            if not ok and line.strip()]
+
+def parse_hidden_layers(text):
+    """
+    Convierte el texto de la capa oculta en el valor de config['capa_oculta'].
+    
+    '8' es una capa oculta de 8 neuronas (entero); '16, 8' o '16 8', dos capas
+    ocultas de 16 y 8 neuronas (lista).
+    
+    Raises:
+        ValueError: Si el texto no es una lista de enteros positivos
+    """
+    layers = [int(value) for value in text.replace(',', ' ').split()]
+    if not layers or min(layers) < 1:
+        raise ValueError(f"Capa oculta no válida: '{text}'")
+    return layers[0] if len(layers) == 1 else layers
+
+def load_training_data(txt_file, dtype=np.float32):
+    """
+    Carga datos de entrenamiento desde la caché binaria (.npz) o desde un archivo
+    de texto; el formato se detecta por los primeros bytes (float32 por defecto, como normalize_image)
+    """
+    if es_formato_binario(txt_file):
+        pixels, labels, clases = load_training_cache(txt_file)
+        return pixels_to_training_data(pixels, labels, len(clases), dtype)
+    return _concatenate_chunks(iter_training_chunks(txt_file, dtype=dtype), dtype)
+
+def load_pattern_data(txt_file, dtype=np.float64):
+    """
+    Carga patrones de entrenamiento en formato 'x1 x2 ... xn | y1 y2 ... ym'
+    
+    Las líneas mal formadas (sin exactamente una barra '|', con valores no
+    numéricos o con un número de valores distinto al de la primera línea) se
+    ignoran y se informan por número de línea.
+    
+    Returns:
+        tuple: (entradas, salidas) como matrices con un patrón por fila
+    """
+    inputs, outputs, malformed = parse_pattern_file(txt_file, dtype)
+    _report_malformed(malformed)
+    return inputs, outputs
+
+def load_data_file(txt_file, dtype=None):
+    """
+    Carga un archivo de patrones (x | y) o un archivo normalizado de imágenes
+    (texto o .npz), detectando el formato por los primeros bytes y por la
+    barra de la primera línea.
+    
+    Returns:
+        tuple: (entradas, salidas) como matrices con un patrón por fila
+    """
+    if es_formato_binario(txt_file):
+        return load_training_data(txt_file, dtype=dtype or np.float32)
+    
+    with open(txt_file, 'r') as f:
+        first_line = f.readline()
+    if '|' in first_line:
+        return load_pattern_data(txt_file, dtype=dtype or np.float64)
+    return load_training_data(txt_file, dtype=dtype or np.float32)
+
+def parse_pattern_file(txt_file, dtype=np.float64, block_lines=65536, progress=None):
+    """
+    Analiza por bloques de líneas un archivo 'x1 x2 ... xn | y1 y2 ... ym'.
+    
+    Cada bloque se convierte de una vez con np.loadtxt; solo los bloques que
+    contienen líneas mal formadas se revisan línea a línea.
+    
+    Args:
+        txt_file: Ruta del archivo de patrones
+        dtype: Tipo de punto flotante de las matrices
+        block_lines: Número de líneas por bloque
+        progress: Función opcional progress(bytes_leídos, bytes_totales)
+        
+    Returns:
+        tuple: (entradas, salidas, números de línea mal formados)
+    """
+    total = os.path.getsize(txt_file)
+    inputs, outputs, malformed = [], [], []
+    for x, y, bad, read in _iter_pattern_blocks(txt_file, block_lines, dtype):
+        if x is not None:
+            inputs.append(x)
+            outputs.append(y)
+        malformed.extend(bad)
+        if progress:
+            progress(read, total)
+    x, y = _concatenate_chunks(zip(inputs, outputs), dtype)
+    return x, y, malformed
+
+def _report_malformed(malformed, limit=20):
+    """Informa los números de línea mal formados de un archivo"""
+    if malformed:
+        lines = ', '.join(str(n) for n in malformed[:limit])
+        more = f" y {len(malformed) - limit} más" if len(malformed) > limit else ""
+        print(f"⚠️ {len(malformed)} líneas con formato inválido: {lines}{more}")
+
+def _concatenate_chunks(chunks, dtype):
+    """Une los bloques (entradas, salidas) de un iterador en dos matrices"""
     inputs, outputs = [], []
-    pattern = r'R\[(.*?)\]\+G\[(.*?)\]\+B\[(.*?)\]:(\[.*\])'
+    for x, y in chunks:
+        inputs.append(x)
+        outputs.append(y)
+    if not inputs:
+        return np.empty((0,), dtype=dtype), np.empty((0,), dtype=dtype)
+    if len(inputs) == 1:
+        return inputs[0], outputs[0]
+    return np.concatenate(inputs), np.concatenate(outputs)
+
+def _iter_pattern_blocks(txt_file, block_lines, dtype):
+    """
+    Lee un archivo 'x1 ... xn | y1 ... ym' por bloques de líneas.
+    
+    Yields:
+        tuple: (entradas o None, salidas o None, líneas mal formadas del bloque,
+                bytes leídos hasta el momento, comparables con os.path.getsize)
+    """
+    widths = None
+    first_line = 1
+    read = 0
+    # Lectura binaria para contar bytes; cada línea se decodifica como en modo texto
+    encoding = locale.getpreferredencoding(False)
+    with open(txt_file, 'rb') as f:
+        while True:
+            raw_lines = list(itertools.islice(f, block_lines))
+            if not raw_lines:
+                break
+            read += sum(map(len, raw_lines))
+            lines = [line.decode(encoding) for line in raw_lines]
+
+            # Separar entradas y salidas de cada línea por la barra
+            lefts, rights, numbers, malformed = [], [], [], []
+            for number, line in enumerate(lines, first_line):
+                left, sep, right = line.partition('|')
+                if not sep or '|' in right:
+                    if line.strip():
+                        malformed.append(number)
+                    continue
+                lefts.append(left)
+                rights.append(right)
+                numbers.append(number)
+            first_line += len(lines)
+
+            if not lefts:
+                yield None, None, malformed, read
+                continue
+
+            # La primera línea con barra fija el número de entradas y salidas
+            if widths is None:
+                widths = (len(lefts[0].split()), len(rights[0].split()))
+
+            x, y, bad = _parse_pattern_block(lefts, rights, numbers, widths, dtype)
+            if bad:
+                malformed = sorted(malformed + bad)
+            yield x, y, malformed, read
+
+def _parse_pattern_block(lefts, rights, numbers, widths, dtype):
+    """
+    Convierte las partes izquierda y derecha de un bloque de líneas en matrices.
+    
+    Returns:
+        tuple: (entradas, salidas, números de línea mal formados)
+    """
+    n, m = widths
+    x, valid_x = parse_numeric_lists(lefts, dtype, width=n)
+    y, valid_y = parse_numeric_lists(rights, dtype, width=m)
+    valid = valid_x & valid_y
+    if valid.all():
+        return x, y, []
+    bad = [numbers[i] for i in np.flatnonzero(~valid)]
+    return x[valid[valid_x]], y[valid[valid_y]], bad
+
+def _iter_training_blocks(txt_file, block_lines, dtype):
+    """
+    Lee un archivo R[...]+G[...]+B[...]:[etiqueta] por bloques de líneas.
+    
+    Yields:
+        tuple: (entradas, salidas) de las líneas válidas de cada bloque
+    """
     with open(txt_file, 'r') as f:
-        for line in f:
-            match = re.match(pattern, line.strip())
-            if match:
-                r_vals = list(map(float, match.group(1).split(',')))
-                g_vals = list(map(float, match.group(2).split(',')))
-                b_vals = list(map(float, match.group(3).split(',')))
-                label = eval(match.group(4))
-                input_vec = r_vals + g_vals + b_vals
-                inputs.append(input_vec)
-                outputs.append(label)
-            else:
-                print("⚠️ Línea con formato inválido:", line.strip())
-    return np.array(inputs), np.array(outputs)
+        while True:
+            lines = [line.strip() for line in itertools.islice(f, block_lines)]
+            if not lines:
+                break
+
+            # Separar canales y etiqueta; los valores se validan al convertirlos
+            pixels, labels, rows = [], [], []
+            for line in lines:
+                body, _, label = line.rpartition(':')
+                g_start = body.find(']+G[')
+                b_start = body.find(']+B[')
+                if (body.startswith('R[') and body.endswith(']') and 0 < g_start < b_start
+                        and label.startswith('[') and label.endswith(']')):
+                    pixels.append(body[2:-1].replace(']+G[', ',').replace(']+B[', ','))
+                    labels.append(label)
+                    rows.append(line)
+                else:
+                    print("⚠️ Línea con formato inválido:", line)
+            if not rows:
+                continue
+
+            x, valid_x = parse_numeric_lists(pixels, dtype)
+            y, valid_y = parse_numeric_lists(labels, dtype)
+            valid = valid_x & valid_y
+            if not valid.all():
+                for i in np.flatnonzero(~valid):
+                    print("⚠️ Línea con formato inválido:", rows[i])
+                x, y = x[valid[valid_x]], y[valid[valid_y]]
+            if len(x):
+                yield x, y
+
+def iter_pattern_chunks(txt_file, chunk_size=1024, dtype=np.float64):
+    """
+    Lee por bloques un archivo de patrones 'x1 x2 ... xn | y1 y2 ... ym'.
+    
+    Yields:
+        tuple: (entradas, salidas) con hasta chunk_size patrones por fila
+    """
+    for x, y, malformed, _ in _iter_pattern_blocks(txt_file, chunk_size, dtype):
+        _report_malformed(malformed)
+        if x is not None and len(x):
+            yield x, y
+
+def iter_training_chunks(txt_file, chunk_size=256, dtype=np.float32):
+    """
+    Lee por bloques datos de entrenamiento de imágenes: texto R[...]+G[...]+B[...]:[etiqueta]
+    o caché binaria (.npz), que se mapea en memoria sin leerla completa.
+    
+    Yields:
+        tuple: (entradas, salidas) con hasta chunk_size patrones por fila
+    """
+    if not es_formato_binario(txt_file):
+        yield from _iter_training_blocks(txt_file, chunk_size, dtype)
+        return
+
+    arrays, _ = cargar_npz(txt_file, mmap_mode='r')
+    pixels, labels = arrays['pixeles'], arrays['etiquetas']
+    num_classes = len(arrays['clases'])
+    for start in range(0, len(pixels), chunk_size):
+        yield pixels_to_training_data(pixels[start:start + chunk_size], labels[start:start + chunk_size], num_classes, dtype)
+
+def iter_data_chunks(txt_file, chunk_size=256, dtype=None):
+    """
+    Lee por bloques un archivo de patrones (x | y) o de imágenes (texto o .npz),
+    detectando el formato como load_data_file.
+    
+    Uso con entrenamiento por bloques:
+        red.entrenar_flujo(lambda: iter_data_chunks(archivo))
+    """
+    if not es_formato_binario(txt_file):
+        with open(txt_file, 'r') as f:
+            first_line = f.readline()
+        if '|' in first_line:
+            return iter_pattern_chunks(txt_file, chunk_size, dtype or np.float64)
+    return iter_training_chunks(txt_file, chunk_size, dtype or np.float32)
 
 def determine_dominant_color(r, g, b):
     """
@@ -0,0 +1,129 @@
+"""
+Entrenamiento de RedBP por línea de comandos
+Universidad de Cundinamarca
+
+Entrena, evalúa y exporta los pesos de una red de cualquiera de los dos
+laboratorios sin la interfaz gráfica: los archivos de patrones (x | y) se
+entrenan con models.backpropagation y las carpetas de imágenes (o sus
+archivos normalizados, texto o .npz) con models.Red_BP. El módulo no importa
+tkinter, matplotlib ni las vistas, y el modelo (y PIL, solo con imágenes) se
+importa al usarlo, de modo que puede ejecutarse en servidores sin pantalla.
+
+Uso:
+    python -m models.entrenar datos.txt --config '{"capa_oculta": 8, "alfa": 0.5}' --pesos pesos.json
+    python -m models.entrenar carpeta_imagenes --config config.json --pesos pesos.npz --prueba carpeta_prueba
+    python -m models.entrenar datos.txt --cargar pesos.json --solo-evaluar
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from models.configuracion import CONFIG_BASE, cargar_datos, leer_json
+from models.persistencia import es_formato_binario
+
+
+def modelo_de_datos(ruta):
+    """
+    Modelo que corresponde a unos datos: 'backpropagation' para un archivo de
+    patrones (x | y) y 'Red_BP' para una carpeta de imágenes o un archivo
+    normalizado de imágenes (texto o .npz).
+    """
+    if os.path.isdir(ruta) or es_formato_binario(ruta):
+        return 'Red_BP'
+    with open(ruta, 'r') as f:
+        primera_linea = f.readline()
+    return 'backpropagation' if '|' in primera_linea else 'Red_BP'
+
+
+def crear_red(modelo, config):
+    """Crea la RedBP del modelo indicado ('backpropagation' o 'Red_BP') con la configuración dada"""
+    if modelo == 'backpropagation':
+        from models.backpropagation import RedBP
+    elif modelo == 'Red_BP':
+        from models.Red_BP import RedBP
+    else:
+        raise ValueError(f"Modelo no reconocido: {modelo}")
+    return RedBP(config)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m models.entrenar',
+        description='Entrenamiento, evaluación y exportación de pesos de RedBP sin interfaz gráfica'
+    )
+    parser.add_argument('datos', help='Archivo de patrones (x | y), archivo normalizado de imágenes (texto o .npz) o carpeta de imágenes')
+    parser.add_argument('--modelo', choices=['Red_BP', 'backpropagation'], default=None,
+                        help='Por defecto, backpropagation para archivos de patrones y Red_BP para imágenes')
+    parser.add_argument('--config', default=None, help='Valores de config: JSON en línea o ruta a un archivo JSON')
+    parser.add_argument('--cargar', default=None, help='Archivo de pesos (JSON o .npz) con el que se inicia la red')
+    parser.add_argument('--solo-evaluar', action='store_true', help='Evalúa la red sin entrenarla (normalmente con --cargar)')
+    parser.add_argument('--pesos', default=None, help='Archivo donde exportar los pesos (JSON, o binario si termina en .npz)')
+    parser.add_argument('--prueba', default=None, help='Datos de prueba con el mismo formato, evaluados además de los de entrenamiento')
+    parser.add_argument('--top-k', type=int, nargs='*', default=[], help='Valores de k para la exactitud top-k')
+    parser.add_argument('--semilla', type=int, default=None, help='Semilla de la inicialización de los pesos')
+    parser.add_argument('--errores', default=None, help='Archivo JSON donde guardar el error de cada época')
+    args = parser.parse_args(argv)
+
+    modelo = args.modelo or modelo_de_datos(args.datos)
+    X, Y = cargar_datos(args.datos)
+
+    config = dict(CONFIG_BASE)
+    config.update({
+        'capa_entrada': X.shape[1],
+        'capa_oculta': int(np.sqrt(X.shape[1] * Y.shape[1])),
+        'capa_salida': Y.shape[1],
+    })
+    config.update(leer_json(args.config) if args.config else {})
+
+    if args.semilla is not None:
+        np.random.seed(args.semilla)
+
+    red = crear_red(modelo, config)
+    if args.cargar:
+        red.cargar_pesos(args.cargar)
+        print(f"Pesos cargados de {args.cargar}")
+
+    print(f"Red {'-'.join(str(n) for n in red.dimensiones)} ({modelo}) sobre {X.shape[0]} patrones")
+
+    if not args.solo_evaluar:
+        inicio = time.perf_counter()
+        errores = red.entrenar(X, Y)
+        if modelo == 'Red_BP':
+            errores = errores[0]
+        print(f"Tiempo de entrenamiento: {time.perf_counter() - inicio:.2f}s")
+
+        if args.errores:
+            with open(args.errores, 'w') as f:
+                json.dump([float(e) for e in errores], f)
+
+    from models.evaluacion import evaluar
+
+    # Las redes de imágenes tienen una salida por vocal
+    etiquetas = None
+    if modelo == 'Red_BP':
+        from models.data_processor import VOCALES
+        if Y.shape[1] == len(VOCALES):
+            etiquetas = VOCALES
+
+    print("Evaluación (entrenamiento):")
+    print(evaluar(red, X, Y, top_k=args.top_k).resumen(etiquetas))
+
+    if args.prueba:
+        X_prueba, Y_prueba = cargar_datos(args.prueba)
+        print("Evaluación (prueba):")
+        print(evaluar(red, X_prueba, Y_prueba, top_k=args.top_k).resumen(etiquetas))
+
+    if args.pesos:
+        red.guardar_pesos(args.pesos)
+        print(f"Pesos guardados en {args.pesos}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
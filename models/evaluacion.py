@@ -0,0 +1,190 @@
+"""
+Evaluación de clasificadores RedBP
+Universidad de Cundinamarca
+
+Calcula la matriz de confusión, la exactitud, la precisión, la exhaustividad
+y el F1 por clase, y la exactitud top-k de una red (models.backpropagation o
+models.Red_BP) a partir de una sola propagación por bloque de patrones. Los
+conteos se hacen con np.bincount, sin bucles por patrón, y se acumulan
+bloque a bloque, de modo que un conjunto grande puede evaluarse recorriéndolo
+por partes (por ejemplo, con models.data_processor.iter_data_chunks).
+"""
+
+import numpy as np
+
+
+def clases_de_salidas(salidas, umbral=0.5):
+    """
+    Clase de cada fila de una matriz de salidas.
+
+    Con una sola columna la clase es 1 si la salida supera el umbral y 0 en
+    caso contrario; con varias, el índice de la mayor salida.
+    """
+    salidas = np.asarray(salidas)
+    if salidas.shape[1] == 1:
+        return (salidas[:, 0] > umbral).astype(np.intp)
+    return np.argmax(salidas, axis=1)
+
+
+def matriz_confusion(reales, predichas, num_clases):
+    """Matriz de confusión (filas: clase real, columnas: clase predicha)"""
+    indices = np.asarray(reales, dtype=np.intp) * num_clases + np.asarray(predichas, dtype=np.intp)
+    return np.bincount(indices, minlength=num_clases * num_clases).reshape(num_clases, num_clases)
+
+
+def aciertos_top_k(salidas, reales, k):
+    """
+    Número de patrones cuya clase real está entre las k mayores salidas.
+
+    Los empates se resuelven como en np.argmax (gana la primera columna), de
+    modo que el top-1 coincide con la exactitud.
+    """
+    salidas = np.asarray(salidas)
+    reales = np.asarray(reales, dtype=np.intp)
+    if k >= salidas.shape[1]:
+        return len(reales)
+
+    # Posición de la clase real al ordenar las salidas de mayor a menor
+    real = salidas[np.arange(len(reales)), reales][:, None]
+    anteriores = np.arange(salidas.shape[1]) < reales[:, None]
+    posicion = np.count_nonzero((salidas > real) | ((salidas == real) & anteriores), axis=1)
+    return int(np.count_nonzero(posicion < k))
+
+
+class Evaluacion:
+    """
+    Métricas de clasificación acumuladas bloque a bloque.
+
+    Uso:
+        evaluacion = evaluar(red, X, Y, top_k=(2,))
+        print(evaluacion.resumen(['A', 'E', 'I', 'O', 'U']))
+    """
+    def __init__(self, num_clases, top_k=()):
+        """
+        Args:
+            num_clases: Número de clases (2 para una red con una sola salida)
+            top_k: Valores de k para los que se acumula la exactitud top-k
+        """
+        self.num_clases = num_clases
+        self.matriz = np.zeros((num_clases, num_clases), dtype=np.int64)
+        self.aciertos_k = {int(k): 0 for k in top_k}
+
+    def acumular(self, salidas, Y, umbral=0.5):
+        """
+        Suma a las métricas un bloque de patrones.
+
+        Args:
+            salidas: Salidas de la red, un patrón por fila
+            Y: Salidas deseadas, un patrón por fila
+            umbral: Umbral de decisión para una sola neurona de salida
+        """
+        salidas = np.asarray(salidas)
+        reales = clases_de_salidas(Y, umbral)
+        predichas = clases_de_salidas(salidas, umbral)
+        self.matriz += matriz_confusion(reales, predichas, self.num_clases)
+
+        for k in self.aciertos_k:
+            if salidas.shape[1] == 1:
+                # Con una sola salida solo hay una predicción posible por patrón
+                self.aciertos_k[k] += int(np.count_nonzero(reales == predichas)) if k == 1 else len(reales)
+            else:
+                self.aciertos_k[k] += aciertos_top_k(salidas, reales, k)
+
+    @property
+    def total(self):
+        """Número de patrones evaluados"""
+        return int(self.matriz.sum())
+
+    @property
+    def exactitud(self):
+        """Porcentaje de patrones clasificados correctamente"""
+        return float(np.trace(self.matriz) / self.total * 100) if self.total else 0.0
+
+    @property
+    def precision(self):
+        """Precisión por clase (aciertos / patrones predichos de la clase), 0 si no se predijo la clase"""
+        return self._dividir(np.diag(self.matriz), self.matriz.sum(axis=0))
+
+    @property
+    def exhaustividad(self):
+        """Exhaustividad (recall) por clase (aciertos / patrones de la clase), 0 si la clase no aparece"""
+        return self._dividir(np.diag(self.matriz), self.matriz.sum(axis=1))
+
+    @property
+    def f1(self):
+        """F1 por clase (media armónica de precisión y exhaustividad)"""
+        precision, exhaustividad = self.precision, self.exhaustividad
+        return self._dividir(2 * precision * exhaustividad, precision + exhaustividad)
+
+    def exactitud_top_k(self, k):
+        """Porcentaje de patrones cuya clase real está entre las k mayores salidas"""
+        return self.aciertos_k[k] / self.total * 100 if self.total else 0.0
+
+    @staticmethod
+    def _dividir(numerador, denominador):
+        numerador = np.asarray(numerador, dtype=np.float64)
+        return np.divide(numerador, denominador, out=np.zeros_like(numerador), where=denominador > 0)
+
+    def resumen(self, etiquetas=None):
+        """Texto con la exactitud global, la exactitud top-k y las métricas por clase"""
+        etiquetas = etiquetas or [f'Clase {i}' for i in range(self.num_clases)]
+        lineas = [f"Exactitud: {self.exactitud:.2f}% ({int(np.trace(self.matriz))}/{self.total})"]
+        for k in sorted(self.aciertos_k):
+            lineas.append(f"Exactitud top-{k}: {self.exactitud_top_k(k):.2f}%")
+
+        ancho = max(len(str(etiqueta)) for etiqueta in etiquetas)
+        lineas.append(f"{'Clase':<{ancho}}  Precisión  Exhaustividad      F1  Patrones")
+        soporte = self.matriz.sum(axis=1)
+        for i, etiqueta in enumerate(etiquetas):
+            lineas.append(f"{str(etiqueta):<{ancho}}  {self.precision[i]:9.3f}  {self.exhaustividad[i]:13.3f}  "
+                          f"{self.f1[i]:6.3f}  {soporte[i]:8d}")
+        return "\n".join(lineas)
+
+
+def evaluar(red, X, Y, tam_bloque=4096, top_k=(), umbral=0.5):
+    """
+    Evalúa una red sobre un conjunto de patrones en memoria.
+
+    Args:
+        red: RedBP de models.backpropagation o models.Red_BP
+        X: Matriz de patrones de entrada, un patrón por fila
+        Y: Matriz de salidas deseadas, un patrón por fila
+        tam_bloque: Número máximo de patrones propagados a la vez
+        top_k: Valores de k para la exactitud top-k
+        umbral: Umbral de decisión para una sola neurona de salida
+
+    Returns:
+        Evaluacion con las métricas del conjunto
+    """
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    bloques = ((X[inicio:inicio + tam_bloque], Y[inicio:inicio + tam_bloque]) for inicio in range(0, len(X), tam_bloque))
+    return evaluar_flujo(red, bloques, max(Y.shape[1], 2), top_k, umbral)
+
+
+def evaluar_flujo(red, bloques, num_clases=None, top_k=(), umbral=0.5):
+    """
+    Evalúa una red recorriendo un conjunto por bloques, sin tenerlo completo en memoria.
+
+    Args:
+        red: RedBP de models.backpropagation o models.Red_BP
+        bloques: Iterable de pares (X, Y) con un patrón por fila, por ejemplo
+                 models.data_processor.iter_data_chunks(archivo)
+        num_clases: Número de clases (por defecto, se deduce del primer bloque)
+        top_k, umbral: Ver evaluar
+
+    Returns:
+        Evaluacion con las métricas del conjunto
+    """
+    evaluacion = Evaluacion(num_clases, top_k) if num_clases else None
+    for X, Y in bloques:
+        if len(X) == 0:
+            continue
+        Y = np.asarray(Y)
+        if evaluacion is None:
+            evaluacion = Evaluacion(max(Y.shape[1], 2), top_k)
+        evaluacion.acumular(red.predecir(X, tam_bloque=len(X)), Y, umbral)
+
+    if evaluacion is None:
+        raise ValueError("No hay patrones que evaluar")
+    return evaluacion
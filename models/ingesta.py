@@ -0,0 +1,193 @@
+"""
+Ingesta paralela de carpetas de imágenes
+Universidad de Cundinamarca
+
+Decodifica, convierte a RGB, redimensiona y separa en canales las imágenes
+de una carpeta con un pool de hilos (PIL libera el GIL al decodificar y
+redimensionar) o de procesos. Cada trabajador escribe su resultado
+directamente en la fila que le corresponde de una matriz uint8 (N x 3*H*W)
+reservada de antemano; en modo procesos, esa matriz vive en memoria
+compartida.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+from PIL import Image
+
+from models.conjunto_datos import _abrir_bloque, _cerrar_bloque
+from models.data_processor import list_vowel_images
+
+# Etapas medidas por imagen
+ETAPAS = ('decodificacion', 'redimension', 'escritura')
+
+# Matriz de destino del proceso trabajador (se adjunta una vez en el inicializador)
+_destino_trabajador = {}
+
+
+class EstadisticasIngesta:
+    """Tiempos acumulados por etapa y rendimiento de una ingesta"""
+    def __init__(self, imagenes, bytes_leidos, tiempos, tiempo_total, trabajadores, modo, reutilizadas=0):
+        """
+        Args:
+            imagenes: Número de imágenes procesadas
+            bytes_leidos: Tamaño total de los archivos de imagen
+            tiempos: Diccionario etapa -> segundos acumulados entre todos los trabajadores
+            tiempo_total: Segundos de reloj de la ingesta completa
+            trabajadores: Número de trabajadores del pool
+            modo: 'hilos' o 'procesos'
+            reutilizadas: Número de imágenes tomadas de una caché sin procesarlas
+        """
+        self.imagenes = imagenes
+        self.bytes_leidos = bytes_leidos
+        self.tiempos = tiempos
+        self.tiempo_total = tiempo_total
+        self.trabajadores = trabajadores
+        self.modo = modo
+        self.reutilizadas = reutilizadas
+
+    def rendimiento(self, etapa):
+        """Imágenes procesadas por segundo en una etapa para un solo trabajador"""
+        tiempo = self.tiempos[etapa]
+        return (self.imagenes - self.reutilizadas) / tiempo if tiempo > 0 else float('inf')
+
+    def resumen(self):
+        """Texto con el rendimiento global y por etapa"""
+        global_ips = self.imagenes / self.tiempo_total if self.tiempo_total > 0 else float('inf')
+        lineas = [
+            f"Ingesta de {self.imagenes} imágenes ({self.bytes_leidos / 1e6:.1f} MB) en "
+            f"{self.tiempo_total:.2f}s con {self.trabajadores} {self.modo}: {global_ips:.1f} img/s"
+        ]
+        if self.reutilizadas:
+            lineas.append(f"  {self.reutilizadas} imágenes reutilizadas de la caché")
+        if self.imagenes == self.reutilizadas:
+            return "\n".join(lineas)
+        for etapa in ETAPAS:
+            lineas.append(f"  {etapa}: {self.tiempos[etapa]:.2f}s acumulados, "
+                          f"{self.rendimiento(etapa):.1f} img/s por trabajador")
+        return "\n".join(lineas)
+
+
+def _procesar_imagen(ruta, size, fila):
+    """
+    Procesa una imagen y escribe sus canales R, G y B en la fila dada.
+
+    Produce los mismos valores que data_processor.read_image_pixels.
+
+    Returns:
+        tuple: Segundos de cada etapa (decodificación, redimensión, escritura)
+    """
+    t0 = time.perf_counter()
+    with Image.open(ruta) as image:
+        image.load()
+        t1 = time.perf_counter()
+        image = image.convert('RGB').resize(size)
+    t2 = time.perf_counter()
+    fila.reshape(3, -1)[...] = np.asarray(image, dtype=np.uint8).reshape(-1, 3).T
+    t3 = time.perf_counter()
+    return t1 - t0, t2 - t1, t3 - t2
+
+
+def _inicializar_trabajador(nombre, forma):
+    """Adjunta la matriz de destino en memoria compartida en el proceso trabajador"""
+    bloque = _abrir_bloque(nombre)
+    _destino_trabajador['bloque'] = bloque
+    _destino_trabajador['pixeles'] = np.ndarray(forma, dtype=np.uint8, buffer=bloque.buf)
+
+
+def _procesar_lote(inicio, rutas, size):
+    """Procesa un lote de imágenes consecutivas en el proceso trabajador"""
+    pixeles = _destino_trabajador['pixeles']
+    tiempos = np.zeros(len(ETAPAS))
+    for i, ruta in enumerate(rutas):
+        tiempos += _procesar_imagen(ruta, size, pixeles[inicio + i])
+    return len(rutas), tuple(tiempos)
+
+
+def ingerir_carpeta(directorio, size=(48, 48), trabajadores=None, modo='hilos', progreso=None):
+    """
+    Carga en paralelo las imágenes de vocales de una carpeta.
+
+    Args:
+        directorio: Carpeta con imágenes cuyo nombre empieza por la vocal
+        size: Tamaño (ancho, alto) al que se redimensiona cada imagen
+        trabajadores: Número de hilos o procesos (por defecto, uno por núcleo)
+        modo: 'hilos' (ThreadPoolExecutor) o 'procesos' (ProcessPoolExecutor)
+        progreso: Función opcional progreso(procesadas, total)
+
+    Returns:
+        tuple: (píxeles uint8 N x 3*H*W, índices de vocal N, EstadisticasIngesta)
+    """
+    imagenes = list_vowel_images(directorio)
+    etiquetas = np.array([etiqueta for _, etiqueta in imagenes], dtype=np.uint8)
+    pixeles, estadisticas = ingerir_rutas([ruta for ruta, _ in imagenes], size, trabajadores, modo, progreso)
+    return pixeles, etiquetas, estadisticas
+
+
+def ingerir_rutas(rutas, size=(48, 48), trabajadores=None, modo='hilos', progreso=None):
+    """
+    Carga en paralelo una lista de imágenes (ver ingerir_carpeta).
+
+    Returns:
+        tuple: (píxeles uint8 N x 3*H*W en el orden de rutas, EstadisticasIngesta)
+    """
+    if modo not in ('hilos', 'procesos'):
+        raise ValueError(f"Modo de ingesta no reconocido: {modo}")
+
+    inicio_total = time.perf_counter()
+    forma = (len(rutas), 3 * size[0] * size[1])
+    trabajadores = max(1, min(trabajadores or os.cpu_count(), len(rutas)))
+
+    tiempos = np.zeros(len(ETAPAS))
+    procesadas = 0
+
+    if modo == 'hilos':
+        pixeles = np.empty(forma, dtype=np.uint8)
+        with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+            futuros = [pool.submit(_procesar_imagen, ruta, size, pixeles[i]) for i, ruta in enumerate(rutas)]
+            for futuro in as_completed(futuros):
+                tiempos += futuro.result()
+                procesadas += 1
+                if progreso:
+                    progreso(procesadas, len(rutas))
+    else:
+        bloque = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma)), 1))
+        try:
+            compartida = np.ndarray(forma, dtype=np.uint8, buffer=bloque.buf)
+            # Lotes de imágenes consecutivas para amortizar el envío de tareas
+            tam_lote = max(1, len(rutas) // (trabajadores * 4))
+            with ProcessPoolExecutor(
+                max_workers=trabajadores,
+                mp_context=get_context('spawn'),
+                initializer=_inicializar_trabajador,
+                initargs=(bloque.name, forma)
+            ) as pool:
+                futuros = [
+                    pool.submit(_procesar_lote, inicio, rutas[inicio:inicio + tam_lote], size)
+                    for inicio in range(0, len(rutas), tam_lote)
+                ]
+                for futuro in as_completed(futuros):
+                    n, tiempos_lote = futuro.result()
+                    tiempos += tiempos_lote
+                    procesadas += n
+                    if progreso:
+                        progreso(procesadas, len(rutas))
+            # El bloque compartido se libera al terminar; el resultado se queda en memoria propia
+            pixeles = compartida.copy()
+            del compartida
+        finally:
+            _cerrar_bloque(bloque)
+            bloque.unlink()
+
+    estadisticas = EstadisticasIngesta(
+        imagenes=len(rutas),
+        bytes_leidos=sum(os.path.getsize(ruta) for ruta in rutas),
+        tiempos=dict(zip(ETAPAS, tiempos.tolist())),
+        tiempo_total=time.perf_counter() - inicio_total,
+        trabajadores=trabajadores,
+        modo=modo
+    )
+    return pixeles, estadisticas
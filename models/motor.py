@@ -0,0 +1,282 @@
+import numpy as np
+
+
+
+def obtener_dtype(config):
+    """
+    Obtiene el tipo de punto flotante de la red a partir de config['dtype'].
+
+    Args:
+        config: Diccionario de configuración ('float64' por defecto, o 'float32')
+
+    Returns:
+        np.dtype de punto flotante
+    """
+    dtype = np.dtype(config.get('dtype', 'float64'))
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"El dtype de la red debe ser de punto flotante: {dtype}")
+    return dtype
+
+
+def dimensiones_capas(config):
+    """
+    Obtiene el número de neuronas de cada capa a partir de la configuración.
+
+    config['capa_oculta'] puede ser un entero (una capa oculta) o una lista
+    con el número de neuronas de cada capa oculta.
+
+    Returns:
+        Lista [entradas, ocultas..., salidas]
+    """
+    ocultas = config['capa_oculta']
+    if isinstance(ocultas, (list, tuple)):
+        ocultas = [int(neuronas) for neuronas in ocultas]
+    else:
+        ocultas = [int(ocultas)]
+    return [int(config['capa_entrada'])] + ocultas + [int(config['capa_salida'])]
+
+
+def nombres_activaciones(funciones, num_capas):
+    """
+    Asigna una función de activación a cada capa con pesos.
+
+    Args:
+        funciones: Lista de nombres: [oculta, salida] (la activación oculta se
+                   usa en todas las capas ocultas) o un nombre por capa
+        num_capas: Número de capas con pesos (ocultas + salida)
+
+    Returns:
+        Lista con el nombre de la activación de cada capa
+    """
+    funciones = list(funciones)
+    if len(funciones) == num_capas:
+        return funciones
+    if len(funciones) == 2:
+        return [funciones[0]] * (num_capas - 1) + [funciones[1]]
+    raise ValueError(f"Se esperaban 2 funciones de activación o una por capa ({num_capas}), se recibieron {len(funciones)}")
+
+
+def propagar(pesos, umbrales, activaciones, X, parametros):
+    """
+    Propaga un bloque de patrones por todas las capas de la red.
+
+    Args:
+        pesos: Lista de matrices de pesos (neuronas de la capa x neuronas de la anterior)
+        umbrales: Lista de umbrales (neuronas x 1) o None si la red no tiene bias
+        activaciones: Lista de Activacion de cada capa
+        X: Patrones de entrada en columnas (entradas x b)
+        parametros: Parámetros de las activaciones
+
+    Returns:
+        Salidas de la última capa en columnas (salidas x b)
+    """
+    salida = X
+    for k, W in enumerate(pesos):
+        neta = np.dot(W, salida)
+        if umbrales is not None:
+            neta += umbrales[k]
+        salida = activaciones[k](neta, **parametros)
+    return salida
+
+
+class BuffersLote:
+    """
+    Buffers intermedios de un paso de entrenamiento para lotes de b patrones.
+
+    Los patrones se almacenan en columnas, igual que en el resto de la red:
+    las entradas netas y salidas de cada capa tienen forma (neuronas x b).
+    Las listas Net, Y, error y delta tienen un elemento por capa con pesos.
+    """
+    def __init__(self, dimensiones, b, dtype=np.float64):
+        """
+        Reserva los buffers de un lote.
+
+        Args:
+            dimensiones: Número de neuronas de cada capa [entradas, ocultas..., salidas]
+            b: Número de patrones del lote
+            dtype: Tipo de punto flotante de la red
+        """
+        self.b = b
+
+        # Patrones reunidos cuando el lote no es un bloque contiguo de X (filas)
+        self.x = np.empty((b, dimensiones[0]), dtype=dtype)
+        self.yd = np.empty((b, dimensiones[-1]), dtype=dtype)
+
+        capas = dimensiones[1:]
+
+        # Propagación hacia adelante
+        self.Net = [np.empty((neuronas, b), dtype=dtype) for neuronas in capas]
+        self.Y = [np.empty((neuronas, b), dtype=dtype) for neuronas in capas]
+
+        # Retropropagación del error
+        self.error = [np.empty((neuronas, b), dtype=dtype) for neuronas in capas]
+        self.delta = [np.empty((neuronas, b), dtype=dtype) for neuronas in capas]
+
+
+class MotorEntrenamiento:
+    """
+    Motor de entrenamiento de RedBP con espacio de trabajo preasignado, para
+    una pila de capas de cualquier profundidad.
+
+    Todos los buffers (activaciones, errores, deltas y cambios de pesos) se
+    reservan una sola vez al crear el motor, y los del optimizador
+    (models.optimizadores) en su primer paso. Cada época usa ufuncs con
+    out= y np.dot(..., out=...), de modo que no se reserva memoria nueva
+    durante el entrenamiento.
+    """
+    def __init__(self, red, P, tam_lote, activaciones, parametros):
+        """
+        Prepara el espacio de trabajo para una ejecución de entrenamiento.
+
+        Args:
+            red: Red (models.nucleo.RedCapas) cuyos pesos (red.pesos) y
+                 umbrales (red.umbrales, [] sin bias) se actualizan con su
+                 optimizador (red.optimizador)
+            P: Número de patrones de entrenamiento
+            tam_lote: Número de patrones por paso (1 en modo online)
+            activaciones: Lista de Activacion de cada capa (models.activaciones)
+            parametros: Parámetros de las activaciones (p. ej. beta_leaky_relu)
+        """
+        self.red = red
+        self.P = P
+        self.tam_lote = tam_lote
+        self.activaciones = activaciones
+        self.parametros = parametros
+
+        self.dimensiones = [red.pesos[0].shape[1]] + [W.shape[0] for W in red.pesos]
+        self.dtype = red.pesos[0].dtype
+
+        # Buffers por tamaño de lote: el último lote de la época puede ser menor
+        self.lotes = {}
+        self.buffers(tam_lote)
+        if P % tam_lote:
+            self.buffers(P % tam_lote)
+
+        # Direcciones de descenso (y luego cambios) de pesos y umbrales del paso actual
+        self.con_umbrales = bool(red.umbrales)
+        self.dW = [np.empty_like(W) for W in red.pesos]
+        self.dT = [np.empty_like(T) for T in red.umbrales]
+
+        # Con softmax a la salida y entropía cruzada, el delta de salida es el error
+        self.delta_es_error = red.entropia_cruzada_softmax and activaciones[-1].nombre == 'softmax'
+
+        # Orden de presentación de los patrones (se mezcla en el lugar)
+        self.orden = np.arange(P)
+
+    def buffers(self, b):
+        """Buffers de un lote de b patrones (se reservan la primera vez que se usa ese tamaño)"""
+        if b not in self.lotes:
+            self.lotes[b] = BuffersLote(self.dimensiones, b, self.dtype)
+        return self.lotes[b]
+
+    def epoca(self, X, Yd, alfa, mezclar=False, destino=None):
+        """
+        Ejecuta una época completa de entrenamiento.
+
+        X puede tener un número de patrones distinto de P (p. ej. un bloque
+        leído por partes); los buffers que falten se reservan al primer uso.
+
+        Args:
+            X: Matriz de patrones de entrada, cada fila es un patrón
+            Yd: Matriz de salidas deseadas, cada fila es un patrón
+            alfa: Tasa de aprendizaje
+            mezclar: Si es True, los patrones se presentan en orden aleatorio
+            destino: Matrices (como las de red.obtener_pesos()) donde escribir los
+                     pesos tras el primer paso, sin modificar los actuales
+
+        Returns:
+            Suma del error cuadrático de todos los patrones de la época
+        """
+        P = len(X)
+        if len(self.orden) != P:
+            self.orden = np.arange(P)
+        if mezclar:
+            np.random.shuffle(self.orden)
+
+        Et = 0.0
+        for inicio in range(0, P, self.tam_lote):
+            fin = min(inicio + self.tam_lote, P)
+            buffers = self.buffers(fin - inicio)
+
+            # Obtener patrones de entrada y salidas deseadas como columnas (n x b)
+            if mezclar:
+                indices = self.orden[inicio:fin]
+                np.take(X, indices, axis=0, out=buffers.x)
+                np.take(Yd, indices, axis=0, out=buffers.yd)
+                x_p = buffers.x.T
+                yd_p = buffers.yd.T
+            else:
+                x_p = X[inicio:fin].T
+                yd_p = Yd[inicio:fin].T
+
+            Et += self.paso(x_p, yd_p, buffers, alfa, destino)
+            destino = None
+
+        return Et
+
+    def paso(self, x_p, yd_p, buffers, alfa, destino=None):
+        """
+        Propaga un lote hacia adelante y hacia atrás y actualiza los pesos.
+
+        Args:
+            x_p: Patrones de entrada del lote en columnas (n x b)
+            yd_p: Salidas deseadas del lote en columnas (m x b)
+            buffers: BuffersLote del tamaño del lote
+            alfa: Tasa de aprendizaje
+            destino: Matrices (como las de red.obtener_pesos()) donde escribir los
+                     pesos actualizados, que pasan a ser los de la red; None para
+                     actualizarlos en el lugar
+
+        Returns:
+            Suma del error cuadrático de los patrones del lote
+        """
+        red = self.red
+        B = buffers
+        capas = range(len(red.pesos))
+        entradas = [x_p] + B.Y[:-1]
+
+        # ===== PROPAGACIÓN HACIA ADELANTE (FORWARD PASS) =====
+        # Cada activación deja su derivada en el buffer de deltas de la capa
+        for k in capas:
+            np.dot(red.pesos[k], entradas[k], out=B.Net[k])
+            if self.con_umbrales:
+                B.Net[k] += red.umbrales[k]
+            derivada = None if self.delta_es_error and k == capas[-1] else B.delta[k]
+            self.activaciones[k](B.Net[k], out=B.Y[k], derivada=derivada, **self.parametros)
+
+        # ===== RETROPROPAGACIÓN DEL ERROR (BACKWARD PASS) =====
+        np.subtract(yd_p, B.Y[-1], out=B.error[-1])
+
+        # Deltas de la capa de salida y, hacia atrás, de las capas ocultas
+        if self.delta_es_error:
+            np.copyto(B.delta[-1], B.error[-1])
+        else:
+            B.delta[-1] *= B.error[-1]
+        for k in reversed(capas[:-1]):
+            np.dot(red.pesos[k + 1].T, B.delta[k + 1], out=B.error[k])
+            B.delta[k] *= B.error[k]
+
+        # Direcciones de descenso sumadas sobre el lote
+        for k in reversed(capas):
+            np.dot(B.delta[k], entradas[k].T, out=self.dW[k])
+        if self.con_umbrales:
+            for k in reversed(capas):
+                np.sum(B.delta[k], axis=1, keepdims=True, out=self.dT[k])
+
+        # Actualizar pesos y umbrales con el cambio que calcula el optimizador
+        for k in reversed(capas):
+            cambio = red.optimizador.paso(f'W_{k}', self.dW[k], alfa, B.b)
+            if destino is None:
+                red.pesos[k] += cambio
+            else:
+                red.pesos[k] = np.add(red.pesos[k], cambio, out=destino[k])
+        if self.con_umbrales:
+            for k in reversed(capas):
+                cambio = red.optimizador.paso(f'T_{k}', self.dT[k], alfa, B.b)
+                if destino is None:
+                    red.umbrales[k] += cambio
+                else:
+                    red.umbrales[k] = np.add(red.umbrales[k], cambio, out=destino[len(capas) + k])
+
+        # Error cuadrático de los patrones del lote
+        return 0.5 * float(np.vdot(B.error[-1], B.error[-1]))
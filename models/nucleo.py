@@ -0,0 +1,563 @@
+"""
+Núcleo común de las redes RedBP
+Universidad de Cundinamarca
+
+RedCapas reúne lo que comparten models.backpropagation.RedBP (laboratorio de
+patrones) y models.Red_BP.RedBP (laboratorio de imágenes): la pila de capas
+(self.pesos y self.umbrales, una matriz por capa con pesos), el bucle de
+entrenamiento sobre models.motor.MotorEntrenamiento con validación y parada
+temprana, la predicción por bloques y la persistencia de los pesos. Cada red
+es un adaptador que fija la inicialización de los pesos, los nombres de las
+matrices en los archivos y sus valores por defecto, y conserva su interfaz
+pública.
+
+Configuración (diccionario config de la red), además de la arquitectura:
+    'modo': 'online', 'batch' o 'minibatch' (por defecto, el de la red)
+    'tam_lote': Patrones por paso en modo 'minibatch' (32)
+    'validacion': Fracción de patrones reservada para validación (0)
+    'paciencia': Épocas sin mejora del error de validación antes de detenerse (0 = sin parada temprana)
+    'min_mejora': Mejora mínima del error de validación que cuenta como mejora (0)
+    'optimizador', 'planificador': Ver models.optimizadores y models.planificadores
+"""
+
+import json
+import time
+
+import numpy as np
+
+from models.activaciones import obtener_activacion
+from models.motor import MotorEntrenamiento, nombres_activaciones, obtener_dtype, propagar
+from models.optimizadores import crear_optimizador
+from models.persistencia import cargar_npz, es_formato_binario, guardar_npz, usar_formato_binario
+from models.planificadores import crear_planificador
+
+
+class RedCapas:
+    """
+    Red de capas totalmente conectadas entrenada con backpropagation.
+
+    Los adaptadores sobrescriben inicializar_pesos() y, si lo necesitan,
+    los atributos de clase siguientes.
+    """
+    # Modo de entrenamiento cuando config no indica 'modo'
+    modo_por_defecto = 'online'
+    # Con softmax a la salida, el delta de salida es el error (gradiente de la
+    # entropía cruzada) en lugar del error por la derivada
+    entropia_cruzada_softmax = False
+    # Épocas entre mensajes de progreso en la consola
+    intervalo_progreso = 100
+    # Nombres de las matrices en los archivos de pesos: con una capa oculta
+    # (pesos, umbrales) y prefijos de las redes más profundas (W_0, T_0, ...)
+    nombres_una_oculta = (('W_h', 'W_o'), ('Th', 'To'))
+    prefijos_matrices = ('W', 'T')
+    # Sangría de los archivos JSON (None = una sola línea)
+    sangria_json = None
+
+    def __init__(self, config):
+        """
+        Inicializa la red con la configuración proporcionada.
+
+        Args:
+            config: Diccionario con la configuración de la red
+        """
+        self.config = config
+        self.dtype = obtener_dtype(config)
+        self.bias = config.get('bias', True)
+        self.max_epocas = int(config['max_epocas'])
+        self.precision = float(config['precision'])
+        self.funciones_activacion = config['funciones_activacion']
+        self.beta_leaky_relu = config.get('beta_leaky_relu', 0.01)
+
+        # Parada temprana: fracción de patrones reservada para validación, épocas sin
+        # mejora del error de validación antes de detenerse (0 = sin parada temprana)
+        # y mejora mínima que cuenta como mejora
+        self.validacion = float(config.get('validacion', 0.0))
+        self.paciencia = int(config.get('paciencia', 0))
+        self.min_mejora = float(config.get('min_mejora', 0.0))
+
+        # Variables para seguimiento del entrenamiento
+        self.epoca_actual = 0
+        self.error_actual = float('inf')
+        self.error_validacion = None
+        self.errores_validacion = []
+        self.mejor_epoca = 0
+
+        # Pila de capas y funciones de activación de cada capa
+        self.pesos = []
+        self.umbrales = []
+        self.inicializar_pesos()
+        self.resolver_activaciones()
+
+        # Regla de actualización y tasa de aprendizaje (se crean de nuevo en cada entrenamiento)
+        self.optimizador = crear_optimizador(config)
+        self.planificador = crear_planificador(config)
+        self.alfa_actual = float(config['alfa'])
+
+    def inicializar_pesos(self):
+        """Crea self.pesos y self.umbrales ([] sin bias) para dimensiones_capas(self.config)"""
+        raise NotImplementedError
+
+    @property
+    def dimensiones(self):
+        """Número de neuronas de cada capa [entradas, ocultas..., salidas]"""
+        return [self.pesos[0].shape[1]] + [W.shape[0] for W in self.pesos]
+
+    # ===== ACTIVACIONES =====
+
+    def obtener_activacion(self, nombre):
+        """Activación del registro con el nombre dado"""
+        return obtener_activacion(nombre)
+
+    def resolver_activaciones(self):
+        """
+        Obtiene del registro las activaciones de cada capa con pesos.
+        funciones_activacion puede ser [oculta, salida] o un nombre por capa.
+        """
+        nombres = nombres_activaciones(self.funciones_activacion, len(self.pesos))
+        self.activaciones = [self.obtener_activacion(nombre) for nombre in nombres]
+        self.parametros = {'beta_leaky_relu': float(self.beta_leaky_relu)}
+
+    def obtener_activaciones(self):
+        """
+        Obtiene las activaciones de cada capa y sus parámetros.
+
+        Returns:
+            Tupla (lista de activaciones por capa, parametros)
+        """
+        self.resolver_activaciones()
+        return self.activaciones, self.parametros
+
+    # ===== PESOS =====
+
+    def obtener_pesos(self):
+        """Devuelve las matrices actuales de la red (sin copiarlas): los pesos de cada capa y después sus umbrales"""
+        return tuple(self.pesos) + tuple(self.umbrales)
+
+    def establecer_pesos(self, pesos):
+        """Usa las matrices dadas (como las de obtener_pesos) como pesos de la red, sin copiarlas"""
+        num_capas = len(self.pesos)
+        self.pesos = list(pesos[:num_capas])
+        self.umbrales = list(pesos[num_capas:])
+
+    def asegurar_pesos_escribibles(self):
+        """Copia en memoria las matrices de solo lectura (por ejemplo, mapeadas con mmap_mode='r') antes de entrenar"""
+        self.pesos = [W if W.flags.writeable else np.array(W) for W in self.pesos]
+        self.umbrales = [T if T.flags.writeable else np.array(T) for T in self.umbrales]
+
+    # ===== ENTRENAMIENTO =====
+
+    def entrenar(self, X, Yd, callback=None):
+        """
+        Entrena la red con los patrones dados (ver entrenar_epocas).
+
+        Args:
+            X: Matriz de patrones de entrada, cada fila es un patrón
+            Yd: Matriz de salidas deseadas, cada fila corresponde a un patrón de entrada
+            callback: Función opcional callback(epoca, max_epocas, error, error_validacion)
+
+        Returns:
+            Lista de errores por época
+        """
+        X, Yd = self.preparar_datos(X, Yd)
+        X, Yd, X_validacion, Yd_validacion = self.separar_validacion(X, Yd)
+        return self.entrenar_epocas(X, Yd, X_validacion, Yd_validacion, callback)
+
+    def preparar_datos(self, X, Yd):
+        """Matrices contiguas con el tipo de punto flotante de la red (sin copiar si ya lo son)"""
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        Yd = np.ascontiguousarray(Yd, dtype=self.dtype)
+        return X, Yd
+
+    def patrones_validacion(self, total):
+        """Número de patrones de un conjunto de total que se reservan para validación (0 si no se puede)"""
+        n_validacion = int(round(total * self.validacion))
+        return n_validacion if 1 <= n_validacion < total else 0
+
+    def separar_validacion(self, X, Yd):
+        """
+        Separa al azar la fracción self.validacion de los patrones (en filas) para validación.
+
+        Returns:
+            tuple: (X, Yd de entrenamiento, X, Yd de validación o None si no hay validación)
+        """
+        total = len(X)
+        n_validacion = self.patrones_validacion(total)
+        if n_validacion == 0:
+            if self.validacion > 0:
+                print(f"Advertencia: no se puede reservar el {self.validacion * 100:.0f}% de {total} patrones para validación")
+            return X, Yd, None, None
+
+        indices = np.random.permutation(total)
+        validacion, entrenamiento = indices[:n_validacion], indices[n_validacion:]
+        return X[entrenamiento], Yd[entrenamiento], X[validacion], Yd[validacion]
+
+    def entrenar_epocas(self, X, Yd, X_validacion=None, Yd_validacion=None, callback=None):
+        """
+        Bucle de entrenamiento común a las dos redes.
+
+        El modo de entrenamiento se toma de config['modo'] (ver obtener_modo), la
+        regla de actualización de config['optimizador'] y la tasa de cada época
+        del planificador de config['planificador'].
+
+        Con patrones de validación, el callback recibe también su error, el
+        entrenamiento se detiene tras self.paciencia épocas sin mejorarlo (si
+        paciencia > 0) y al terminar se restauran los pesos con menor error de
+        validación. El error de validación se mide con los pesos iniciales y tras
+        cada época, de modo que self.errores_validacion[i] es el error de los pesos
+        tras i épocas y self.mejor_epoca el número de épocas de los pesos
+        restaurados (0 si son los iniciales). Los mejores pesos se conservan con un
+        doble búfer: en la época siguiente a una mejora, la primera actualización se
+        escribe en el otro búfer en lugar de copiar los pesos.
+
+        Args:
+            X, Yd: Patrones de entrenamiento, uno por fila, con el dtype de la red
+            X_validacion, Yd_validacion: Patrones de validación o None
+            callback: Función opcional callback(epoca, max_epocas, error, error_validacion)
+
+        Returns:
+            Lista de errores por época
+        """
+        self.asegurar_pesos_escribibles()
+        self.optimizador = crear_optimizador(self.config)
+        self.planificador = crear_planificador(self.config)
+        activaciones, parametros = self.obtener_activaciones()
+
+        P = len(X)
+        modo, tam_lote = self.obtener_modo(P)
+
+        # Reservar una sola vez todos los buffers intermedios del entrenamiento
+        motor = MotorEntrenamiento(self, P, tam_lote, activaciones, parametros)
+
+        errores = []
+        self.errores_validacion = []
+        self.error_validacion = None
+        self.mejor_epoca = 0
+
+        # Doble búfer de la parada temprana: mejores pesos y búferes libres para la actualización
+        mejor_error = float('inf')
+        sin_mejora = 0
+        mejores = None
+        libres = None
+
+        def validar(epoca):
+            """Mide el error de validación de los pesos tras epoca épocas y conserva los mejores"""
+            nonlocal mejor_error, sin_mejora, mejores, libres
+            self.error_validacion = self.calcular_error_conjunto(X_validacion, Yd_validacion)
+            self.errores_validacion.append(self.error_validacion)
+            if self.error_validacion < mejor_error - self.min_mejora:
+                mejor_error = self.error_validacion
+                self.mejor_epoca = epoca
+                sin_mejora = 0
+                # Los mejores pesos anteriores quedan libres; los actuales pasan a ser los mejores
+                if mejores is not None and mejores[0] is not self.pesos[0]:
+                    libres = mejores
+                mejores = self.obtener_pesos()
+            else:
+                sin_mejora += 1
+
+        # Error de validación de los pesos iniciales
+        if X_validacion is not None:
+            validar(0)
+
+        Et = float('inf')
+        epoca = 0
+        inicio = time.time()
+        while Et > self.precision and epoca < self.max_epocas:
+            # Si los pesos actuales son los mejores, la actualización se escribe en los búferes libres
+            destino = None
+            if mejores is not None and mejores[0] is self.pesos[0]:
+                destino = libres or tuple(np.empty_like(matriz) for matriz in mejores)
+                libres = None
+
+            # Error promedio de la época
+            self.alfa_actual = self.planificador.tasa(epoca, errores)
+            Et = motor.epoca(X, Yd, self.alfa_actual, mezclar=(modo == 'minibatch'), destino=destino) / P
+            errores.append(float(Et))
+
+            epoca += 1
+            self.epoca_actual = epoca
+            self.error_actual = float(Et)
+
+            # Error de validación de los pesos de esta época
+            if X_validacion is not None:
+                validar(epoca)
+
+            if callback:
+                callback(epoca, self.max_epocas, self.error_actual, self.error_validacion)
+
+            # Mostrar progreso cada intervalo_progreso épocas o en la última
+            if epoca % self.intervalo_progreso == 0 or Et <= self.precision or epoca == self.max_epocas:
+                self.mostrar_progreso(epoca, inicio)
+
+            if self.paciencia > 0 and sin_mejora >= self.paciencia:
+                print(f"Parada temprana tras la época {epoca}: {sin_mejora} épocas sin mejorar el error de validación")
+                break
+
+        # Restaurar los pesos con menor error de validación (si no son los actuales)
+        if mejores is not None and mejores[0] is not self.pesos[0]:
+            self.establecer_pesos(mejores)
+            self.error_validacion = mejor_error
+            print(f"Pesos restaurados de la época {self.mejor_epoca} (error de validación: {mejor_error:.6f})")
+
+        print(f"Entrenamiento completado en {epoca} épocas")
+        print(f"Error final: {self.error_actual:.6f}")
+        return errores
+
+    def entrenar_flujo(self, fuente, callback=None):
+        """
+        Entrena la red con patrones leídos por bloques, sin cargar el conjunto
+        completo en memoria (ver models.data_processor.iter_data_chunks).
+
+        Admite los modos 'online' y 'minibatch'; en modo 'minibatch' los
+        patrones se mezclan dentro de cada bloque.
+
+        Args:
+            fuente: Función sin argumentos que devuelve, en cada época, un
+                    iterable nuevo de bloques (X, Yd) con un patrón por fila
+            callback: Función opcional callback(epoca, max_epocas, error, None)
+
+        Returns:
+            Lista de errores por época
+        """
+        self.asegurar_pesos_escribibles()
+        self.optimizador = crear_optimizador(self.config)
+        self.planificador = crear_planificador(self.config)
+        activaciones, parametros = self.obtener_activaciones()
+        modo, tam_lote = self.obtener_modo()
+
+        # Los buffers se reservan para el tamaño de lote; los de lotes menores, al primer uso
+        motor = MotorEntrenamiento(self, tam_lote, tam_lote, activaciones, parametros)
+
+        errores = []
+        Et = float('inf')
+        epoca = 0
+        inicio = time.time()
+        while Et > self.precision and epoca < self.max_epocas:
+            # Error total y número de patrones de la época
+            Et = 0.0
+            P = 0
+            self.alfa_actual = self.planificador.tasa(epoca, errores)
+            for X, Yd in fuente():
+                X, Yd = self.preparar_datos(X, Yd)
+                Et += motor.epoca(X, Yd, self.alfa_actual, mezclar=(modo == 'minibatch'))
+                P += len(X)
+
+            if P == 0:
+                raise ValueError("La fuente de datos no produjo ningún patrón")
+
+            Et = Et / P
+            errores.append(float(Et))
+            epoca += 1
+            self.epoca_actual = epoca
+            self.error_actual = float(Et)
+
+            if callback:
+                callback(epoca, self.max_epocas, self.error_actual, None)
+
+            if epoca % self.intervalo_progreso == 0 or Et <= self.precision or epoca == self.max_epocas:
+                self.mostrar_progreso(epoca, inicio)
+
+        print(f"Entrenamiento completado en {epoca} épocas")
+        print(f"Error final: {self.error_actual:.6f}")
+        return errores
+
+    def mostrar_progreso(self, epoca, inicio):
+        """Muestra en la consola el error de la época y el tiempo transcurrido"""
+        validacion = f", Error de validación: {self.error_validacion:.6f}" if self.error_validacion is not None else ""
+        print(f"Época {epoca}/{self.max_epocas}, Error: {self.error_actual:.6f}{validacion}, Tiempo: {time.time() - inicio:.2f}s")
+
+    def obtener_modo(self, P=None):
+        """
+        Obtiene el modo de entrenamiento de config['modo'] y los patrones por paso.
+
+        Args:
+            P: Número de patrones en memoria, o None si se leen por bloques
+
+        Returns:
+            Tupla (modo, tam_lote)
+        """
+        # Modo de entrenamiento: 'online' (patrón a patrón), 'batch' (todos los
+        # patrones a la vez) o 'minibatch' (lotes de tamaño 'tam_lote')
+        modo = str(self.config.get('modo', self.modo_por_defecto)).lower()
+        if modo == 'online':
+            tam_lote = 1
+        elif modo == 'batch':
+            if P is None:
+                raise ValueError("El modo 'batch' necesita todos los patrones en memoria; use 'minibatch' para entrenar por bloques")
+            tam_lote = P
+        elif modo == 'minibatch':
+            tam_lote = max(1, int(self.config.get('tam_lote', 32)))
+            if P is not None:
+                tam_lote = min(tam_lote, P)
+        else:
+            raise ValueError(f"Modo de entrenamiento no reconocido: {modo}")
+        return modo, tam_lote
+
+    def calcular_error_conjunto(self, X, Yd, tam_bloque=4096):
+        """Error cuadrático promedio por patrón (la mitad de la suma de cuadrados) de un conjunto en filas"""
+        error = 0.0
+        for inicio in range(0, len(X), tam_bloque):
+            fin = min(inicio + tam_bloque, len(X))
+            diferencia = self._propagar_bloque(X[inicio:fin])
+            diferencia -= Yd[inicio:fin].T
+            error += 0.5 * float(np.vdot(diferencia, diferencia))
+        return error / len(X)
+
+    # ===== PREDICCIÓN =====
+
+    def predecir(self, X, tam_bloque=4096):
+        """
+        Realiza la clasificación de los patrones de entrada.
+
+        Los patrones se propagan por bloques de hasta tam_bloque filas, con un
+        producto matricial por capa para todo el bloque, de modo que la memoria
+        intermedia queda acotada aunque X sea muy grande (o esté mapeada).
+
+        Args:
+            X: Matriz de patrones de entrada, cada fila es un patrón (o cada
+               columna si las filas no tienen el tamaño de la capa de entrada)
+            tam_bloque: Número máximo de patrones propagados a la vez
+
+        Returns:
+            Matriz de salidas de la red, cada fila corresponde a un patrón de entrada
+        """
+        X = self._ejemplos_en_filas(X)
+
+        salidas = np.empty((len(X), self.pesos[-1].shape[0]), dtype=self.dtype)
+        for inicio in range(0, len(X), tam_bloque):
+            fin = min(inicio + tam_bloque, len(X))
+            salidas[inicio:fin] = self._propagar_bloque(X[inicio:fin]).T
+
+        return salidas
+
+    def predecir_clases(self, X, tam_bloque=4096, umbral=0.5):
+        """
+        Devuelve la clase predicha para cada patrón de entrada.
+
+        Con una sola neurona de salida la clase es 1 si la salida supera el
+        umbral y 0 en caso contrario; con varias, el índice de la mayor salida.
+
+        Args:
+            X: Matriz de patrones de entrada, cada fila es un patrón
+            tam_bloque: Número máximo de patrones propagados a la vez
+            umbral: Umbral de decisión para una sola neurona de salida
+
+        Returns:
+            Vector de enteros con la clase de cada patrón
+        """
+        X = self._ejemplos_en_filas(X)
+
+        clases = np.empty(len(X), dtype=np.intp)
+        for inicio in range(0, len(X), tam_bloque):
+            fin = min(inicio + tam_bloque, len(X))
+            Yo = self._propagar_bloque(X[inicio:fin])
+            if len(Yo) == 1:
+                clases[inicio:fin] = Yo[0] > umbral
+            else:
+                clases[inicio:fin] = np.argmax(Yo, axis=0)
+
+        return clases
+
+    def _ejemplos_en_filas(self, X):
+        """Convierte la entrada en una matriz con un patrón por fila"""
+        X = np.asarray(X, dtype=self.dtype)
+
+        # Si X es un solo patrón (vector), convertirlo a matriz fila
+        if X.ndim == 1:
+            return X.reshape(1, -1)
+        # Si X tiene los patrones en columnas, transponerlo
+        entradas = self.pesos[0].shape[1]
+        if X.shape[1] != entradas and X.shape[0] == entradas:
+            return X.T
+        return X
+
+    def _propagar_bloque(self, X):
+        """Propaga un bloque de patrones (uno por fila) y devuelve las salidas por columnas"""
+        return propagar(self.pesos, self.umbrales or None, self.activaciones, X.T, self.parametros)
+
+    # ===== PERSISTENCIA =====
+
+    def _nombres_matrices(self, num_capas):
+        """Nombres con los que se guardan los pesos y umbrales de cada capa"""
+        if num_capas == 2:
+            return [list(nombres) for nombres in self.nombres_una_oculta]
+        prefijo_pesos, prefijo_umbrales = self.prefijos_matrices
+        return [f'{prefijo_pesos}_{k}' for k in range(num_capas)], [f'{prefijo_umbrales}_{k}' for k in range(num_capas)]
+
+    def config_guardada(self):
+        """Configuración que se guarda junto a los pesos"""
+        return dict(self.config, dtype=self.dtype.name)
+
+    def guardar_pesos(self, archivo):
+        """
+        Guarda los pesos de la red en un archivo JSON, o en formato binario
+        (models.persistencia) si el archivo tiene extensión .npz.
+
+        Args:
+            archivo: Ruta del archivo donde se guardarán los pesos
+        """
+        config = self.config_guardada()
+
+        nombres_pesos, nombres_umbrales = self._nombres_matrices(len(self.pesos))
+        matrices = dict(zip(nombres_pesos, self.pesos))
+        matrices.update(zip(nombres_umbrales, self.umbrales))
+
+        if usar_formato_binario(archivo):
+            guardar_npz(archivo, matrices, config)
+            return
+
+        datos = {nombre: matriz.tolist() for nombre, matriz in matrices.items()}
+        datos['config'] = config
+
+        with open(archivo, 'w') as f:
+            json.dump(datos, f, indent=self.sangria_json)
+
+    def cargar_pesos(self, archivo, mmap_mode=None):
+        """
+        Carga los pesos de la red desde un archivo JSON o binario (.npz).
+        El formato se detecta por los primeros bytes del archivo.
+
+        Args:
+            archivo: Ruta del archivo desde donde se cargarán los pesos
+            mmap_mode: Solo para formato binario: None para leer los pesos en
+                       memoria, o 'r', 'r+', 'c' para mapearlos desde el archivo
+                       (con 'r', entrenar copia antes los pesos en memoria)
+        """
+        if es_formato_binario(archivo):
+            matrices, config = cargar_npz(archivo, mmap_mode=mmap_mode)
+            datos = dict(matrices, config=config)
+        else:
+            with open(archivo, 'r') as f:
+                datos = json.load(f)
+
+        # Tipo de punto flotante con el que se guardaron los pesos
+        config = datos.get('config') or {}
+        if 'dtype' in config:
+            self.dtype = obtener_dtype(config)
+
+        # Número de capas con pesos: 2 con los nombres de una capa oculta, o tantas como W_0, W_1, ...
+        num_capas = 2
+        if self.nombres_una_oculta[0][0] not in datos:
+            num_capas = 0
+            while f'{self.prefijos_matrices[0]}_{num_capas}' in datos:
+                num_capas += 1
+        nombres_pesos, nombres_umbrales = self._nombres_matrices(num_capas)
+
+        self.pesos = [np.asarray(datos[nombre], dtype=self.dtype) for nombre in nombres_pesos]
+        if all(nombre in datos for nombre in nombres_umbrales):
+            self.umbrales = [np.asarray(datos[nombre], dtype=self.dtype) for nombre in nombres_umbrales]
+        else:
+            self.umbrales = []
+        self.bias = bool(self.umbrales)
+
+        self.aplicar_config_cargada(config)
+
+        # Activaciones de las capas cargadas (el número de capas puede haber cambiado)
+        self.resolver_activaciones()
+
+    def aplicar_config_cargada(self, config):
+        """Actualiza la red con la configuración guardada junto a los pesos"""
+        if 'funciones_activacion' in config:
+            self.funciones_activacion = config['funciones_activacion']
+        if 'beta_leaky_relu' in config:
+            self.beta_leaky_relu = config['beta_leaky_relu']
@@ -0,0 +1,187 @@
+"""
+Optimizadores de RedBP
+Universidad de Cundinamarca
+
+Reglas de actualización de pesos compartidas por models.backpropagation
+(a través de models.motor) y models.Red_BP: descenso de gradiente (SGD),
+momentum clásico, Nesterov, RMSProp y Adam. Cada optimizador recibe la
+dirección de descenso de una matriz de pesos (menos el gradiente, sumada
+sobre los patrones del paso) y la convierte en el cambio que se suma a los
+pesos. Todo el cálculo se hace en el lugar, sobre la propia dirección y
+sobre buffers de momentos que se reservan en el primer paso de cada matriz
+y se reutilizan en los siguientes.
+
+Configuración (diccionario config de la red):
+    'optimizador': 'sgd', 'momentum', 'nesterov', 'rmsprop' o 'adam'. Si no
+                   se indica, se usa 'momentum' cuando config['momentum'] es
+                   True y 'sgd' en caso contrario.
+    'beta': Coeficiente de momentum (momentum y nesterov)
+    'rho': Decaimiento de la media de gradientes al cuadrado (rmsprop, 0.9)
+    'beta1', 'beta2': Decaimiento de los momentos de Adam (0.9 y 0.999)
+    'epsilon': Término de estabilidad numérica (rmsprop y adam, 1e-8)
+"""
+
+import numpy as np
+
+
+class Optimizador:
+    """
+    Descenso de gradiente (SGD): el cambio es alfa por la dirección promedio.
+
+    Subclases sobrescriben paso(); los buffers se obtienen con buffer().
+    """
+    def __init__(self, config):
+        self.config = config
+        self.buffers = {}
+
+    def buffer(self, nombre, G, tipo):
+        """Buffer 'tipo' de la matriz 'nombre', con la forma de G (se reserva en ceros al primer uso)"""
+        clave = (nombre, tipo)
+        actual = self.buffers.get(clave)
+        if actual is None or actual.shape != G.shape or actual.dtype != G.dtype:
+            actual = np.zeros_like(G)
+            self.buffers[clave] = actual
+        return actual
+
+    def paso(self, nombre, G, alfa, n=1):
+        """
+        Calcula el cambio de una matriz de pesos.
+
+        Args:
+            nombre: Identificador de la matriz (p. ej. 'W_h'), para sus buffers
+            G: Dirección de descenso (menos el gradiente) sumada sobre n patrones;
+               se usa como espacio de trabajo y se modifica
+            alfa: Tasa de aprendizaje
+            n: Número de patrones sumados en G
+
+        Returns:
+            Matriz con el cambio a sumar a los pesos (G o un buffer del optimizador)
+        """
+        G *= alfa / n
+        return G
+
+    def reiniciar(self):
+        """Olvida los momentos acumulados"""
+        self.buffers.clear()
+
+
+class Momentum(Optimizador):
+    """Momentum clásico: v = beta * v + alfa * g; el cambio es v"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.beta = float(config.get('beta', 0.0))
+
+    def paso(self, nombre, G, alfa, n=1):
+        G *= alfa / n
+        v = self.buffer(nombre, G, 'velocidad')
+        v *= self.beta
+        v += G
+        return v
+
+
+class Nesterov(Momentum):
+    """Momentum de Nesterov: v = beta * v + alfa * g; el cambio es beta * v + alfa * g"""
+    def paso(self, nombre, G, alfa, n=1):
+        G *= alfa / n
+        v = self.buffer(nombre, G, 'velocidad')
+        v *= self.beta
+        v += G
+        auxiliar = self.buffer(nombre, G, 'auxiliar')
+        np.multiply(v, self.beta, out=auxiliar)
+        G += auxiliar
+        return G
+
+
+class RMSProp(Optimizador):
+    """RMSProp: s = rho * s + (1 - rho) * g²; el cambio es alfa * g / (sqrt(s) + epsilon)"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.rho = float(config.get('rho', 0.9))
+        self.epsilon = float(config.get('epsilon', 1e-8))
+
+    def paso(self, nombre, G, alfa, n=1):
+        G /= n
+        s = self.buffer(nombre, G, 'cuadrados')
+        auxiliar = self.buffer(nombre, G, 'auxiliar')
+        np.multiply(G, G, out=auxiliar)
+        auxiliar *= 1.0 - self.rho
+        s *= self.rho
+        s += auxiliar
+        np.sqrt(s, out=auxiliar)
+        auxiliar += self.epsilon
+        G /= auxiliar
+        G *= alfa
+        return G
+
+
+class Adam(Optimizador):
+    """Adam: momentos de primer y segundo orden con corrección de sesgo"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.beta1 = float(config.get('beta1', 0.9))
+        self.beta2 = float(config.get('beta2', 0.999))
+        self.epsilon = float(config.get('epsilon', 1e-8))
+        self.pasos = {}
+
+    def paso(self, nombre, G, alfa, n=1):
+        G /= n
+        m = self.buffer(nombre, G, 'media')
+        v = self.buffer(nombre, G, 'cuadrados')
+        auxiliar = self.buffer(nombre, G, 'auxiliar')
+        t = self.pasos.get(nombre, 0) + 1
+        self.pasos[nombre] = t
+
+        # m = beta1 * m + (1 - beta1) * g
+        m *= self.beta1
+        np.multiply(G, 1.0 - self.beta1, out=auxiliar)
+        m += auxiliar
+
+        # v = beta2 * v + (1 - beta2) * g²
+        v *= self.beta2
+        np.multiply(G, G, out=auxiliar)
+        auxiliar *= 1.0 - self.beta2
+        v += auxiliar
+
+        # Cambio con la corrección de sesgo aplicada a la tasa de aprendizaje
+        correccion = np.sqrt(1.0 - self.beta2 ** t)
+        np.sqrt(v, out=auxiliar)
+        auxiliar += self.epsilon * correccion
+        np.divide(m, auxiliar, out=G)
+        G *= alfa * correccion / (1.0 - self.beta1 ** t)
+        return G
+
+    def reiniciar(self):
+        super().reiniciar()
+        self.pasos.clear()
+
+
+# Optimizadores disponibles por nombre en config['optimizador']
+OPTIMIZADORES = {
+    'sgd': Optimizador,
+    'momentum': Momentum,
+    'nesterov': Nesterov,
+    'rmsprop': RMSProp,
+    'adam': Adam,
+}
+
+
+def nombre_optimizador(config):
+    """Nombre del optimizador de una configuración ('momentum' o 'sgd' según config['momentum'] si no se indica)"""
+    nombre = config.get('optimizador')
+    if not nombre:
+        return 'momentum' if config.get('momentum', False) else 'sgd'
+    return str(nombre).lower()
+
+
+def crear_optimizador(config):
+    """
+    Crea el optimizador indicado en la configuración de la red.
+
+    Raises:
+        ValueError: Si el optimizador no está registrado
+    """
+    nombre = nombre_optimizador(config)
+    try:
+        return OPTIMIZADORES[nombre](config)
+    except KeyError:
+        raise ValueError(f"Optimizador no reconocido: {nombre}")
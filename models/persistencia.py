@@ -0,0 +1,98 @@
+"""
+Formato binario de pesos de RedBP
+Universidad de Cundinamarca
+
+Los pesos se guardan en un .npz sin comprimir: un miembro .npy por matriz
+más un miembro '__config__' con la configuración de la red en JSON. Como
+los miembros se almacenan sin comprimir, cada matriz puede mapearse en
+memoria directamente desde el archivo (mmap_mode), sin leerla completa.
+"""
+
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+# Primeros bytes de un archivo zip (.npz)
+MAGIA_NPZ = b'PK\x03\x04'
+
+# Nombre del miembro que guarda la configuración de la red
+MIEMBRO_CONFIG = '__config__'
+
+
+def es_formato_binario(archivo):
+    """Indica si un archivo (de pesos o de datos) está en formato binario (.npz), según sus primeros bytes"""
+    with open(archivo, 'rb') as f:
+        return f.read(len(MAGIA_NPZ)) == MAGIA_NPZ
+
+
+def usar_formato_binario(archivo):
+    """Indica si un archivo de pesos debe guardarse en formato binario, según su extensión"""
+    return str(archivo).lower().endswith('.npz')
+
+
+def guardar_npz(archivo, matrices, config):
+    """
+    Guarda las matrices de pesos y la configuración en un .npz sin comprimir.
+
+    Args:
+        archivo: Ruta del archivo (se respeta tal cual, sin añadir extensión)
+        matrices: Diccionario nombre -> matriz de pesos
+        config: Diccionario de configuración serializable en JSON
+    """
+    with open(archivo, 'wb') as f:
+        np.savez(f, **{MIEMBRO_CONFIG: np.array(json.dumps(config))}, **matrices)
+
+
+def cargar_npz(archivo, mmap_mode=None):
+    """
+    Carga las matrices de pesos y la configuración de un .npz.
+
+    Args:
+        archivo: Ruta del archivo
+        mmap_mode: None para leer las matrices en memoria, o 'r', 'r+', 'c'
+                   para mapearlas desde el archivo como en np.load
+
+    Returns:
+        tuple: (diccionario nombre -> matriz, diccionario de configuración)
+    """
+    matrices = {}
+    with np.load(archivo, allow_pickle=False) as npz:
+        config = json.loads(str(npz[MIEMBRO_CONFIG])) if MIEMBRO_CONFIG in npz.files else {}
+        for nombre in npz.files:
+            if nombre != MIEMBRO_CONFIG and mmap_mode is None:
+                matrices[nombre] = npz[nombre]
+
+    if mmap_mode is not None:
+        with zipfile.ZipFile(archivo) as zf:
+            for info in zf.infolist():
+                nombre = info.filename[:-len('.npy')]
+                if nombre != MIEMBRO_CONFIG:
+                    matrices[nombre] = _mapear_miembro(archivo, info, mmap_mode)
+
+    return matrices, config
+
+
+def _mapear_miembro(archivo, info, mmap_mode):
+    """Mapea en memoria una matriz .npy almacenada sin comprimir dentro de un .npz"""
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"No se puede mapear '{info.filename}': el miembro está comprimido")
+
+    with open(archivo, 'rb') as f:
+        # Cabecera local del zip: 30 bytes fijos + nombre + campo extra
+        f.seek(info.header_offset)
+        cabecera = f.read(30)
+        largo_nombre, largo_extra = struct.unpack('<HH', cabecera[26:30])
+        f.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+
+        # Cabecera .npy del miembro
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            forma, orden_fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            forma, orden_fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        desplazamiento = f.tell()
+
+    return np.memmap(archivo, dtype=dtype, mode=mmap_mode, offset=desplazamiento,
+                     shape=forma, order='F' if orden_fortran else 'C')
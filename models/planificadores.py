@@ -0,0 +1,144 @@
+"""
+Planificadores de la tasa de aprendizaje de RedBP
+Universidad de Cundinamarca
+
+Calculan, al comienzo de cada época, la tasa de aprendizaje a partir de la
+tasa inicial config['alfa'], del número de época y de la lista de errores de
+las épocas anteriores. Los usan los bucles de entrenamiento de
+models.backpropagation y models.Red_BP.
+
+Configuración (diccionario config de la red):
+    'planificador': 'constante' (por defecto), 'escalonada', 'exponencial',
+                    'coseno' o 'meseta'
+    'gamma': Factor de reducción (escalonada 0.5, exponencial 0.999, meseta 0.5)
+    'paso_decaimiento': Épocas entre reducciones de la tasa escalonada (1000)
+    'periodo': Épocas del primer ciclo del coseno con reinicios (1000)
+    'factor_periodo': Factor de crecimiento de cada ciclo del coseno (2)
+    'paciencia_meseta': Épocas sin mejora antes de reducir en meseta (100)
+    'umbral_meseta': Mejora relativa mínima del error en meseta (1e-4)
+    'alfa_min': Tasa mínima de todos los planificadores (0)
+"""
+
+import math
+
+
+class Planificador:
+    """Tasa de aprendizaje constante; las subclases sobrescriben tasa()"""
+    def __init__(self, config):
+        self.alfa = float(config['alfa'])
+        self.alfa_min = float(config.get('alfa_min', 0.0))
+
+    def tasa(self, epoca, errores):
+        """
+        Tasa de aprendizaje de una época.
+
+        Args:
+            epoca: Número de la época que va a empezar (desde 0)
+            errores: Errores de las épocas ya completadas
+
+        Returns:
+            Tasa de aprendizaje (float)
+        """
+        return self.alfa
+
+
+class TasaEscalonada(Planificador):
+    """Multiplica la tasa por gamma cada paso_decaimiento épocas"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.gamma = float(config.get('gamma', 0.5))
+        self.paso = max(1, int(config.get('paso_decaimiento', 1000)))
+
+    def tasa(self, epoca, errores):
+        return max(self.alfa_min, self.alfa * self.gamma ** (epoca // self.paso))
+
+
+class TasaExponencial(Planificador):
+    """Multiplica la tasa por gamma en cada época"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.gamma = float(config.get('gamma', 0.999))
+
+    def tasa(self, epoca, errores):
+        return max(self.alfa_min, self.alfa * self.gamma ** epoca)
+
+
+class TasaCoseno(Planificador):
+    """
+    Recocido coseno con reinicios (SGDR): la tasa baja de alfa a alfa_min a lo
+    largo de un ciclo y vuelve a alfa al empezar el siguiente, que dura
+    factor_periodo veces más.
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        self.periodo = max(1, int(config.get('periodo', 1000)))
+        self.factor_periodo = max(1, int(config.get('factor_periodo', 2)))
+
+    def tasa(self, epoca, errores):
+        # Posición dentro del ciclo actual
+        periodo = self.periodo
+        while epoca >= periodo:
+            epoca -= periodo
+            periodo *= self.factor_periodo
+        return self.alfa_min + 0.5 * (self.alfa - self.alfa_min) * (1 + math.cos(math.pi * epoca / periodo))
+
+
+class TasaMeseta(Planificador):
+    """
+    Reduce la tasa multiplicándola por gamma cuando el error no mejora
+    (relativamente, más de umbral_meseta) durante paciencia_meseta épocas.
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        self.gamma = float(config.get('gamma', 0.5))
+        self.paciencia = max(1, int(config.get('paciencia_meseta', 100)))
+        self.umbral = float(config.get('umbral_meseta', 1e-4))
+        self.actual = self.alfa
+        self.mejor = float('inf')
+        self.sin_mejora = 0
+        self.revisados = 0
+
+    def tasa(self, epoca, errores):
+        # Un entrenamiento nuevo empieza con la tasa inicial
+        if len(errores) < self.revisados:
+            self.actual = self.alfa
+            self.mejor = float('inf')
+            self.sin_mejora = 0
+            self.revisados = 0
+
+        # Revisar solo los errores que no se han visto en llamadas anteriores
+        for error in errores[self.revisados:]:
+            if error < self.mejor * (1 - self.umbral):
+                self.mejor = error
+                self.sin_mejora = 0
+            else:
+                self.sin_mejora += 1
+                if self.sin_mejora >= self.paciencia:
+                    self.actual = max(self.alfa_min, self.actual * self.gamma)
+                    self.sin_mejora = 0
+        self.revisados = len(errores)
+        return self.actual
+
+
+# Planificadores disponibles por nombre en config['planificador']
+PLANIFICADORES = {
+    'constante': Planificador,
+    'escalonada': TasaEscalonada,
+    'exponencial': TasaExponencial,
+    'coseno': TasaCoseno,
+    'meseta': TasaMeseta,
+}
+
+
+def crear_planificador(config):
+    """
+    Crea el planificador indicado en config['planificador'] ('constante' si no se indica).
+
+    Raises:
+        ValueError: Si el planificador no está registrado
+    """
+    nombre = str(config.get('planificador') or 'constante').lower()
+    try:
+        return PLANIFICADORES[nombre](config)
+    except KeyError:
+        raise ValueError(f"Planificador de la tasa de aprendizaje no reconocido: {nombre}")
@@ -0,0 +1,145 @@
+"""
+Telemetría del entrenamiento de RedBP
+Universidad de Cundinamarca
+
+Búfer circular de capacidad fija (un arreglo estructurado de numpy) donde
+el hilo de entrenamiento escribe un registro por época (época, error, error
+de validación, tiempo transcurrido y patrones por segundo) y del que la
+interfaz lee en bloque todos los registros nuevos en cada actualización.
+
+Hay un solo escritor y un solo lector, y no se usan bloqueos: el escritor
+copia el registro en su posición y después publica el contador de
+registros escritos (una asignación de un entero, atómica con el GIL); el
+lector copia los registros pendientes y vuelve a leer el contador, y
+descarta los que el escritor pudo sobrescribir durante la copia. Si el
+lector se retrasa más de la capacidad del búfer, los registros más
+antiguos se pierden y se cuentan en perdidos.
+
+Uso (en el hilo de entrenamiento):
+    telemetria.iniciar(max_epocas, patrones)
+    red.entrenar(X, Y, callback=telemetria.registrar_epoca)
+
+Uso (en el hilo de la interfaz, periódicamente):
+    registros = telemetria.drenar()
+    registros['epoca'], registros['error'], ...
+"""
+
+import time
+
+import numpy as np
+
+# Campos de cada registro (error_validacion es NaN sin validación)
+TIPO_REGISTRO = np.dtype([
+    ('epoca', np.int64),
+    ('error', np.float64),
+    ('error_validacion', np.float64),
+    ('tiempo', np.float64),
+    ('muestras_por_segundo', np.float64),
+])
+
+
+class Telemetria:
+    """Búfer circular de registros de entrenamiento, con un escritor y un lector sin bloqueos"""
+    def __init__(self, capacidad=65536):
+        """
+        Args:
+            capacidad: Número de registros que caben en el búfer sin que el lector los drene
+        """
+        self.capacidad = int(capacidad)
+        self.registros = np.zeros(self.capacidad, dtype=TIPO_REGISTRO)
+        self.iniciar()
+
+    def iniciar(self, max_epocas=0, patrones=0):
+        """
+        Vacía el búfer para un entrenamiento nuevo. Debe llamarse antes de que
+        empiece a escribir el hilo de entrenamiento.
+
+        Args:
+            max_epocas: Número máximo de épocas del entrenamiento (para el progreso)
+            patrones: Patrones de entrenamiento por época (para los patrones por segundo)
+        """
+        self.max_epocas = int(max_epocas)
+        self.patrones = int(patrones)
+        self.escritos = 0
+        self.leidos = 0
+        self.perdidos = 0
+        self.inicio = time.perf_counter()
+        self._anterior = self.inicio
+
+    # --- Escritor (hilo de entrenamiento) ---
+
+    def registrar(self, epoca, error, error_validacion=None, muestras=None):
+        """
+        Escribe un registro. Solo debe llamarse desde un hilo.
+
+        Args:
+            epoca: Número de la época completada (desde 1)
+            error: Error de entrenamiento de la época
+            error_validacion: Error de validación, o None sin validación
+            muestras: Patrones procesados desde el registro anterior (por defecto, self.patrones)
+        """
+        ahora = time.perf_counter()
+        duracion = ahora - self._anterior
+        self._anterior = ahora
+        muestras = self.patrones if muestras is None else muestras
+
+        escritos = self.escritos
+        self.registros[escritos % self.capacidad] = (
+            epoca,
+            error,
+            np.nan if error_validacion is None else error_validacion,
+            ahora - self.inicio,
+            muestras / duracion if duracion > 0 else 0.0,
+        )
+
+        # Publicar el registro después de escribirlo
+        self.escritos = escritos + 1
+
+    def registrar_epoca(self, epoca, max_epocas, error, error_validacion=None):
+        """Callback de RedBP.entrenar: registra una época completada"""
+        self.max_epocas = max_epocas
+        self.registrar(epoca, error, error_validacion)
+
+    # --- Lector (hilo de la interfaz) ---
+
+    def drenar(self):
+        """
+        Registros escritos desde la llamada anterior, en orden. Solo debe
+        llamarse desde un hilo.
+
+        Returns:
+            Arreglo estructurado (TIPO_REGISTRO) con los registros nuevos, que
+            no comparte memoria con el búfer
+        """
+        escritos = self.escritos
+        desde = max(self.leidos, escritos - self.capacidad)
+        if escritos == desde:
+            self.leidos = escritos
+            return self.registros[:0].copy()
+
+        indices = np.arange(desde, escritos) % self.capacidad
+        copia = self.registros[indices]
+
+        # Descartar los registros que el escritor pudo sobrescribir durante la copia
+        validos_desde = self.escritos - self.capacidad + 1
+        if validos_desde > desde:
+            copia = copia[min(validos_desde, escritos) - desde:]
+
+        self.perdidos += escritos - self.leidos - len(copia)
+        self.leidos = escritos
+        return copia
+
+    def ultimo(self):
+        """Último registro escrito (sin consumirlo), o None si no hay registros"""
+        escritos = self.escritos
+        if escritos == 0:
+            return None
+        return self.registros[(escritos - 1) % self.capacidad].copy()
+
+    @property
+    def progreso(self):
+        """Porcentaje de épocas completadas (de 0 a 100)"""
+        ultimo = self.ultimo()
+        if ultimo is None or self.max_epocas <= 0:
+            return 0
+        return min(100, int(ultimo['epoca'] * 100 / self.max_epocas))
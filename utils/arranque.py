@@ -0,0 +1,99 @@
+"""
+Perfil y precarga del arranque de la aplicación
+Universidad de Cundinamarca
+
+PerfilArranque registra el tiempo transcurrido en cada etapa del arranque
+(importaciones, ventana principal, primera ventana visible, apertura de cada
+laboratorio) y lo muestra con la opción --profile-startup de main.py.
+precargar_en_segundo_plano importa en un hilo los módulos pesados que no
+tocan Tk (numpy, PIL, el núcleo de matplotlib y los modelos), de modo que
+abrir un laboratorio no espera por ellos.
+"""
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Módulos que se precargan tras mostrar la ventana. No incluye pyplot, el
+# backend TkAgg ni las vistas, que se importan en el hilo de Tk al abrir cada pestaña
+MODULOS_PRECARGA = (
+    'numpy',
+    'PIL.Image',
+    'PIL.ImageTk',
+    'matplotlib.figure',
+    'matplotlib.patches',
+    'models.backpropagation',
+    'models.Red_BP',
+    'models.data_processor',
+    'models.cache_imagenes',
+    'models.evaluacion',
+)
+
+# Módulos cuya presencia se informa al mostrarse la primera ventana
+MODULOS_PESADOS = ('numpy', 'PIL', 'matplotlib', 'matplotlib.pyplot', 'views.main_view', 'controllers.images_controller')
+
+
+class PerfilArranque:
+    """Marcas de tiempo del arranque, medidas desde la creación del perfil"""
+    def __init__(self, inicio=None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.marcas = []
+        self.modulos_primera_ventana = None
+
+    def marcar(self, etapa):
+        """Registra el instante en que termina una etapa (puede llamarse desde cualquier hilo)"""
+        self.marcas.append((etapa, time.perf_counter() - self.inicio, threading.current_thread().name))
+
+    @contextmanager
+    def medir(self, etapa):
+        """Registra una etapa con su duración propia, además del instante en que termina"""
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracion = time.perf_counter() - comienzo
+            self.marcar(f"{etapa} ({duracion * 1000:.0f} ms)")
+
+    def primera_ventana(self):
+        """Marca la primera ventana visible y anota qué módulos pesados están cargados"""
+        self.marcar("Primera ventana visible")
+        self.modulos_primera_ventana = {nombre: nombre in sys.modules for nombre in MODULOS_PESADOS}
+
+    def informe(self):
+        """Texto con las etapas en orden de tiempo y los módulos pesados cargados al mostrar la ventana"""
+        lineas = ["Perfil de arranque (ms desde el inicio de main.py):"]
+        for etapa, segundos, hilo in sorted(self.marcas, key=lambda marca: marca[1]):
+            origen = "" if hilo == 'MainThread' else f" [{hilo}]"
+            lineas.append(f"  {segundos * 1000:8.1f}  {etapa}{origen}")
+        if self.modulos_primera_ventana is not None:
+            cargados = [nombre for nombre, cargado in self.modulos_primera_ventana.items() if cargado]
+            lineas.append(f"Módulos pesados cargados en la primera ventana: {', '.join(cargados) or 'ninguno'}")
+        return "\n".join(lineas)
+
+
+def precargar_en_segundo_plano(modulos=MODULOS_PRECARGA, perfil=None):
+    """
+    Importa los módulos en un hilo demonio.
+
+    Si una pestaña necesita un módulo mientras se precarga, el bloqueo de
+    importación de Python la hace esperar a que termine, sin importarlo dos
+    veces. Los módulos que no se pueden importar se omiten: la pestaña que
+    los use mostrará el error al abrirse.
+
+    Returns:
+        threading.Thread ya iniciado
+    """
+    def precargar():
+        for nombre in modulos:
+            try:
+                importlib.import_module(nombre)
+            except ImportError:
+                continue
+        if perfil is not None:
+            perfil.marcar("Precarga de módulos completada")
+
+    hilo = threading.Thread(target=precargar, name='precarga', daemon=True)
+    hilo.start()
+    return hilo
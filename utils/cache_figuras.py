@@ -0,0 +1,209 @@
+"""
+Caché de figuras de matplotlib renderizadas
+Universidad de Cundinamarca
+
+Renderiza una vez cada diagrama de las vistas (función que devuelve una
+Figure) a PNG y guarda los bytes en memoria, con un máximo de figuras que
+descarta las menos usadas (LRU), y opcionalmente en disco, de modo que
+volver a una página o abrir de nuevo la aplicación solo decodifica la
+imagen, sin importar matplotlib ni volver a dibujar.
+
+La clave de cada figura incluye la versión de la caché, la página, el nombre
+del diagrama, el tamaño, la resolución, el tema (colores) y un hash del código
+de la función que la dibuja y de las constantes del módulo que usa, así que
+modificar el dibujo invalida su entrada. Los cambios en funciones auxiliares
+no se detectan: al hacerlos hay que incrementar VERSION_CACHE. En disco se
+conservan como mucho max_archivos figuras (se eliminan las menos usadas).
+"""
+
+import hashlib
+import io
+import os
+from collections import OrderedDict
+
+# Carpeta por defecto de las figuras guardadas en disco
+DIRECTORIO_FIGURAS = os.path.join("Cache_datos", "figuras")
+
+# Versión de la caché: incrementarla al cambiar funciones auxiliares de los
+# dibujos o el renderizado, que el hash del código no cubre
+VERSION_CACHE = 1
+
+# Tipos de las constantes de módulo que se incluyen en el hash (colores, tamaños...)
+TIPOS_CONSTANTES = (str, int, float, bool, tuple)
+
+
+def _actualizar_hash(h, codigo, globales):
+    """
+    Añade al hash el bytecode, los nombres y las constantes de un objeto de
+    código (y de los anidados), y el valor de las constantes de módulo que usa
+    """
+    h.update(codigo.co_code)
+    h.update(repr(codigo.co_names).encode('utf-8'))
+    for nombre in codigo.co_names:
+        valor = globales.get(nombre)
+        if isinstance(valor, TIPOS_CONSTANTES):
+            h.update(f"{nombre}={valor!r}".encode('utf-8'))
+    for constante in codigo.co_consts:
+        if hasattr(constante, 'co_code'):
+            _actualizar_hash(h, constante, globales)
+        else:
+            h.update(repr(constante).encode('utf-8'))
+
+
+def hash_funcion(funcion):
+    """Hash SHA-1 del código de una función y de las constantes de módulo que usa"""
+    h = hashlib.sha1()
+    _actualizar_hash(h, funcion.__code__, funcion.__globals__)
+    return h.hexdigest()[:16]
+
+
+class CacheFiguras:
+    """
+    Caché LRU de figuras renderizadas a PNG, en memoria y opcionalmente en disco.
+
+    Uso:
+        cache = CacheFiguras()
+        etiqueta = cache.etiqueta(marco, "arquitectura", "red", dibujar_red, figsize=(5, 5))
+        etiqueta.pack()
+    """
+    def __init__(self, max_figuras=16, directorio=DIRECTORIO_FIGURAS, max_archivos=64):
+        """
+        Args:
+            max_figuras: Número máximo de figuras en memoria (se descartan las menos usadas)
+            directorio: Carpeta donde se guardan las figuras (.png), o None para no usar el disco
+            max_archivos: Número máximo de figuras en disco (se eliminan las menos usadas)
+        """
+        self.max_figuras = max_figuras
+        self.directorio = directorio
+        self.max_archivos = max_archivos
+        self.figuras = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def clave(self, pagina, nombre, dibujar, figsize, dpi, tema=()):
+        """Clave de una figura: versión, página, nombre, tamaño, resolución, tema y código del dibujo"""
+        partes = [f"v{VERSION_CACHE}", pagina, nombre, f"{figsize[0]}x{figsize[1]}", str(dpi), *map(str, tema), hash_funcion(dibujar)]
+        return hashlib.sha1("|".join(partes).encode('utf-8')).hexdigest()[:24]
+
+    def archivo_figura(self, clave):
+        """Ruta en disco de una figura"""
+        return os.path.join(self.directorio, f"{clave}.png")
+
+    def png(self, pagina, nombre, dibujar, figsize=(6, 4), dpi=100, tema=()):
+        """
+        Bytes PNG de una figura, renderizada solo si no está en memoria ni en disco.
+
+        Args:
+            pagina, nombre: Identifican el diagrama dentro de la vista
+            dibujar: Función dibujar(figsize, dpi) que devuelve la Figure de matplotlib
+            figsize, dpi: Tamaño (pulgadas) y resolución con que se dibuja y renderiza
+            tema: Valores del tema (por ejemplo, colores) que cambian el dibujo
+
+        Returns:
+            bytes: Imagen PNG
+        """
+        clave = self.clave(pagina, nombre, dibujar, figsize, dpi, tema)
+        datos = self.figuras.get(clave)
+        if datos is not None:
+            self.figuras.move_to_end(clave)
+            self.aciertos += 1
+            return datos
+
+        datos = self._leer(clave)
+        if datos is None:
+            self.fallos += 1
+            datos = self._renderizar(dibujar, figsize, dpi)
+            self._guardar(clave, datos)
+        else:
+            self.aciertos += 1
+
+        self.figuras[clave] = datos
+        while len(self.figuras) > self.max_figuras:
+            self.figuras.popitem(last=False)
+        return datos
+
+    def imagen(self, pagina, nombre, dibujar, figsize=(6, 4), dpi=100, tema=()):
+        """ImageTk.PhotoImage de una figura (requiere una ventana de Tk creada)"""
+        from PIL import Image, ImageTk
+        datos = self.png(pagina, nombre, dibujar, figsize, dpi, tema)
+        return ImageTk.PhotoImage(Image.open(io.BytesIO(datos)))
+
+    def etiqueta(self, parent, pagina, nombre, dibujar, figsize=(6, 4), dpi=100, tema=(), bg="white"):
+        """tk.Label con la imagen de una figura, en lugar de un lienzo de matplotlib"""
+        import tkinter as tk
+        foto = self.imagen(pagina, nombre, dibujar, figsize, dpi, tema)
+        etiqueta = tk.Label(parent, image=foto, bg=bg, bd=0)
+        etiqueta.image = foto  # Mantener referencia
+        return etiqueta
+
+    def _renderizar(self, dibujar, figsize, dpi):
+        """Dibuja la figura y la renderiza a PNG con el backend Agg, sin ventana"""
+        figura = dibujar(figsize, dpi)
+        buffer = io.BytesIO()
+        figura.savefig(buffer, format='png', dpi=dpi, facecolor=figura.get_facecolor())
+        return buffer.getvalue()
+
+    def _leer(self, clave):
+        """Bytes de una figura guardada en disco, o None si no existe o no se puede leer"""
+        if self.directorio is None:
+            return None
+        archivo = self.archivo_figura(clave)
+        try:
+            with open(archivo, 'rb') as f:
+                datos = f.read()
+            # La fecha de modificación marca el último uso para purgar()
+            os.utime(archivo)
+            return datos
+        except OSError:
+            return None
+
+    def _guardar(self, clave, datos):
+        """Escribe una figura en disco de forma atómica (los errores solo desactivan el guardado)"""
+        if self.directorio is None:
+            return
+        archivo = self.archivo_figura(clave)
+        temporal = archivo + '.tmp'
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(temporal, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, archivo)
+            self.purgar()
+        except OSError as e:
+            print(f"Advertencia: no se pudo guardar la figura en {archivo} ({str(e)})")
+
+    def purgar(self):
+        """Elimina los temporales abandonados y las figuras menos usadas sobre max_archivos"""
+        if self.directorio is None or not os.path.isdir(self.directorio):
+            return
+        figuras = []
+        for nombre in os.listdir(self.directorio):
+            archivo = os.path.join(self.directorio, nombre)
+            if nombre.endswith('.png.tmp'):
+                os.remove(archivo)
+            elif nombre.endswith('.png'):
+                figuras.append((os.path.getmtime(archivo), archivo))
+
+        figuras.sort(reverse=True)
+        for _, archivo in figuras[self.max_archivos:]:
+            os.remove(archivo)
+
+    def limpiar(self, disco=False):
+        """Vacía la memoria y, si disco es True, elimina las figuras guardadas"""
+        self.figuras.clear()
+        if disco and self.directorio is not None and os.path.isdir(self.directorio):
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith('.png'):
+                    os.remove(os.path.join(self.directorio, nombre))
+
+
+# Caché compartida por todas las vistas de la aplicación
+_cache_compartida = None
+
+
+def obtener_cache_figuras():
+    """Caché de figuras compartida por las vistas (se crea la primera vez)"""
+    global _cache_compartida
+    if _cache_compartida is None:
+        _cache_compartida = CacheFiguras()
+    return _cache_compartida
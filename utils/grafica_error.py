@@ -0,0 +1,263 @@
+"""
+Gráfica del error de entrenamiento en vivo
+Universidad de Cundinamarca
+
+GraficaErrorEnVivo dibuja la curva de error (y la de validación, si la hay)
+mientras la red entrena, con una sola figura y una línea por curva que se
+reutilizan en cada entrenamiento. Los puntos nuevos se añaden con set_data
+y solo se redibujan las líneas sobre el fondo guardado (blitting); la
+figura completa solo se redibuja cuando cambian los límites de los ejes,
+que crecen al doble para que eso ocurra pocas veces.
+
+Cada curva se guarda diezmada (DiezmadorMinMax): el mínimo y el máximo de
+cada cubeta de épocas, con un número fijo de cubetas del orden del ancho en
+píxeles del eje, así que la memoria y el tiempo de dibujo no crecen con el
+número de épocas.
+"""
+
+import numpy as np
+
+from utils.ui_components import COLOR_PRIMARY, COLOR_SECONDARY
+
+
+class DiezmadorMinMax:
+    """
+    Mínimo y máximo por cubeta de una serie (x creciente), con memoria fija.
+
+    Las cubetas cubren ancho valores consecutivos de x desde x0; cuando x
+    supera la última cubeta, las cubetas se combinan de dos en dos y el
+    ancho se duplica.
+    """
+    def __init__(self, max_cubetas=1024):
+        self.max_cubetas = max(2, int(max_cubetas))
+        self.minimos = np.empty(self.max_cubetas)
+        self.maximos = np.empty(self.max_cubetas)
+        self.x_minimos = np.empty(self.max_cubetas)
+        self.x_maximos = np.empty(self.max_cubetas)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todos los puntos"""
+        self.minimos.fill(np.inf)
+        self.maximos.fill(-np.inf)
+        self.x_minimos.fill(np.nan)
+        self.x_maximos.fill(np.nan)
+        self.ancho = 1
+        self.x0 = None
+        self.x_ultimo = None
+        self.usadas = 0
+        self.total = 0
+
+    def _compactar(self):
+        """Combina las cubetas de dos en dos y duplica su ancho"""
+        mitad = self.max_cubetas // 2
+        pares = slice(0, 2 * mitad, 2), slice(1, 2 * mitad, 2)
+        for valores, xs, elegir in ((self.minimos, self.x_minimos, np.less_equal),
+                                    (self.maximos, self.x_maximos, np.greater_equal)):
+            primero = elegir(valores[pares[0]], valores[pares[1]])
+            valores[:mitad] = np.where(primero, valores[pares[0]], valores[pares[1]])
+            xs[:mitad] = np.where(primero, xs[pares[0]], xs[pares[1]])
+        if self.max_cubetas % 2:
+            # La última cubeta impar queda sola en la nueva cubeta mitad
+            self.minimos[mitad] = self.minimos[-1]
+            self.maximos[mitad] = self.maximos[-1]
+            self.x_minimos[mitad] = self.x_minimos[-1]
+            self.x_maximos[mitad] = self.x_maximos[-1]
+            mitad += 1
+        self.minimos[mitad:] = np.inf
+        self.maximos[mitad:] = -np.inf
+        self.x_minimos[mitad:] = np.nan
+        self.x_maximos[mitad:] = np.nan
+        self.ancho *= 2
+        self.usadas = (self.usadas + 1) // 2
+
+    def agregar(self, x, y):
+        """Añade puntos (x creciente, posteriores a los ya añadidos); los y NaN se ignoran"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        validos = ~np.isnan(y)
+        x, y = x[validos], y[validos]
+        if len(x) == 0:
+            return
+        if self.x0 is None:
+            self.x0 = x[0]
+
+        while (x[-1] - self.x0) // self.ancho >= self.max_cubetas:
+            self._compactar()
+
+        cubetas = ((x - self.x0) // self.ancho).astype(np.intp)
+        # Tramos de puntos consecutivos en la misma cubeta
+        inicios = np.flatnonzero(np.r_[True, cubetas[1:] != cubetas[:-1]])
+        finales = np.r_[inicios[1:], len(cubetas)]
+        for inicio, final in zip(inicios, finales):
+            cubeta = cubetas[inicio]
+            tramo = y[inicio:final]
+            i_min = inicio + int(np.argmin(tramo))
+            i_max = inicio + int(np.argmax(tramo))
+            if y[i_min] < self.minimos[cubeta]:
+                self.minimos[cubeta] = y[i_min]
+                self.x_minimos[cubeta] = x[i_min]
+            if y[i_max] > self.maximos[cubeta]:
+                self.maximos[cubeta] = y[i_max]
+                self.x_maximos[cubeta] = x[i_max]
+        self.usadas = max(self.usadas, int(cubetas[-1]) + 1)
+        self.x_ultimo = x[-1]
+        self.total += len(x)
+
+    def puntos(self):
+        """
+        Puntos diezmados (x, y) en orden: el mínimo y el máximo de cada cubeta
+        en el orden en que ocurrieron, dos por cubeta como mucho.
+        """
+        usadas = slice(0, self.usadas)
+        x_min, x_max = self.x_minimos[usadas], self.x_maximos[usadas]
+        llenas = ~np.isnan(x_min)
+        x_min, x_max = x_min[llenas], x_max[llenas]
+        y_min, y_max = self.minimos[usadas][llenas], self.maximos[usadas][llenas]
+
+        minimo_primero = x_min <= x_max
+        xs = np.column_stack([np.where(minimo_primero, x_min, x_max), np.where(minimo_primero, x_max, x_min)])
+        ys = np.column_stack([np.where(minimo_primero, y_min, y_max), np.where(minimo_primero, y_max, y_min)])
+        return xs.ravel(), ys.ravel()
+
+    def limites(self):
+        """(última x, y mínimo, y máximo) de los puntos añadidos, o None si no hay puntos"""
+        if self.total == 0:
+            return None
+        usadas = slice(0, self.usadas)
+        return (float(self.x_ultimo), float(np.min(self.minimos[usadas])),
+                float(np.max(self.maximos[usadas])))
+
+
+class GraficaErrorEnVivo:
+    """
+    Gráfica de error que se actualiza durante el entrenamiento.
+
+    Uso:
+        grafica = GraficaErrorEnVivo(marco)
+        grafica.reiniciar()                                         # al iniciar el entrenamiento
+        grafica.agregar(registros['epoca'], registros['error'],
+                        registros['error_validacion'])              # en cada actualización
+        grafica.mostrar(errores, errores_validacion)                # curvas completas de una vez
+    """
+    def __init__(self, parent, titulo="Evolución del Error en Backpropagation", max_cubetas=None):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.titulo = titulo
+        self.figura = Figure(figsize=(6, 4))
+        self.ax = self.figura.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figura, master=parent)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        # Líneas animadas: no forman parte del fondo y se dibujan con blitting
+        self.linea, = self.ax.plot([], [], color=COLOR_PRIMARY, linewidth=2, label='Entrenamiento', animated=True)
+        self.linea_validacion, = self.ax.plot([], [], color=COLOR_SECONDARY, linewidth=2, linestyle='--',
+                                              label='Validación', animated=True)
+        self.configurar_ejes()
+
+        # Una cubeta por píxel del eje (como mínimo 256)
+        if max_cubetas is None:
+            max_cubetas = max(256, int(self.ax.bbox.width))
+        self.diezmador = DiezmadorMinMax(max_cubetas)
+        self.diezmador_validacion = DiezmadorMinMax(max_cubetas)
+
+        self.fondo = None
+        self.canvas.mpl_connect('draw_event', self._al_dibujar)
+        self.reiniciar()
+
+    def configurar_ejes(self):
+        """Título, etiquetas y rejilla del eje (se conservan entre entrenamientos)"""
+        self.ax.set_title(self.titulo, fontsize=12)
+        self.ax.set_xlabel("Épocas", fontsize=10)
+        self.ax.set_ylabel("Error Promedio", fontsize=10)
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+
+    def reiniciar(self):
+        """Borra las curvas para un entrenamiento nuevo"""
+        self.diezmador.reiniciar()
+        self.diezmador_validacion.reiniciar()
+        self.linea.set_data([], [])
+        self.linea_validacion.set_data([], [])
+        leyenda = self.ax.get_legend()
+        if leyenda is not None:
+            leyenda.remove()
+        self.ax.set_xlim(0, 100)
+        self.ax.set_ylim(0, 1)
+        self.eje_y_ajustado = False
+        self.canvas.draw_idle()
+
+    def agregar(self, epocas, errores, errores_validacion=None):
+        """Añade los puntos de un bloque de épocas y actualiza la gráfica"""
+        self.diezmador.agregar(epocas, errores)
+        if errores_validacion is not None:
+            self.diezmador_validacion.agregar(epocas, errores_validacion)
+        self.actualizar()
+
+    def mostrar(self, errores, errores_validacion=None):
+        """
+        Muestra las curvas de error completas.
+
+        Args:
+            errores: Error de entrenamiento de cada época, desde la época 1
+            errores_validacion: Error de validación tras cada época, desde la
+                                época 0 (pesos iniciales), o None sin validación
+        """
+        self.reiniciar()
+        self.diezmador.agregar(np.arange(1, len(errores) + 1), errores)
+        if errores_validacion:
+            self.diezmador_validacion.agregar(np.arange(len(errores_validacion)), errores_validacion)
+        self.actualizar()
+
+    def actualizar(self):
+        """Pasa los puntos diezmados a las líneas y redibuja solo lo necesario"""
+        self.linea.set_data(*self.diezmador.puntos())
+        con_validacion = self.diezmador_validacion.total > 0
+        if con_validacion:
+            self.linea_validacion.set_data(*self.diezmador_validacion.puntos())
+
+        if self._ajustar_ejes(con_validacion) or self.fondo is None:
+            # Cambian los ejes: redibujar todo (_al_dibujar guarda el fondo nuevo)
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.fondo)
+            self._dibujar_lineas()
+            self.canvas.blit(self.ax.bbox)
+
+    def _ajustar_ejes(self, con_validacion):
+        """Amplía los límites de los ejes si los puntos se salen; devuelve True si cambiaron"""
+        limites = [l for l in (self.diezmador.limites(),
+                               self.diezmador_validacion.limites() if con_validacion else None) if l]
+        cambiaron = False
+        if con_validacion and self.ax.get_legend() is None:
+            self.ax.legend(handles=[self.linea, self.linea_validacion], loc='upper right')
+            cambiaron = True
+        if not limites:
+            return cambiaron
+
+        x_max = max(l[0] for l in limites)
+        y_max = max(l[2] for l in limites)
+        _, x_lim = self.ax.get_xlim()
+        _, y_lim = self.ax.get_ylim()
+        if x_max > x_lim:
+            # Duplicar el eje x hasta que quepan las épocas
+            while x_lim < x_max:
+                x_lim *= 2
+            self.ax.set_xlim(0, x_lim)
+            cambiaron = True
+        if y_max > y_lim or not self.eje_y_ajustado:
+            # El eje y se ajusta a los primeros puntos y después solo crece
+            self.ax.set_ylim(0, y_max * 1.1 if y_max > 0 else 1)
+            self.eje_y_ajustado = True
+            cambiaron = True
+        return cambiaron
+
+    def _al_dibujar(self, event):
+        """Guarda el fondo tras un dibujo completo y dibuja encima las líneas animadas"""
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._dibujar_lineas()
+
+    def _dibujar_lineas(self):
+        self.ax.draw_artist(self.linea)
+        if self.diezmador_validacion.total > 0:
+            self.ax.draw_artist(self.linea_validacion)
@@ -5,10 +5,6 @@ Universidad de Cundinamarca
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from PIL import Image, ImageTk
 import os
 import sys
 
@@ -110,12 +106,15 @@ def setup_styles():
 
 def create_graph_figure(figsize=(6, 4), dpi=100):
     """Crea una figura de matplotlib para gráficos"""
-    fig = plt.Figure(figsize=figsize, dpi=dpi)
+    # matplotlib se importa con el primer gráfico, no al arrancar la aplicación
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize, dpi=dpi)
     fig.patch.set_facecolor(COLOR_BG)
     return fig
 
 def embed_matplotlib_plot(parent, figure):
     """Integra un gráfico de matplotlib en un widget de tkinter"""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     canvas = FigureCanvasTkAgg(figure, master=parent)
     canvas_widget = canvas.get_tk_widget()
     canvas.draw()
@@ -223,6 +222,7 @@ def create_header_frame(parent, show_developers=True):
     
     # Intentar cargar el escudo de la universidad
     try:
+        from PIL import Image, ImageTk
         logo_path = obtener_ruta_relativa(os.path.join("utils", "Images", "escudo_udec.png"))
         logo_image = Image.open(logo_path)
         logo_image = logo_image.resize((60, 60), Image.LANCZOS)
@@ -13,12 +13,11 @@ from utils.ui_components import (
     COLOR_BG, COLOR_PRIMARY, COLOR_LIGHT_BG, COLOR_TEXT, 
     COLOR_TEXT_SECONDARY, COLOR_BORDER, COLOR_SECONDARY,
     ModernButton, ToolTip, setup_styles, create_header_frame,
-    embed_matplotlib_plot, create_graph_figure
+    create_graph_figure
 )
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyArrowPatch
-import numpy as np
-from matplotlib.ticker import MaxNLocator
+from utils.cache_figuras import obtener_cache_figuras
+
+# matplotlib y numpy se importan al dibujar cada diagrama, cuando se abre su sección
 
 class BackpropagationInfoView:
     def __init__(self, root):
@@ -26,6 +25,11 @@ class BackpropagationInfoView:
         self.root = root
         self.root.configure(bg=COLOR_BG)
         
+        # Diagrams are rendered once to PNG and reused across pages and launches;
+        # the theme colors are part of each diagram's cache key
+        self.figure_cache = obtener_cache_figuras()
+        self.figure_theme = (COLOR_BG, COLOR_PRIMARY, COLOR_SECONDARY, COLOR_TEXT, COLOR_TEXT_SECONDARY)
+        
         # Set up custom styles for widgets
         self.setup_custom_styles()
         
@@ -225,18 +229,16 @@ class BackpropagationInfoView:
         self.content_container = tk.Frame(self.container, bg=COLOR_BG)
         self.content_container.pack(fill='both', expand=True)
         
-        # Create content frames for each section
-        self.content_frames = {
-            "intro": self.create_intro_content(),
-            "algorithm": self.create_algorithm_content(),
-            "architecture": self.create_architecture_content(),
-            "training": self.create_training_content(),
-            "applications": self.create_applications_content()
+        # Builders for each section; a section (and its diagrams) is only
+        # built the first time it is shown, so startup does not load matplotlib
+        self.content_builders = {
+            "intro": self.create_intro_content,
+            "algorithm": self.create_algorithm_content,
+            "architecture": self.create_architecture_content,
+            "training": self.create_training_content,
+            "applications": self.create_applications_content
         }
-        
-        # Hide all frames initially
-        for frame in self.content_frames.values():
-            frame.pack_forget()
+        self.content_frames = {}
     
     def show_content(self, content_id):
         """Show the selected content and update navigation"""
@@ -252,7 +254,9 @@ class BackpropagationInfoView:
             )
             elements["indicator"].config(bg=COLOR_BG)  # Hide indicator
         
-        # Show selected content
+        # Build the section on first use, then show it
+        if content_id not in self.content_frames:
+            self.content_frames[content_id] = self.content_builders[content_id]()
         self.content_frames[content_id].pack(fill='both', expand=True)
         
         # Update selected navigation button
@@ -454,114 +458,8 @@ Características principales:
         except Exception as e:
             print(f"Error loading image: {e}")
             
-            # Create a professional visualization using matplotlib
-            fig = create_graph_figure(figsize=(6, 4), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            # Create a professional neural network diagram
-            layer_sizes = [4, 5, 5, 3]
-            layer_positions = [1, 2.5, 4, 5.5]
-            
-            # Background styling
-            ax.set_facecolor('white')
-            
-            # Draw nodes with professional styling
-            for i, (size, pos) in enumerate(zip(layer_sizes, layer_positions)):
-                layer_name = ["Entrada", "Oculta 1", "Oculta 2", "Salida"][i]
-                
-                # Add layer label
-                ax.text(pos, -1.2, f"Capa {layer_name}", fontsize=9, ha='center', 
-                       color=COLOR_TEXT_SECONDARY, fontweight='bold')
-                
-                for j in range(size):
-                    y = (j - (size-1)/2) * 0.5
-                    
-                    # Node color based on layer type
-                    if i == 0:  # Input layer
-                        node_color = COLOR_PRIMARY
-                        alpha = 0.8
-                    elif i == len(layer_sizes)-1:  # Output layer
-                        node_color = COLOR_PRIMARY
-                        alpha = 0.8
-                    else:  # Hidden layers
-                        node_color = COLOR_SECONDARY
-                        alpha = 0.7
-                    
-                    # Draw node with subtle gradient effect
-                    circle = plt.Circle((pos, y), 0.15, color=node_color, alpha=alpha)
-                    ax.add_patch(circle)
-                    
-                    # Add subtle border
-                    border = plt.Circle((pos, y), 0.15, fill=False, edgecolor='black', alpha=0.3)
-                    ax.add_patch(border)
-                    
-                    # Add node labels
-                    if i == 0:
-                        ax.text(pos-0.3, y, f"x{j+1}", fontsize=9, ha='right', va='center')
-                    elif i == len(layer_sizes)-1:
-                        ax.text(pos+0.3, y, f"y{j+1}", fontsize=9, ha='left', va='center')
-            
-            # Draw connections between layers with professional styling
-            for i in range(len(layer_sizes)-1):
-                for j in range(layer_sizes[i]):
-                    y1 = (j - (layer_sizes[i]-1)/2) * 0.5
-                    
-                    # Only draw a subset of connections for clarity
-                    connection_subset = np.random.choice(
-                        range(layer_sizes[i+1]), 
-                        size=min(3, layer_sizes[i+1]), 
-                        replace=False
-                    )
-                    
-                    for k in connection_subset:
-                        y2 = (k - (layer_sizes[i+1]-1)/2) * 0.5
-                        ax.plot(
-                            [layer_positions[i], layer_positions[i+1]], 
-                            [y1, y2], 
-                            '-', 
-                            color='gray', 
-                            alpha=0.4,
-                            linewidth=0.8
-                        )
-            
-            # Add backpropagation arrow
-            arrow = FancyArrowPatch(
-                (5.2, -0.8), (1.8, -0.8),
-                arrowstyle='-|>',
-                color=COLOR_PRIMARY,
-                linewidth=2,
-                mutation_scale=15
-            )
-            ax.add_patch(arrow)
-            
-            # Add error text
-            ax.text(3.5, -0.65, "Retropropagación del Error", fontsize=10, 
-                   color=COLOR_PRIMARY, ha='center', fontweight='bold')
-            
-            # Add forward pass arrow
-            forward_arrow = FancyArrowPatch(
-                (1.8, -0.95), (5.2, -0.95),
-                arrowstyle='-|>',
-                color=COLOR_SECONDARY,
-                linewidth=2,
-                mutation_scale=15
-            )
-            ax.add_patch(forward_arrow)
-            
-            # Add forward text
-            ax.text(3.5, -1.1, "Propagación Hacia Adelante", fontsize=10, 
-                   color=COLOR_SECONDARY, ha='center', fontweight='bold')
-            
-            ax.set_xlim(0.5, 6)
-            ax.set_ylim(-1.4, 1.2)
-            ax.axis('off')
-            
-            # Add title
-            ax.set_title("Arquitectura de Red Neuronal con Retropropagación", 
-                        fontsize=12, pad=10, fontweight='bold')
-            
-            # Embed the plot in the frame
-            canvas_widget = embed_matplotlib_plot(right_column, fig)
+            # Rendered once and reused from the figure cache
+            canvas_widget = self.figure_cache.etiqueta(right_column, "intro", "network", self.draw_intro_network, figsize=(6, 4), dpi=100, tema=self.figure_theme)
             canvas_widget.pack(pady=5)
             
             # Add professional caption
@@ -616,6 +514,118 @@ Características principales:
         
         return frame
     
+    def draw_intro_network(self, figsize, dpi):
+        """Draws the neural network diagram shown when the introduction image is missing"""
+        import matplotlib.pyplot as plt
+        import numpy as np
+        from matplotlib.patches import FancyArrowPatch
+        fig = create_graph_figure(figsize=figsize, dpi=dpi)
+        ax = fig.add_subplot(111)
+        
+        # Create a professional neural network diagram
+        layer_sizes = [4, 5, 5, 3]
+        layer_positions = [1, 2.5, 4, 5.5]
+        
+        # Background styling
+        ax.set_facecolor('white')
+        
+        # Draw nodes with professional styling
+        for i, (size, pos) in enumerate(zip(layer_sizes, layer_positions)):
+            layer_name = ["Entrada", "Oculta 1", "Oculta 2", "Salida"][i]
+            
+            # Add layer label
+            ax.text(pos, -1.2, f"Capa {layer_name}", fontsize=9, ha='center', 
+                   color=COLOR_TEXT_SECONDARY, fontweight='bold')
+            
+            for j in range(size):
+                y = (j - (size-1)/2) * 0.5
+                
+                # Node color based on layer type
+                if i == 0:  # Input layer
+                    node_color = COLOR_PRIMARY
+                    alpha = 0.8
+                elif i == len(layer_sizes)-1:  # Output layer
+                    node_color = COLOR_PRIMARY
+                    alpha = 0.8
+                else:  # Hidden layers
+                    node_color = COLOR_SECONDARY
+                    alpha = 0.7
+                
+                # Draw node with subtle gradient effect
+                circle = plt.Circle((pos, y), 0.15, color=node_color, alpha=alpha)
+                ax.add_patch(circle)
+                
+                # Add subtle border
+                border = plt.Circle((pos, y), 0.15, fill=False, edgecolor='black', alpha=0.3)
+                ax.add_patch(border)
+                
+                # Add node labels
+                if i == 0:
+                    ax.text(pos-0.3, y, f"x{j+1}", fontsize=9, ha='right', va='center')
+                elif i == len(layer_sizes)-1:
+                    ax.text(pos+0.3, y, f"y{j+1}", fontsize=9, ha='left', va='center')
+        
+        # Draw connections between layers with professional styling
+        for i in range(len(layer_sizes)-1):
+            for j in range(layer_sizes[i]):
+                y1 = (j - (layer_sizes[i]-1)/2) * 0.5
+                
+                # Only draw a subset of connections for clarity
+                connection_subset = np.random.choice(
+                    range(layer_sizes[i+1]), 
+                    size=min(3, layer_sizes[i+1]), 
+                    replace=False
+                )
+                
+                for k in connection_subset:
+                    y2 = (k - (layer_sizes[i+1]-1)/2) * 0.5
+                    ax.plot(
+                        [layer_positions[i], layer_positions[i+1]], 
+                        [y1, y2], 
+                        '-', 
+                        color='gray', 
+                        alpha=0.4,
+                        linewidth=0.8
+                    )
+        
+        # Add backpropagation arrow
+        arrow = FancyArrowPatch(
+            (5.2, -0.8), (1.8, -0.8),
+            arrowstyle='-|>',
+            color=COLOR_PRIMARY,
+            linewidth=2,
+            mutation_scale=15
+        )
+        ax.add_patch(arrow)
+        
+        # Add error text
+        ax.text(3.5, -0.65, "Retropropagación del Error", fontsize=10, 
+               color=COLOR_PRIMARY, ha='center', fontweight='bold')
+        
+        # Add forward pass arrow
+        forward_arrow = FancyArrowPatch(
+            (1.8, -0.95), (5.2, -0.95),
+            arrowstyle='-|>',
+            color=COLOR_SECONDARY,
+            linewidth=2,
+            mutation_scale=15
+        )
+        ax.add_patch(forward_arrow)
+        
+        # Add forward text
+        ax.text(3.5, -1.1, "Propagación Hacia Adelante", fontsize=10, 
+               color=COLOR_SECONDARY, ha='center', fontweight='bold')
+        
+        ax.set_xlim(0.5, 6)
+        ax.set_ylim(-1.4, 1.2)
+        ax.axis('off')
+        
+        # Add title
+        ax.set_title("Arquitectura de Red Neuronal con Retropropagación", 
+                    fontsize=12, pad=10, fontweight='bold')
+        
+        return fig
+    
     def create_algorithm_content(self):
         """Create algorithm content with professional layout"""
         frame = tk.Frame(self.content_container, bg=COLOR_BG)
@@ -898,48 +908,8 @@ Donde:
         )
         viz_title.pack(anchor="w", pady=(0, 15))
         
-        # Create visualization using matplotlib
-        fig = create_graph_figure(figsize=(8, 4))
-        
-        # Error surface plot
-        ax = fig.add_subplot(111, projection='3d')
-        
-        # Create a more professional error surface
-        x = np.linspace(-2, 2, 30)
-        y = np.linspace(-2, 2, 30)
-        X, Y = np.meshgrid(x, y)
-        Z = 0.5 * (X**2 + 0.5 * Y**2 + 0.5 * np.sin(X*Y))
-        
-        # Plot surface with professional coloring
-        surf = ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8, 
-                              linewidth=0, antialiased=True)
-        
-        # Add contour lines on bottom for clarity
-        cset = ax.contour(X, Y, Z, zdir='z', offset=Z.min(), cmap='viridis', alpha=0.5)
-        
-        # Add a gradient descent path
-        path_x = np.array([1.8, 1.5, 1.0, 0.5, 0.2, 0.0])
-        path_y = np.array([1.5, 1.2, 0.8, 0.4, 0.1, 0.0])
-        path_z = 0.5 * (path_x**2 + 0.5 * path_y**2 + 0.5 * np.sin(path_x*path_y)) + 0.05
-        
-        ax.plot(path_x, path_y, path_z, 'ro-', linewidth=2, markersize=5, 
-               label='Descenso por Gradiente')
-        
-        # Add annotations
-        ax.text(1.8, 1.5, path_z[0] + 0.2, "Inicio", color='red', fontsize=9)
-        ax.text(0.0, 0.0, path_z[-1] + 0.2, "Mínimo", color='red', fontsize=9)
-        
-        # Set labels and title
-        ax.set_xlabel('Peso 1 (w₁)')
-        ax.set_ylabel('Peso 2 (w₂)')
-        ax.set_zlabel('Error (E)')
-        ax.set_title('Superficie de Error y Descenso por Gradiente', pad=10)
-        
-        # Adjust view angle for better visualization
-        ax.view_init(elev=35, azim=-45)
-        
-        # Embed the plot in the frame
-        canvas_widget = embed_matplotlib_plot(viz_frame, fig)
+        # Rendered once and reused from the figure cache
+        canvas_widget = self.figure_cache.etiqueta(viz_frame, "algorithm", "error_surface", self.draw_error_surface, figsize=(8, 4), dpi=100, tema=self.figure_theme)
         canvas_widget.pack(pady=10)
         
         # Add professional caption
@@ -1023,6 +993,50 @@ Mientras no se cumpla criterio de parada:
         
         return frame
     
+    def draw_error_surface(self, figsize, dpi):
+        """Draws the error surface with a gradient descent path"""
+        import numpy as np
+        fig = create_graph_figure(figsize=figsize, dpi=dpi)
+        
+        # Error surface plot
+        ax = fig.add_subplot(111, projection='3d')
+        
+        # Create a more professional error surface
+        x = np.linspace(-2, 2, 30)
+        y = np.linspace(-2, 2, 30)
+        X, Y = np.meshgrid(x, y)
+        Z = 0.5 * (X**2 + 0.5 * Y**2 + 0.5 * np.sin(X*Y))
+        
+        # Plot surface with professional coloring
+        surf = ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8, 
+                              linewidth=0, antialiased=True)
+        
+        # Add contour lines on bottom for clarity
+        cset = ax.contour(X, Y, Z, zdir='z', offset=Z.min(), cmap='viridis', alpha=0.5)
+        
+        # Add a gradient descent path
+        path_x = np.array([1.8, 1.5, 1.0, 0.5, 0.2, 0.0])
+        path_y = np.array([1.5, 1.2, 0.8, 0.4, 0.1, 0.0])
+        path_z = 0.5 * (path_x**2 + 0.5 * path_y**2 + 0.5 * np.sin(path_x*path_y)) + 0.05
+        
+        ax.plot(path_x, path_y, path_z, 'ro-', linewidth=2, markersize=5, 
+               label='Descenso por Gradiente')
+        
+        # Add annotations
+        ax.text(1.8, 1.5, path_z[0] + 0.2, "Inicio", color='red', fontsize=9)
+        ax.text(0.0, 0.0, path_z[-1] + 0.2, "Mínimo", color='red', fontsize=9)
+        
+        # Set labels and title
+        ax.set_xlabel('Peso 1 (w₁)')
+        ax.set_ylabel('Peso 2 (w₂)')
+        ax.set_zlabel('Error (E)')
+        ax.set_title('Superficie de Error y Descenso por Gradiente', pad=10)
+        
+        # Adjust view angle for better visualization
+        ax.view_init(elev=35, azim=-45)
+        
+        return fig
+    
     def create_architecture_content(self):
         """Create architecture content with professional layout"""
         frame = tk.Frame(self.content_container, bg=COLOR_BG)
@@ -1145,88 +1159,8 @@ Cada neurona en la red está conectada a todas las neuronas de la capa siguiente
         right_column = tk.Frame(columns_frame, bg="white")
         right_column.pack(side="right", fill="both", expand=True)
         
-        # Create visualization using matplotlib
-        fig = create_graph_figure(figsize=(5, 5))
-        ax = fig.add_subplot(111)
-        
-        # Create a professional neural network diagram
-        layer_sizes = [4, 6, 5, 3]
-        layer_positions = [1, 2.5, 4, 5.5]
-        layer_names = ["Entrada", "Oculta 1", "Oculta 2", "Salida"]
-        
-        # Background styling
-        ax.set_facecolor('white')
-        
-        # Draw nodes with professional styling
-        for i, (size, pos, name) in enumerate(zip(layer_sizes, layer_positions, layer_names)):
-            # Add layer label
-            ax.text(pos, -1.2, f"Capa {name}", fontsize=10, ha='center', 
-                   color=COLOR_TEXT, fontweight='bold')
-            
-            for j in range(size):
-                y = (j - (size-1)/2) * 0.4
-                
-                # Node color based on layer type
-                if i == 0:  # Input layer
-                    node_color = COLOR_PRIMARY
-                    alpha = 0.8
-                elif i == len(layer_sizes)-1:  # Output layer
-                    node_color = COLOR_PRIMARY
-                    alpha = 0.8
-                else:  # Hidden layers
-                    node_color = COLOR_SECONDARY
-                    alpha = 0.7
-                
-                # Draw node with subtle gradient effect
-                circle = plt.Circle((pos, y), 0.15, color=node_color, alpha=alpha)
-                ax.add_patch(circle)
-                
-                # Add subtle border
-                border = plt.Circle((pos, y), 0.15, fill=False, edgecolor='black', alpha=0.3)
-                ax.add_patch(border)
-                
-                # Add node labels
-                if i == 0:
-                    ax.text(pos-0.3, y, f"x{j+1}", fontsize=9, ha='right', va='center')
-                elif i == len(layer_sizes)-1:
-                    ax.text(pos+0.3, y, f"y{j+1}", fontsize=9, ha='left', va='center')
-        
-        # Draw connections between layers with professional styling
-        for i in range(len(layer_sizes)-1):
-            for j in range(layer_sizes[i]):
-                y1 = (j - (layer_sizes[i]-1)/2) * 0.4
-                
-                # Only draw a subset of connections for clarity
-                connection_subset = np.random.choice(
-                    range(layer_sizes[i+1]), 
-                    size=min(3, layer_sizes[i+1]), 
-                    replace=False
-                )
-                
-                for k in connection_subset:
-                    y2 = (k - (layer_sizes[i+1]-1)/2) * 0.4
-                    ax.plot(
-                        [layer_positions[i], layer_positions[i+1]], 
-                        [y1, y2], 
-                        '-', 
-                        color='gray', 
-                        alpha=0.4,
-                        linewidth=0.8
-                    )
-        
-        # Highlight one path to show weight
-        highlight_path_x = [layer_positions[0], layer_positions[1]]
-        highlight_path_y = [(0 - (layer_sizes[0]-1)/2) * 0.4, (2 - (layer_sizes[1]-1)/2) * 0.4]
-        ax.plot(highlight_path_x, highlight_path_y, '-', color=COLOR_PRIMARY, linewidth=2)
-        ax.text(1.75, -0.1, "w_ji", fontsize=10, color=COLOR_PRIMARY, fontweight='bold')
-        
-        ax.set_xlim(0.5, 6)
-        ax.set_ylim(-1.5, 1.5)
-        ax.set_title("Arquitectura de una Red Neuronal Multicapa", fontsize=12, pad=10, fontweight='bold')
-        ax.axis('off')
-        
-        # Embed the plot in the frame
-        canvas_widget = embed_matplotlib_plot(right_column, fig)
+        # Rendered once and reused from the figure cache
+        canvas_widget = self.figure_cache.etiqueta(right_column, "architecture", "network", self.draw_architecture_network, figsize=(5, 5), dpi=100, tema=self.figure_theme)
         canvas_widget.pack(pady=5)
         
         # Add professional caption
@@ -1272,52 +1206,9 @@ Cada neurona en la red está conectada a todas las neuronas de la capa siguiente
         )
         activation_intro.pack(anchor="w", pady=(0, 15))
         
-        # Create visualization of activation functions
-        fig = create_graph_figure(figsize=(8, 4))
-        
-        # Generate x values
-        x = np.linspace(-5, 5, 100)
-        
-        # Plot multiple activation functions
-        ax1 = fig.add_subplot(121)
-        
-        # Sigmoid
-        sigmoid = 1 / (1 + np.exp(-x))
-        ax1.plot(x, sigmoid, label='Sigmoide', color=COLOR_PRIMARY, linewidth=2)
-        
-        # Tanh
-        tanh = np.tanh(x)
-        ax1.plot(x, tanh, label='Tanh', color=COLOR_SECONDARY, linewidth=2)
-        
-        ax1.grid(True, linestyle='--', alpha=0.7)
-        ax1.legend(loc='upper left')
-        ax1.set_xlabel('x')
-        ax1.set_ylabel('f(x)')
-        ax1.set_title('Funciones Sigmoidales', fontsize=12, pad=10)
-        
-        # ReLU variants
-        ax2 = fig.add_subplot(122)
-        
-        # ReLU
-        relu = np.maximum(0, x)
-        ax2.plot(x, relu, label='ReLU', color='#e60000', linewidth=2)
-        
-        # Leaky ReLU
-        leaky_relu = np.maximum(0.1 * x, x)
-        ax2.plot(x, leaky_relu, label='Leaky ReLU', color='#66ccff', linewidth=2)
-        
-        ax2.grid(True, linestyle='--', alpha=0.7)
-        ax2.legend(loc='upper left')
-        ax2.set_xlabel('x')
-        ax2.set_ylabel('f(x)')
-        ax2.set_title('Funciones ReLU', fontsize=12, pad=10)
-        
-        # Adjust layout
-        fig.tight_layout(pad=3.0)
-        
-        # Embed the plot in the frame
-        canvas_widget = embed_matplotlib_plot(activation_card, fig)
-        canvas_widget.pack(pady=15)
+        # Rendered once and reused from the figure cache
+        canvas_widget = self.figure_cache.etiqueta(activation_card, "architecture", "activations", self.draw_activation_functions, figsize=(8, 4), dpi=100, tema=self.figure_theme)
+        canvas_widget.pack(pady=15)
         
         # Add professional caption
         caption = tk.Label(
@@ -1447,6 +1338,138 @@ Cada neurona en la red está conectada a todas las neuronas de la capa siguiente
         
         return frame
     
+    def draw_architecture_network(self, figsize, dpi):
+        """Draws the multilayer network architecture diagram"""
+        import matplotlib.pyplot as plt
+        import numpy as np
+        fig = create_graph_figure(figsize=figsize, dpi=dpi)
+        ax = fig.add_subplot(111)
+        
+        # Create a professional neural network diagram
+        layer_sizes = [4, 6, 5, 3]
+        layer_positions = [1, 2.5, 4, 5.5]
+        layer_names = ["Entrada", "Oculta 1", "Oculta 2", "Salida"]
+        
+        # Background styling
+        ax.set_facecolor('white')
+        
+        # Draw nodes with professional styling
+        for i, (size, pos, name) in enumerate(zip(layer_sizes, layer_positions, layer_names)):
+            # Add layer label
+            ax.text(pos, -1.2, f"Capa {name}", fontsize=10, ha='center', 
+                   color=COLOR_TEXT, fontweight='bold')
+            
+            for j in range(size):
+                y = (j - (size-1)/2) * 0.4
+                
+                # Node color based on layer type
+                if i == 0:  # Input layer
+                    node_color = COLOR_PRIMARY
+                    alpha = 0.8
+                elif i == len(layer_sizes)-1:  # Output layer
+                    node_color = COLOR_PRIMARY
+                    alpha = 0.8
+                else:  # Hidden layers
+                    node_color = COLOR_SECONDARY
+                    alpha = 0.7
+                
+                # Draw node with subtle gradient effect
+                circle = plt.Circle((pos, y), 0.15, color=node_color, alpha=alpha)
+                ax.add_patch(circle)
+                
+                # Add subtle border
+                border = plt.Circle((pos, y), 0.15, fill=False, edgecolor='black', alpha=0.3)
+                ax.add_patch(border)
+                
+                # Add node labels
+                if i == 0:
+                    ax.text(pos-0.3, y, f"x{j+1}", fontsize=9, ha='right', va='center')
+                elif i == len(layer_sizes)-1:
+                    ax.text(pos+0.3, y, f"y{j+1}", fontsize=9, ha='left', va='center')
+        
+        # Draw connections between layers with professional styling
+        for i in range(len(layer_sizes)-1):
+            for j in range(layer_sizes[i]):
+                y1 = (j - (layer_sizes[i]-1)/2) * 0.4
+                
+                # Only draw a subset of connections for clarity
+                connection_subset = np.random.choice(
+                    range(layer_sizes[i+1]), 
+                    size=min(3, layer_sizes[i+1]), 
+                    replace=False
+                )
+                
+                for k in connection_subset:
+                    y2 = (k - (layer_sizes[i+1]-1)/2) * 0.4
+                    ax.plot(
+                        [layer_positions[i], layer_positions[i+1]], 
+                        [y1, y2], 
+                        '-', 
+                        color='gray', 
+                        alpha=0.4,
+                        linewidth=0.8
+                    )
+        
+        # Highlight one path to show weight
+        highlight_path_x = [layer_positions[0], layer_positions[1]]
+        highlight_path_y = [(0 - (layer_sizes[0]-1)/2) * 0.4, (2 - (layer_sizes[1]-1)/2) * 0.4]
+        ax.plot(highlight_path_x, highlight_path_y, '-', color=COLOR_PRIMARY, linewidth=2)
+        ax.text(1.75, -0.1, "w_ji", fontsize=10, color=COLOR_PRIMARY, fontweight='bold')
+        
+        ax.set_xlim(0.5, 6)
+        ax.set_ylim(-1.5, 1.5)
+        ax.set_title("Arquitectura de una Red Neuronal Multicapa", fontsize=12, pad=10, fontweight='bold')
+        ax.axis('off')
+        
+        return fig
+    
+    def draw_activation_functions(self, figsize, dpi):
+        """Draws the common activation functions"""
+        import numpy as np
+        fig = create_graph_figure(figsize=figsize, dpi=dpi)
+        
+        # Generate x values
+        x = np.linspace(-5, 5, 100)
+        
+        # Plot multiple activation functions
+        ax1 = fig.add_subplot(121)
+        
+        # Sigmoid
+        sigmoid = 1 / (1 + np.exp(-x))
+        ax1.plot(x, sigmoid, label='Sigmoide', color=COLOR_PRIMARY, linewidth=2)
+        
+        # Tanh
+        tanh = np.tanh(x)
+        ax1.plot(x, tanh, label='Tanh', color=COLOR_SECONDARY, linewidth=2)
+        
+        ax1.grid(True, linestyle='--', alpha=0.7)
+        ax1.legend(loc='upper left')
+        ax1.set_xlabel('x')
+        ax1.set_ylabel('f(x)')
+        ax1.set_title('Funciones Sigmoidales', fontsize=12, pad=10)
+        
+        # ReLU variants
+        ax2 = fig.add_subplot(122)
+        
+        # ReLU
+        relu = np.maximum(0, x)
+        ax2.plot(x, relu, label='ReLU', color='#e60000', linewidth=2)
+        
+        # Leaky ReLU
+        leaky_relu = np.maximum(0.1 * x, x)
+        ax2.plot(x, leaky_relu, label='Leaky ReLU', color='#66ccff', linewidth=2)
+        
+        ax2.grid(True, linestyle='--', alpha=0.7)
+        ax2.legend(loc='upper left')
+        ax2.set_xlabel('x')
+        ax2.set_ylabel('f(x)')
+        ax2.set_title('Funciones ReLU', fontsize=12, pad=10)
+        
+        # Adjust layout
+        fig.tight_layout(pad=3.0)
+        
+        return fig
+    
     def create_training_content(self):
         """Create training process content with professional layout"""
         frame = tk.Frame(self.content_container, bg=COLOR_BG)
@@ -1713,62 +1736,8 @@ El proceso iterativo permite que la red refine gradualmente sus pesos para minim
         )
         viz_title.pack(anchor="w", pady=(0, 15))
         
-        # Create visualization using matplotlib
-        fig = create_graph_figure(figsize=(8, 4))
-        
-        # Error curve
-        ax1 = fig.add_subplot(121)
-        epochs = np.arange(1, 101)
-        
-        # Training error
-        train_error = 1.0 / (1 + 0.05 * epochs) + 0.1 * np.exp(-0.1 * epochs) * np.sin(0.5 * epochs)
-        ax1.plot(epochs, train_error, color=COLOR_PRIMARY, linewidth=2, label='Entrenamiento')
-        
-        # Validation error
-        val_error = train_error + 0.1 + 0.05 * np.random.randn(len(epochs))
-        val_error = np.maximum(val_error, train_error)  # Validation error >= training error
-        ax1.plot(epochs, val_error, color=COLOR_SECONDARY, linewidth=2, linestyle='--', label='Validación')
-        
-        # Highlight overfitting region
-        overfitting_start = 70
-        ax1.axvspan(overfitting_start, 100, alpha=0.2, color='red')
-        ax1.text(85, 0.5, "Sobreajuste", color='red', fontsize=9, ha='center')
-        
-        ax1.set_xlabel('Épocas')
-        ax1.set_ylabel('Error')
-        ax1.set_title('Curva de Error Durante el Entrenamiento')
-        ax1.grid(True, linestyle='--', alpha=0.7)
-        ax1.legend()
-        
-        # Learning rate effect
-        ax2 = fig.add_subplot(122)
-        
-        # Generate data for different learning rates
-        x = np.linspace(0, 10, 100)
-        
-        # Too small learning rate
-        small_lr = 2 - 1.8 * np.exp(-0.1 * x)
-        ax2.plot(x, small_lr, label='α muy pequeña', color='blue', linewidth=2)
-        
-        # Good learning rate
-        good_lr = 2 - 1.8 * np.exp(-0.3 * x)
-        ax2.plot(x, good_lr, label='α óptima', color=COLOR_PRIMARY, linewidth=2)
-        
-        # Too large learning rate
-        large_lr = 2 - 1.8 * np.exp(-0.5 * x) + 0.2 * np.sin(x)
-        ax2.plot(x, large_lr, label='α muy grande', color='red', linewidth=2)
-        
-        ax2.set_xlabel('Iteraciones')
-        ax2.set_ylabel('Error')
-        ax2.set_title('Efecto de la Tasa de Aprendizaje')
-        ax2.grid(True, linestyle='--', alpha=0.7)
-        ax2.legend()
-        
-        # Adjust layout
-        fig.tight_layout()
-        
-        # Embed the plot in the frame
-        canvas_widget = embed_matplotlib_plot(viz_card, fig)
+        # Rendered once and reused from the figure cache
+        canvas_widget = self.figure_cache.etiqueta(viz_card, "training", "curves", self.draw_training_curves, figsize=(8, 4), dpi=100, tema=self.figure_theme)
         canvas_widget.pack(pady=10)
         
         # Add professional caption
@@ -1949,6 +1918,64 @@ donde β es el coeficiente de momentum (típicamente 0.9)."""
         
         return frame
     
+    def draw_training_curves(self, figsize, dpi):
+        """Draws the training error curves and the effect of the learning rate"""
+        import numpy as np
+        fig = create_graph_figure(figsize=figsize, dpi=dpi)
+        
+        # Error curve
+        ax1 = fig.add_subplot(121)
+        epochs = np.arange(1, 101)
+        
+        # Training error
+        train_error = 1.0 / (1 + 0.05 * epochs) + 0.1 * np.exp(-0.1 * epochs) * np.sin(0.5 * epochs)
+        ax1.plot(epochs, train_error, color=COLOR_PRIMARY, linewidth=2, label='Entrenamiento')
+        
+        # Validation error
+        val_error = train_error + 0.1 + 0.05 * np.random.randn(len(epochs))
+        val_error = np.maximum(val_error, train_error)  # Validation error >= training error
+        ax1.plot(epochs, val_error, color=COLOR_SECONDARY, linewidth=2, linestyle='--', label='Validación')
+        
+        # Highlight overfitting region
+        overfitting_start = 70
+        ax1.axvspan(overfitting_start, 100, alpha=0.2, color='red')
+        ax1.text(85, 0.5, "Sobreajuste", color='red', fontsize=9, ha='center')
+        
+        ax1.set_xlabel('Épocas')
+        ax1.set_ylabel('Error')
+        ax1.set_title('Curva de Error Durante el Entrenamiento')
+        ax1.grid(True, linestyle='--', alpha=0.7)
+        ax1.legend()
+        
+        # Learning rate effect
+        ax2 = fig.add_subplot(122)
+        
+        # Generate data for different learning rates
+        x = np.linspace(0, 10, 100)
+        
+        # Too small learning rate
+        small_lr = 2 - 1.8 * np.exp(-0.1 * x)
+        ax2.plot(x, small_lr, label='α muy pequeña', color='blue', linewidth=2)
+        
+        # Good learning rate
+        good_lr = 2 - 1.8 * np.exp(-0.3 * x)
+        ax2.plot(x, good_lr, label='α óptima', color=COLOR_PRIMARY, linewidth=2)
+        
+        # Too large learning rate
+        large_lr = 2 - 1.8 * np.exp(-0.5 * x) + 0.2 * np.sin(x)
+        ax2.plot(x, large_lr, label='α muy grande', color='red', linewidth=2)
+        
+        ax2.set_xlabel('Iteraciones')
+        ax2.set_ylabel('Error')
+        ax2.set_title('Efecto de la Tasa de Aprendizaje')
+        ax2.grid(True, linestyle='--', alpha=0.7)
+        ax2.legend()
+        
+        # Adjust layout
+        fig.tight_layout()
+        
+        return fig
+    
     def create_applications_content(self):
         """Create applications content with professional layout"""
         frame = tk.Frame(self.content_container, bg=COLOR_BG)
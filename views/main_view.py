@@ -5,12 +5,13 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 import numpy as np
 from PIL import Image, ImageTk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
 import sys
 import time
 from models.backpropagation import RedBP
+from models.data_processor import parse_numeric_lists, invalid_lines, parse_hidden_layers
+from models.telemetria import Telemetria
+from utils.grafica_error import GraficaErrorEnVivo
 from utils.ui_components import *
 
 class MainView:
@@ -32,6 +33,10 @@ class MainView:
         self.fig_error = None
         self.img_tk = None  # Para mantener referencia a la imagen
         self.entrenamiento_en_progreso = False  # Flag para controlar el entrenamiento
+        self.entrenamiento_completado = False
+        # Registros por época que escribe el hilo de entrenamiento y lee la interfaz
+        self.telemetria = Telemetria()
+        self.grafica_error = None  # Gráfica en vivo, se crea al primer entrenamiento
 
         self.create_main_interface()
         self.style = self.setup_styles()
@@ -136,6 +141,23 @@ class MainView:
         ttk.Label(param_grid, text="Beta (β):").grid(row=2, column=2, sticky="w", padx=5, pady=2)
         self.beta_input = ttk.Entry(param_grid, width=8, state='disabled')
         self.beta_input.grid(row=2, column=3, sticky="w", padx=5, pady=2)
+        
+        ttk.Label(param_grid, text="Optimizador:").grid(row=3, column=0, sticky="w", padx=5, pady=2)
+        self.optimizador_combo = ttk.Combobox(param_grid, 
+                                    values=['SGD', 'Momentum', 'Nesterov', 'RMSProp', 'Adam'], 
+                                    state='readonly',
+                                    width=10)
+        self.optimizador_combo.current(0)
+        self.optimizador_combo.grid(row=3, column=1, columnspan=2, sticky="w", padx=5, pady=2)
+        self.optimizador_combo.bind("<<ComboboxSelected>>", self.toggle_momentum)
+        
+        ttk.Label(param_grid, text="Tasa (α):").grid(row=4, column=0, sticky="w", padx=5, pady=2)
+        self.planificador_combo = ttk.Combobox(param_grid, 
+                                    values=['Constante', 'Escalonada', 'Exponencial', 'Coseno', 'Meseta'], 
+                                    state='readonly',
+                                    width=10)
+        self.planificador_combo.current(0)
+        self.planificador_combo.grid(row=4, column=1, columnspan=2, sticky="w", padx=5, pady=2)
 
         # ========== FUNCIONES DE ACTIVACIÓN ==========
         activ_frame = ttk.LabelFrame(config_frame, text="Funciones de Activación")
@@ -284,9 +306,9 @@ class MainView:
         else:
             self.beta_oculta_input.config(state='disabled')
 
-    def toggle_momentum(self):
-        """Habilita o deshabilita el campo beta de momentum"""
-        if self.momentum_check.instate(['selected']):
+    def toggle_momentum(self, event=None):
+        """Habilita o deshabilita el campo beta de momentum (casilla de momentum, o optimizador Momentum o Nesterov)"""
+        if self.momentum_check.instate(['selected']) or self.optimizador_combo.get() in ('Momentum', 'Nesterov'):
             self.beta_input.config(state='normal')
         else:
             self.beta_input.config(state='disabled')
@@ -321,7 +343,7 @@ class MainView:
         try:
             # Obtener valores de la arquitectura
             capa_entrada = int(self.entrada_input.get())
-            capa_oculta = int(self.oculta_input.get())
+            capa_oculta = parse_hidden_layers(self.oculta_input.get())
             capa_salida = int(self.salida_input.get())
             
             # Obtener valores de los parámetros de entrenamiento
@@ -339,12 +361,14 @@ class MainView:
             # Obtener beta para Leaky ReLU si es necesario
             beta_leaky_relu = float(self.beta_oculta_input.get())
             
-            # Obtener valor de momentum si está habilitado
-            momentum = False
+            # Obtener el optimizador y el valor de momentum si está habilitado
+            optimizador = self.optimizador_combo.get().lower()
+            momentum = self.momentum_check.instate(['selected'])
             beta = 0.0
-            if self.momentum_check.instate(['selected']):
-                momentum = True
+            if momentum or optimizador in ('momentum', 'nesterov'):
                 beta = float(self.beta_input.get())
+            if momentum and optimizador == 'sgd':
+                optimizador = 'momentum'
         
             # Crear diccionario de configuración
             config = {
@@ -358,7 +382,9 @@ class MainView:
                 'funciones_activacion': [func_oculta, func_salida],
                 'beta_leaky_relu': beta_leaky_relu,
                 'momentum': momentum,
-                'beta': beta
+                'beta': beta,
+                'optimizador': optimizador,
+                'planificador': self.planificador_combo.get().lower()
             }
         
             return config
@@ -956,9 +982,17 @@ class MainView:
         archivo = filedialog.askopenfilename(filetypes=[("Archivos TXT", "*.txt")])
         if archivo:
             try:
-                # Cargar patrones de prueba
+                # Cargar patrones de prueba (una lista numérica por línea)
                 with open(archivo, 'r') as f:
-                    self.datos_prueba = [np.array(eval(line)) for line in f]
+                    lineas = f.readlines()
+                self.datos_prueba, validas = parse_numeric_lists(lineas)
+                
+                # Verificar que todas las líneas sean listas numéricas del mismo tamaño
+                invalidas = invalid_lines(lineas, validas)
+                if invalidas:
+                    print(f"Error: Patrones con formato inválido o tamaños diferentes en las líneas: {invalidas[:20]}")
+                    self.datos_prueba = None
+                    return
                 
                 if len(self.datos_prueba) > 0:
                     # Verificar que los patrones tengan el tamaño correcto (5x7 = 35)
@@ -991,22 +1025,21 @@ class MainView:
         if archivo:
             try:
                 with open(archivo, 'r') as f:
-                    datos = []
-                    for line in f:
-                        # Convertir a array numpy y verificar consistencia
-                        arr = np.array(eval(line.strip()))
-                        if not isinstance(arr, np.ndarray):
-                            raise ValueError("Formato de entrada inválido")
-                        datos.append(arr)
+                    lineas = f.readlines()
+                
+                # Convertir todas las líneas a una matriz numpy de una vez
+                datos, validas = parse_numeric_lists(lineas)
+                
+                # Verificar que todas sean listas numéricas de la misma longitud
+                invalidas = invalid_lines(lineas, validas)
+                if invalidas:
+                    print(f"Error: Entradas con formato inválido o tamaños diferentes en las líneas: {invalidas[:20]}")
+                    return
+                if len(datos) == 0:
+                    raise ValueError("Archivo de entrada vacío")
                     
-                    # Verificar que todos tengan la misma longitud
-                    longitudes = [len(x) for x in datos]
-                    if len(set(longitudes)) != 1:
-                        print("Error: Entradas con tamaños diferentes")
-                        return
-                        
-                    self.datos_entrenamiento = datos
-                    print(f"Cargadas {len(datos)} entradas válidas")
+                self.datos_entrenamiento = datos
+                print(f"Cargadas {len(datos)} entradas válidas")
                     
             except Exception as e:
                 print(f"Error: {str(e)}")
@@ -1076,12 +1109,20 @@ class MainView:
             print(f"- Funciones de activación: {config['funciones_activacion'][0]} (oculta), {config['funciones_activacion'][1]} (salida)")
             if 'leaky relu' in config['funciones_activacion']:
                 print(f"- Beta Leaky ReLU: {float(config['beta_leaky_relu'])}")
-            if config['momentum']:
+            print(f"- Optimizador: {config['optimizador']}")
+            print(f"- Tasa de aprendizaje: {config['planificador']}")
+            if config['optimizador'] in ('momentum', 'nesterov'):
                 print(f"- Momentum habilitado con Beta: {float(config['beta'])}")
 
             # Crear red neuronal
             self.red = RedBP(config)
             
+            # Reiniciar la telemetría antes de iniciar el hilo
+            patrones = len(self.datos_entrenamiento)
+            self.telemetria.iniciar(self.red.max_epocas, patrones - self.red.patrones_validacion(patrones))
+            self.reiniciar_grafica_error()
+            self.entrenamiento_completado = False
+            
             # Iniciar entrenamiento en un hilo separado para no bloquear la interfaz
             import threading
             self.thread_entrenamiento = threading.Thread(target=self.ejecutar_entrenamiento)
@@ -1099,21 +1140,20 @@ class MainView:
             print(traceback.format_exc())
             
     def ejecutar_entrenamiento(self):
-        """Ejecuta el entrenamiento en un hilo separado"""
+        """
+        Ejecuta el entrenamiento en un hilo separado. El hilo no toca los widgets:
+        cada época se registra en self.telemetria, que lee actualizar_progreso_entrenamiento.
+        """
         try:
             # Entrenar y obtener errores
             print("Iniciando entrenamiento con backpropagation...")
-            
-            # Modificar la clase RedBP para que acepte una función de callback
-            # que actualice el progreso del entrenamiento
             self.errores_entrenamiento = []
-            self.epoca_actual = 0
-            self.max_epocas = int(self.max_epocas_input.get())
             
-            # Entrenar la red
+            # Entrenar la red registrando cada época en la telemetría
             self.errores_entrenamiento = self.red.entrenar(
                 np.array(self.datos_entrenamiento),
-                np.array(self.datos_salida)
+                np.array(self.datos_salida),
+                callback=self.telemetria.registrar_epoca
             )
             
             # Guardar pesos automáticamente
@@ -1135,10 +1175,25 @@ class MainView:
             self.entrenamiento_en_progreso = False
             
     def actualizar_progreso_entrenamiento(self):
-        """Actualiza la interfaz durante el entrenamiento"""
-        if not self.entrenamiento_en_progreso:
+        """Actualiza la interfaz durante el entrenamiento con los registros nuevos de la telemetría"""
+        # Leer la bandera antes de drenar, para no perder los últimos registros
+        en_progreso = self.entrenamiento_en_progreso
+        registros = self.telemetria.drenar()
+        if len(registros):
+            # Añadir los puntos nuevos a la gráfica en vivo
+            self.actualizar_grafica_error(registros)
+            
+            # Mostrar en el log las épocas múltiplos de 100
+            max_epocas = self.telemetria.max_epocas
+            for registro in registros[registros['epoca'] % 100 == 0]:
+                epoca = int(registro['epoca'])
+                progreso = min(100, int(epoca * 100 / max_epocas)) if max_epocas > 0 else 0
+                print(f"Entrenando... Época {epoca}/{max_epocas} ({progreso}%), error: {float(registro['error']):.6f}, "
+                      f"{float(registro['muestras_por_segundo']):.0f} patrones/s")
+        
+        if not en_progreso:
             # El entrenamiento ha terminado
-            if hasattr(self, 'entrenamiento_completado') and self.entrenamiento_completado:
+            if self.entrenamiento_completado:
                 # Actualizar estado de entrenamiento
                 self.status_label.config(text="Estado: Entrenado Exitosamente", foreground="green")
                 self.status_indicator.delete("all")
@@ -1149,7 +1204,7 @@ class MainView:
                 self.error_value.config(text=f"{float(self.errores_entrenamiento[-1]):.6f}")
                 
                 # Mostrar gráfica
-                self.graficar_errores(self.errores_entrenamiento)
+                self.graficar_errores(self.errores_entrenamiento, self.red.errores_validacion)
                 print(f"Entrenamiento completado exitosamente en {len(self.errores_entrenamiento)} épocas")
                 print(f"Pesos guardados automáticamente en: {self.pesos_archivo}")
                 
@@ -1164,57 +1219,39 @@ class MainView:
             self.btn_entrenar.config(state='normal')
             return
             
-        # Obtener progreso actual
-        if hasattr(self.red, 'epoca_actual') and hasattr(self.red, 'max_epocas'):
-            epoca_actual = self.red.epoca_actual
-            max_epocas = self.red.max_epocas
-            
-            # Calcular porcentaje de progreso
-            if max_epocas > 0:
-                progreso = min(100, int((epoca_actual / max_epocas) * 100))
-                
-                # Actualizar barra de progreso
-                self.progress_bar['value'] = progreso
-                self.progress_label.config(text=f"{progreso}%")
-                
-                # Actualizar también según el error objetivo si está disponible
-                if hasattr(self.red, 'error_actual') and hasattr(self.red, 'precision_objetivo'):
-                    error_actual = self.red.error_actual
-                    precision_objetivo = self.red.precision_objetivo
-                    
-                    # Calcular progreso basado en el error (inverso)
-                    if error_actual > 0 and precision_objetivo > 0:
-                        # Calcular qué tan cerca estamos del error objetivo
-                        progreso_error = min(100, max(0, int((1 - error_actual/self.red.error_inicial) * 100)))
-                        # Usar el mayor de los dos progresos para la barra
-                        progreso = max(progreso, progreso_error)
-                        self.progress_bar['value'] = progreso
-                        self.progress_label.config(text=f"{progreso}% (Error: {error_actual:.6f})")
-                
-                # Actualizar log cada 100 épocas
-                if epoca_actual % 100 == 0 and epoca_actual > 0:
-                    print(f"Entrenando... Época {epoca_actual}/{max_epocas} ({progreso}%)")
+        # Actualizar barra de progreso con el último registro
+        ultimo = self.telemetria.ultimo()
+        if ultimo is not None:
+            progreso = self.telemetria.progreso
+            self.progress_bar['value'] = progreso
+            self.progress_label.config(text=f"{progreso}% (Error: {float(ultimo['error']):.6f})")
         
         # Programar la próxima actualización
         self.root.after(100, self.actualizar_progreso_entrenamiento)
 
-    def graficar_errores(self, errores):
-        # Limpiar frame anterior
-        for widget in self.error_graph_frame.winfo_children():
-            widget.destroy()
+    def obtener_grafica_error(self):
+        """Gráfica de error en vivo, creada la primera vez en lugar del mensaje inicial"""
+        if self.grafica_error is None:
+            # Limpiar mensaje inicial
+            for widget in self.error_graph_frame.winfo_children():
+                widget.destroy()
+            
+            self.grafica_error = GraficaErrorEnVivo(self.error_graph_frame)
+            self.fig_error = self.grafica_error.figura
+            self.canvas_error = self.grafica_error.canvas
+        return self.grafica_error
+
+    def reiniciar_grafica_error(self):
+        """Vacía la gráfica de error al iniciar un entrenamiento"""
+        self.obtener_grafica_error().reiniciar()
 
-        # Crear figura
-        self.fig_error = plt.figure(figsize=(6, 4))
-        plt.plot(errores, color='#004d25', linewidth=2)
-        plt.title("Evolución del Error en Backpropagation", fontsize=12)
-        plt.xlabel("Épocas", fontsize=10)
-        plt.ylabel("Error Promedio", fontsize=10)
-        plt.grid(True, linestyle='--', alpha=0.7)
+    def actualizar_grafica_error(self, registros):
+        """Añade a la gráfica los registros nuevos de la telemetría del entrenamiento"""
+        self.obtener_grafica_error().agregar(registros['epoca'], registros['error'], registros['error_validacion'])
 
-        # Integrar gráfica en Tkinter
-        self.canvas_error = FigureCanvasTkAgg(self.fig_error, master=self.error_graph_frame)
-        self.canvas_error.draw()
-        self.canvas_error.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    def graficar_errores(self, errores, errores_validacion=None):
+        # Redibujar las curvas completas en la misma figura (diezmadas a la resolución del eje)
+        self.obtener_grafica_error().mostrar(errores, errores_validacion)
 
     def guardar_pesos(self):
         if self.red is None:
@@ -1223,7 +1260,7 @@ class MainView:
             
         archivo = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json")])
+            filetypes=[("JSON files", "*.json"), ("NPZ files", "*.npz")])
         
         if archivo:
             try:
@@ -1234,8 +1271,10 @@ class MainView:
                 print(f"Error guardando pesos: {str(e)}")
 
     def cargar_pesos(self):
-        """Carga los pesos desde un archivo JSON"""
-        archivo = filedialog.askopenfilename(filetypes=[("Archivos JSON", "*.json")])
+        """Carga los pesos desde un archivo JSON o binario (.npz)"""
+        archivo = filedialog.askopenfilename(filetypes=[("Archivos de pesos", "*.json *.npz"),
+                                                        ("Archivos JSON", "*.json"),
+                                                        ("Archivos NPZ", "*.npz")])
         if archivo:
             try:
                 # Crear una instancia de la red si no existe
@@ -5,8 +5,8 @@ import sys
 from PIL import Image, ImageTk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
 
+from utils.grafica_error import GraficaErrorEnVivo
 from utils.ui_components_images import ModernButton, setup_styles, COLOR_BG, COLOR_PRIMARY, COLOR_PRIMARY_LIGHT, COLOR_LIGHT_BG, COLOR_BORDER, COLOR_TEXT, COLOR_TEXT_SECONDARY
 
 class MainView:
@@ -18,6 +18,7 @@ class MainView:
         self.img_tk = None  # Para mantener referencia a la imagen
         self.canvas_error = None
         self.fig_error = None
+        self.grafica_error = None  # Gráfica en vivo, se crea al primer entrenamiento
         self.confusion_matrix_frame = None
         self.error_graph_frame = None
         self.color_percentages = {}  # Para almacenar las etiquetas de porcentajes de colores
@@ -428,6 +429,34 @@ class MainView:
         ttk.Label(param_grid, text="Beta (β):").grid(row=2, column=2, sticky="w", padx=5, pady=2)
         self.beta_input = ttk.Entry(param_grid, width=8, state='disabled')
         self.beta_input.grid(row=2, column=3, sticky="w", padx=5, pady=2)
+        
+        # Parada temprana
+        ttk.Label(param_grid, text="Validación (%):").grid(row=3, column=0, sticky="w", padx=5, pady=2)
+        self.validacion_input = ttk.Entry(param_grid, width=8)
+        self.validacion_input.insert(0, "0")
+        self.validacion_input.grid(row=3, column=1, sticky="w", padx=5, pady=2)
+        
+        ttk.Label(param_grid, text="Paciencia:").grid(row=3, column=2, sticky="w", padx=5, pady=2)
+        self.paciencia_input = ttk.Entry(param_grid, width=8)
+        self.paciencia_input.insert(0, "0")
+        self.paciencia_input.grid(row=3, column=3, sticky="w", padx=5, pady=2)
+        
+        ttk.Label(param_grid, text="Optimizador:").grid(row=4, column=0, sticky="w", padx=5, pady=2)
+        self.optimizador_combo = ttk.Combobox(param_grid, 
+                                    values=['SGD', 'Momentum', 'Nesterov', 'RMSProp', 'Adam'], 
+                                    state='readonly',
+                                    width=10)
+        self.optimizador_combo.current(0)
+        self.optimizador_combo.grid(row=4, column=1, columnspan=2, sticky="w", padx=5, pady=2)
+        self.optimizador_combo.bind("<<ComboboxSelected>>", self.toggle_momentum)
+        
+        ttk.Label(param_grid, text="Tasa (α):").grid(row=5, column=0, sticky="w", padx=5, pady=2)
+        self.planificador_combo = ttk.Combobox(param_grid, 
+                                    values=['Constante', 'Escalonada', 'Exponencial', 'Coseno', 'Meseta'], 
+                                    state='readonly',
+                                    width=10)
+        self.planificador_combo.current(0)
+        self.planificador_combo.grid(row=5, column=1, columnspan=2, sticky="w", padx=5, pady=2)
 
         # ========== FUNCIONES DE ACTIVACIÓN ==========
         activ_frame = ttk.LabelFrame(config_frame, text="Funciones de Activación")
@@ -900,9 +929,9 @@ class MainView:
     def log(self, mensaje):
         print(mensaje)
         
-    def toggle_momentum(self):
-        """Habilita o deshabilita el campo beta de momentum"""
-        if self.momentum_var.get():
+    def toggle_momentum(self, event=None):
+        """Habilita o deshabilita el campo beta de momentum (casilla de momentum, o optimizador Momentum o Nesterov)"""
+        if self.momentum_var.get() or self.optimizador_combo.get() in ('Momentum', 'Nesterov'):
             self.beta_input.config(state='normal')
         else:
             self.beta_input.config(state='disabled')
@@ -1039,8 +1068,21 @@ class MainView:
         
         # Crear figura para la matriz de confusión
         fig_cm = plt.figure(figsize=(6, 5), constrained_layout=True)
-        disp = ConfusionMatrixDisplay(confusion_matrix=cm, display_labels=labels)
-        disp.plot(cmap=plt.cm.Greens, ax=fig_cm.add_subplot(111))
+        ax = fig_cm.add_subplot(111)
+        imagen = ax.imshow(cm, interpolation='nearest', cmap=plt.cm.Greens)
+        fig_cm.colorbar(imagen, ax=ax)
+        
+        # Conteos sobre cada celda, en blanco sobre las celdas oscuras
+        umbral_color = (cm.max() + cm.min()) / 2.0
+        for i in range(cm.shape[0]):
+            for j in range(cm.shape[1]):
+                ax.text(j, i, format(cm[i, j], 'd'), ha="center", va="center",
+                        color="white" if cm[i, j] > umbral_color else "black")
+        
+        ax.set_xticks(range(len(labels)), labels=labels)
+        ax.set_yticks(range(len(labels)), labels=labels)
+        ax.set_xlabel("Clase predicha")
+        ax.set_ylabel("Clase real")
         plt.title("Matriz de Confusión del Entrenamiento")
         
         # Crear un frame intermedio para centrar el canvas
@@ -1057,23 +1099,29 @@ class MainView:
         # Ajustar la figura al redimensionar (si tienes implementada esa función)
         self.bind_figure_resize(canvas_cm, fig_cm)
 
-    def mostrar_grafica_error(self, errores):
-        # Limpiar frame anterior
-        for widget in self.error_graph_frame.winfo_children():
-            widget.destroy()
+    def obtener_grafica_error(self):
+        """Gráfica de error en vivo, creada la primera vez en lugar del mensaje inicial"""
+        if self.grafica_error is None:
+            # Limpiar mensaje inicial
+            for widget in self.error_graph_frame.winfo_children():
+                widget.destroy()
 
-        # Crear figura
-        self.fig_error = plt.figure(figsize=(6, 4))
-        plt.plot(errores, color='#004d25', linewidth=2)
-        plt.title("Evolución del Error en Backpropagation", fontsize=12)
-        plt.xlabel("Épocas", fontsize=10)
-        plt.ylabel("Error Promedio", fontsize=10)
-        plt.grid(True, linestyle='--', alpha=0.7)
+            self.grafica_error = GraficaErrorEnVivo(self.error_graph_frame)
+            self.fig_error = self.grafica_error.figura
+            self.canvas_error = self.grafica_error.canvas
+        return self.grafica_error
 
-        # Integrar gráfica en Tkinter
-        self.canvas_error = FigureCanvasTkAgg(self.fig_error, master=self.error_graph_frame)
-        self.canvas_error.draw()
-        self.canvas_error.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    def reiniciar_grafica_error(self):
+        """Vacía la gráfica de error al iniciar un entrenamiento"""
+        self.obtener_grafica_error().reiniciar()
+
+    def actualizar_grafica_error(self, registros):
+        """Añade a la gráfica los registros nuevos de la telemetría del entrenamiento"""
+        self.obtener_grafica_error().agregar(registros['epoca'], registros['error'], registros['error_validacion'])
+
+    def mostrar_grafica_error(self, errores, errores_validacion=None):
+        # Redibujar las curvas completas en la misma figura (diezmadas a la resolución del eje)
+        self.obtener_grafica_error().mostrar(errores, errores_validacion)
 
     def bind_figure_resize(self, canvas, figure):
         """Configura un evento para redimensionar la figura cuando cambia el tamaño del canvas"""